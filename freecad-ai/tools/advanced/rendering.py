@@ -2,6 +2,7 @@ import logging
 from typing import Any, Dict
 
 from ..base import ToolProvider, ToolResult, ToolSchema
+from ..tessellation_cache import get_tessellation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -364,7 +365,9 @@ class RenderingToolProvider(ToolProvider):
                     meshes = []
                     for obj in objects:
                         if hasattr(obj, "Shape"):
-                            mesh = Mesh.Mesh(obj.Shape.tessellate(0.1))
+                            mesh = Mesh.Mesh(
+                                get_tessellation_cache().tessellate(obj.Shape, 0.1)
+                            )
                             meshes.append(mesh)
 
                     if meshes:
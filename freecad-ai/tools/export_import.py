@@ -14,6 +14,8 @@ import FreeCAD as App
 import Mesh
 import Part
 
+from .tessellation_cache import get_tessellation_cache
+
 
 class ExportImportTool:
     """Tool for exporting and importing various file formats."""
@@ -161,12 +163,13 @@ class ExportImportTool:
                     "message": f"Could not create directory for {filepath}",
                 }
 
-            # Create mesh from shapes
+            # Create mesh from shapes, reusing unchanged shapes' tessellations
+            cache = get_tessellation_cache()
             meshes = []
             for obj in objects:
                 if hasattr(obj, "Shape") and obj.Shape:
                     mesh = Mesh.Mesh()
-                    mesh.addFacets(obj.Shape.tessellate(max_deviation))
+                    mesh.addFacets(cache.tessellate(obj.Shape, max_deviation))
                     meshes.append(mesh)
 
             if not meshes:
@@ -295,8 +295,6 @@ class MeasurementsTool:
             volume_cm3 = volume / 1000
             volume_m3 = volume / 1e9
 
-            # Get mass properties
-            mass_props = shape.MatrixOfInertia
             center_of_mass = shape.CenterOfMass
 
             return {
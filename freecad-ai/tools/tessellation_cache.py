@@ -0,0 +1,98 @@
+"""
+Tessellation Cache
+
+Tessellations of shapes kept between exports, bounded by their estimated
+memory, so exporting the same objects again does not re-mesh them.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+# Rough in-memory size of one tessellation point (a FreeCAD Vector) and one
+# facet (a tuple of three indices), used to bound the cache by memory
+POINT_BYTES = 96
+FACET_BYTES = 88
+
+# (points, facets) as returned by Shape.tessellate
+Tessellation = Tuple[List[Any], List[Tuple[int, int, int]]]
+
+
+def tessellation_size(tessellation: Tessellation) -> int:
+    """Estimate the memory held by a tessellation in bytes."""
+    points, facets = tessellation
+    return len(points) * POINT_BYTES + len(facets) * FACET_BYTES
+
+
+class TessellationCache:
+    """
+    Tessellations of shapes, cached by shape and tolerance.
+
+    Entries are keyed by the shape's hashCode and placement. The hash comes
+    from the address of the underlying TShape, which a recomputed shape may
+    reuse, so each entry keeps its shape and a hit is confirmed with
+    isSame. Entries are kept in an LRU bounded by their estimated memory.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Estimated memory the cached tessellations may use
+        """
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        # key -> (shape, tessellation)
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, Tessellation]]" = (
+            OrderedDict()
+        )
+        self._sizes: Dict[Tuple[Any, ...], int] = {}
+        self.size = 0
+
+    def tessellate(self, shape, tolerance: float) -> Tessellation:
+        """Get the tessellation of a shape.
+
+        Args:
+            shape: The shape
+            tolerance: Maximum distance (mm) between mesh and surface
+
+        Returns:
+            The (points, facets) tessellation, which must not be modified
+        """
+        key = (shape.hashCode(), str(shape.Placement), tolerance)
+        with self.lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0].isSame(shape):
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        tessellation = shape.tessellate(tolerance)
+        size = tessellation_size(tessellation)
+        if size > self.max_bytes:
+            return tessellation
+        with self.lock:
+            if key in self._entries:
+                del self._entries[key]
+                self.size -= self._sizes.pop(key)
+            self._entries[key] = (shape, tessellation)
+            self._sizes[key] = size
+            self.size += size
+            while self.size > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self.size -= self._sizes.pop(evicted)
+        return tessellation
+
+    def clear(self) -> None:
+        """Drop every cached tessellation."""
+        with self.lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.size = 0
+
+
+_cache = TessellationCache()
+
+
+def get_tessellation_cache() -> TessellationCache:
+    """Return the process-wide tessellation cache."""
+    return _cache
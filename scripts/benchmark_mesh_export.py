@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Mesh Export Benchmark for MCP-FreeCAD
+
+Compares the streaming STL/OBJ writers (numpy and pure Python) with the
+previous export path, which merged per-shape Mesh.Mesh objects with addMesh
+before writing (only when FreeCAD's Mesh module can be imported). Shapes are
+synthetic sphere tessellations; peak memory is the Python heap measured by
+tracemalloc, so it does not include memory held inside FreeCAD.
+
+Usage:
+  python scripts/benchmark_mesh_export.py
+  python scripts/benchmark_mesh_export.py --shapes 50 --resolution 200
+"""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.mcp_freecad.tools import mesh_writer  # noqa: E402
+
+
+def sphere(center: float, resolution: int):
+    """Tessellate a unit sphere as a latitude/longitude grid."""
+    points = []
+    for i in range(resolution + 1):
+        theta = math.pi * i / resolution
+        for j in range(resolution):
+            phi = 2 * math.pi * j / resolution
+            points.append(
+                (
+                    center + math.sin(theta) * math.cos(phi),
+                    math.sin(theta) * math.sin(phi),
+                    math.cos(theta),
+                )
+            )
+    facets = []
+    for i in range(resolution):
+        for j in range(resolution):
+            a = i * resolution + j
+            b = i * resolution + (j + 1) % resolution
+            facets.append((a, a + resolution, b))
+            facets.append((b, a + resolution, b + resolution))
+    return points, facets
+
+
+def mesh_module_export(path: str, shapes):
+    import Mesh
+
+    mesh = Mesh.Mesh()
+    for _, tessellation in shapes:
+        mesh.addMesh(Mesh.Mesh(tessellation))
+    mesh.write(path)
+
+
+def measure(write, path: str):
+    """Time a write, then repeat it under tracemalloc for its peak memory."""
+    start = time.perf_counter()
+    write(path)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    write(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP-FreeCAD mesh export benchmark")
+    parser.add_argument("--shapes", type=int, default=20, help="Shapes to export")
+    parser.add_argument("--resolution", type=int, default=100, help="Sphere grid")
+    args = parser.parse_args()
+
+    triangles = args.shapes * 2 * args.resolution**2
+    print(f"{args.shapes} shapes, {triangles} triangles")
+    print(f"numpy available: {mesh_writer.NUMPY_AVAILABLE}")
+    print()
+
+    # Tessellations as the tessellation cache would hold them
+    shapes = [
+        (f"Shape{i}", sphere(3.0 * i, args.resolution)) for i in range(args.shapes)
+    ]
+
+    def streamed(writer, use_numpy):
+        def write(path):
+            mesh_writer.NUMPY_AVAILABLE = use_numpy
+            writer(path, iter(shapes))
+
+        return write
+
+    numpy_available = mesh_writer.NUMPY_AVAILABLE
+    cases = []
+    for use_numpy in [False, True] if numpy_available else [False]:
+        label = "numpy" if use_numpy else "python"
+        stl = streamed(mesh_writer.write_binary_stl, use_numpy)
+        cases.append((f"stream STL ({label})", ".stl", stl))
+        obj = streamed(mesh_writer.write_obj, use_numpy)
+        cases.append((f"stream OBJ ({label})", ".obj", obj))
+    try:
+        import Mesh  # noqa: F401
+
+        for extension in (".stl", ".obj"):
+            cases.append(
+                (
+                    f"Mesh.addMesh + write {extension}",
+                    extension,
+                    lambda path: mesh_module_export(path, shapes),
+                )
+            )
+    except ImportError:
+        print("FreeCAD Mesh module not available, skipping the previous path")
+        print()
+
+    print(f"{'writer':<28}{'s':>8}{'Mtri/s':>10}{'peak MB':>10}{'MB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, extension, write in cases:
+            path = os.path.join(directory, "bench" + extension)
+            seconds, peak, size = measure(write, path)
+            rate = triangles / seconds / 1e6 if seconds else 0.0
+            print(
+                f"{name:<28}{seconds:>8.2f}{rate:>10.2f}"
+                f"{peak / 1e6:>10.1f}{size / 1e6:>10.1f}"
+            )
+    mesh_writer.NUMPY_AVAILABLE = numpy_available
+
+
+if __name__ == "__main__":
+    main()
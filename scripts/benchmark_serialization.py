@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark for MCP-FreeCAD
+
+Compares the default FastAPI JSON path (jsonable_encoder + json.dumps) with
+FastJSONResponse on a synthetic document context shaped like the output of
+CADContextExtractor, and reports compressed sizes.
+
+Usage:
+  python scripts/benchmark_serialization.py
+  python scripts/benchmark_serialization.py --objects 20000 --rounds 3
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from src.mcp_freecad.core import serialization  # noqa: E402
+
+
+class Vector:
+    """Stand-in for FreeCAD.Vector, which has no __dict__ to fall back on."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+def build_context(object_count: int) -> dict:
+    """Build a document context with the given number of objects."""
+    objects = []
+    hierarchy = {}
+    for i in range(object_count):
+        name = f"Box{i:05d}"
+        objects.append(
+            {
+                "id": name,
+                "label": f"Box {i}",
+                "type": "Part::Box",
+                "visibility": i % 3 != 0,
+                "properties": {
+                    "Length": {"type": "App::PropertyLength", "value": 10.0 + i},
+                    "Width": {"type": "App::PropertyLength", "value": 20.0},
+                    "Height": {"type": "App::PropertyLength", "value": 30.0},
+                    "Label": {"type": "App::PropertyString", "value": f"Box {i}"},
+                    "Placement": {
+                        "type": "App::PropertyPlacement",
+                        "value": {
+                            "base": [i * 1.5, 0.0, 0.0],
+                            "rotation": [0.0, 0.0, 0.0, 1.0],
+                        },
+                    },
+                    "Center": {
+                        "type": "App::PropertyVector",
+                        "value": [float(i), float(i) / 2, 0.0],
+                    },
+                },
+            }
+        )
+        hierarchy[name] = {"label": f"Box {i}", "type": "Part::Box", "children": []}
+    return {
+        "application": {"version": ["1", "0", "0"], "operating_system": "Linux"},
+        "active_document": {
+            "name": "Benchmark",
+            "objects": objects,
+            "object_hierarchy": {"root": list(hierarchy), "objects": hierarchy},
+        },
+    }
+
+
+def with_vectors(context: dict) -> dict:
+    """Replace vector lists with Vector objects, as raw FreeCAD values would be."""
+    for obj in context["active_document"]["objects"]:
+        value = obj["properties"]["Center"]["value"]
+        obj["properties"]["Center"]["value"] = Vector(*value)
+    return context
+
+
+def timed(func, rounds: int):
+    result = func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return result, (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP-FreeCAD serialization benchmark")
+    parser.add_argument("--objects", type=int, default=5000, help="Objects in context")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed repetitions")
+    args = parser.parse_args()
+
+    context = build_context(args.objects)
+    raw_context = with_vectors(build_context(args.objects))
+
+    print(f"Document context with {args.objects} objects, {args.rounds} rounds")
+    print(f"orjson available: {serialization.ORJSON_AVAILABLE}")
+    print(f"zstandard available: {serialization.ZSTD_AVAILABLE}")
+    print()
+
+    cases = [
+        (
+            "jsonable_encoder + json",
+            lambda: json.dumps(jsonable_encoder(context)).encode("utf-8"),
+        ),
+        ("json only", lambda: json.dumps(context).encode("utf-8")),
+        ("FastJSONResponse", lambda: serialization.dumps(context)),
+        (
+            "FastJSONResponse (Vector)",
+            lambda: serialization.dumps(raw_context),
+        ),
+    ]
+
+    print(f"{'encoder':<28}{'ms/round':>12}{'MB/s':>10}{'bytes':>12}")
+    body = b""
+    for name, encode in cases:
+        body, seconds = timed(encode, args.rounds)
+        rate = len(body) / seconds / 1e6 if seconds else 0.0
+        print(f"{name:<28}{seconds * 1000:>12.1f}{rate:>10.1f}{len(body):>12}")
+
+    print()
+    print(f"{'compression':<28}{'ms/round':>12}{'ratio':>10}{'bytes':>12}")
+    compressors = [("gzip -6", lambda: gzip.compress(body, compresslevel=6))]
+    if serialization.ZSTD_AVAILABLE:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor(level=3)
+        compressors.append(("zstd -3", lambda: compressor.compress(body)))
+    for name, compress in compressors:
+        compressed, seconds = timed(compress, args.rounds)
+        ratio = len(body) / len(compressed)
+        size = len(compressed)
+        print(f"{name:<28}{seconds * 1000:>12.1f}{ratio:>10.1f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,34 @@ def get_model_manipulation_tool_provider():
     return ModelManipulationToolProvider
 
 
+def get_cad_model_resource_provider():
+    """Lazy import for CADModelResourceProvider."""
+    from .resources.cad_model import CADModelResourceProvider
+
+    return CADModelResourceProvider
+
+
+def get_constraint_resource_provider():
+    """Lazy import for ConstraintResourceProvider."""
+    from .resources.constraint import ConstraintResourceProvider
+
+    return ConstraintResourceProvider
+
+
+def get_material_resource_provider():
+    """Lazy import for MaterialResourceProvider."""
+    from .resources.material import MaterialResourceProvider
+
+    return MaterialResourceProvider
+
+
+def get_measurement_resource_provider():
+    """Lazy import for MeasurementResourceProvider."""
+    from .resources.measurement import MeasurementResourceProvider
+
+    return MeasurementResourceProvider
+
+
 def get_mcp_server():
     """Lazy import for MCPServer."""
     from .core.server import MCPServer
@@ -38,6 +66,14 @@ TOOL_PROVIDERS = {
     "model_manipulation": get_model_manipulation_tool_provider,
 }
 
+# Resource providers registry (lazy loading)
+RESOURCE_PROVIDERS = {
+    "cad_model": get_cad_model_resource_provider,
+    "constraints": get_constraint_resource_provider,
+    "materials": get_material_resource_provider,
+    "measurements": get_measurement_resource_provider,
+}
+
 # Connection types
 CONNECTION_TYPES = {
     "server": "Socket-based connection to FreeCAD server",
@@ -54,5 +90,6 @@ __all__ = [
     "get_model_manipulation_tool_provider",
     "get_mcp_server",
     "TOOL_PROVIDERS",
+    "RESOURCE_PROVIDERS",
     "CONNECTION_TYPES",
 ]
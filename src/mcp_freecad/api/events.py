@@ -248,4 +248,14 @@ def create_event_router(mcp_server):
     # Add the broadcast function to the router
     router.broadcast_event = broadcast_event
 
+    # Expose subscriber count and pending events on /metrics
+    if hasattr(mcp_server, "register_metrics_source"):
+        mcp_server.register_metrics_source(
+            "events",
+            lambda: {
+                "clients": len(client_queues),
+                "queue_depth": sum(q.qsize() for q in client_queues.values()),
+            },
+        )
+
     return router
@@ -1,30 +1,117 @@
+import hashlib
 import logging
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from ..core import serialization
+from ..core.serialization import FastJSONResponse
 from ..core.server import MCPServer
 
 logger = logging.getLogger(__name__)
 
 
+def _make_etag(data: bytes) -> str:
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, ignoring weak prefixes."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def conditional_resource(
+    request: Request,
+    resource_provider: Any,
+    uri: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Get a resource as a response with an ETag, honouring If-None-Match.
+
+    If the provider reports a version for the resource, the ETag is derived
+    from the version, URI and parameters and a matching request is answered
+    with 304 without reading the resource. Otherwise the ETag is a hash of
+    the response body.
+
+    Args:
+        request: The incoming request
+        resource_provider: The resource provider
+        uri: The resource URI
+        params: Optional parameters for the resource
+
+    Returns:
+        The resource response, or an empty 304 response
+    """
+    if_none_match = request.headers.get("if-none-match")
+    headers = {"Cache-Control": "no-cache"}
+
+    get_version = getattr(resource_provider, "get_version", None)
+    version = get_version(uri, params) if get_version is not None else None
+    if version is not None:
+        key = serialization.dumps([version, uri, params or {}])
+        headers["ETag"] = _make_etag(key)
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    response = FastJSONResponse(await resource_provider.get_resource(uri, params))
+    if version is None:
+        headers["ETag"] = _make_etag(response.body)
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
 def create_resource_router(server: MCPServer) -> APIRouter:
     """Create a router for resource endpoints."""
     router = APIRouter(
         prefix="/resources",
         tags=["resources"],
+        default_response_class=FastJSONResponse,
         responses={404: {"description": "Resource not found"}},
     )
 
     @router.get("/{resource_id}")
     async def get_resource(
+        request: Request,
         resource_id: str,
         uri: Optional[str] = None,
         params: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        object_type: Optional[str] = Query(None, alias="type"),
+        properties: Optional[str] = None,
+        since: Optional[int] = Query(None, ge=0),
     ):
         """Get a resource from the server."""
         logger.info(f"Resource request: {resource_id}, URI: {uri}")
 
+        # Pagination and projection parameters are passed on to the provider
+        query = {
+            "limit": limit,
+            "cursor": cursor,
+            "fields": fields,
+            "type": object_type,
+            "properties": properties,
+            "since": since,
+        }
+        params = {
+            **(params or {}),
+            **{key: value for key, value in query.items() if value is not None},
+        }
+
         if resource_id not in server.resources:
             raise HTTPException(
                 status_code=404, detail=f"Resource provider not found: {resource_id}"
@@ -46,8 +133,10 @@ def create_resource_router(server: MCPServer) -> APIRouter:
                 else:
                     uri = f"cad://{resource_id}"
 
-            # Get the resource
-            return await resource_provider.get_resource(uri, params)
+            # Return the response directly to skip jsonable_encoder
+            return await conditional_resource(request, resource_provider, uri, params)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error getting resource: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -55,6 +144,7 @@ def create_resource_router(server: MCPServer) -> APIRouter:
     # Add endpoint for measurements
     @router.get("/measurements/{measurement_type}")
     async def get_measurement(
+        request: Request,
         measurement_type: str,
         object_name: Optional[str] = None,
         point1: Optional[str] = None,
@@ -92,7 +182,7 @@ def create_resource_router(server: MCPServer) -> APIRouter:
                     )
 
             # Get the resource
-            return await resource_provider.get_resource(uri, params)
+            return await conditional_resource(request, resource_provider, uri, params)
         except Exception as e:
             logger.error(f"Error getting measurement: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -100,6 +190,7 @@ def create_resource_router(server: MCPServer) -> APIRouter:
     # Add endpoint for materials
     @router.get("/materials/{resource_type}")
     async def get_material(
+        request: Request,
         resource_type: str,
         object_name: Optional[str] = None,
         material_name: Optional[str] = None,
@@ -124,15 +215,24 @@ def create_resource_router(server: MCPServer) -> APIRouter:
             elif resource_type == "info" and material_name:
                 uri += f"/{material_name}"
 
+            # Query filters such as Density.max=8000 are passed through
+            params = None
+            if resource_type == "query":
+                params = dict(request.query_params)
+
             # Get the resource
-            return await resource_provider.get_resource(uri)
+            return await conditional_resource(request, resource_provider, uri, params)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error getting material information: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
     # Add endpoint for constraints
     @router.get("/constraints/{resource_type}")
-    async def get_constraint(resource_type: str, object_name: Optional[str] = None):
+    async def get_constraint(
+        request: Request, resource_type: str, object_name: Optional[str] = None
+    ):
         """Get constraint information from the server."""
         logger.info(f"Constraint request: {resource_type}, Object: {object_name}")
 
@@ -150,7 +250,7 @@ def create_resource_router(server: MCPServer) -> APIRouter:
                 uri += f"/{object_name}"
 
             # Get the resource
-            return await resource_provider.get_resource(uri)
+            return await conditional_resource(request, resource_provider, uri)
         except Exception as e:
             logger.error(f"Error getting constraint information: {e}")
             raise HTTPException(status_code=500, detail=str(e))
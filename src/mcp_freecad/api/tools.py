@@ -4,6 +4,7 @@ from typing import Any, Dict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from ..core.serialization import FastJSONResponse
 from ..core.server import MCPServer
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,7 @@ def create_tool_router(server: MCPServer) -> APIRouter:
     router = APIRouter(
         prefix="/tools",
         tags=["tools"],
+        default_response_class=FastJSONResponse,
         responses={404: {"description": "Tool not found"}},
     )
 
@@ -29,12 +29,19 @@ import logging
 import os
 import socket
 import sys
+import time
 import xmlrpc.client
 from typing import Any, Dict, List, Optional
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+try:
+    from ..core.tracing import get_tracer
+except ImportError:
+    # Running outside the package; tracing is unavailable
+    get_tracer = None
+
 # --- FreeCADBridge Import Attempt ---
 BRIDGE_AVAILABLE = False
 _bridge_import_error_msg = ""
@@ -298,6 +305,34 @@ class FreeCADConnection:
         Args:
             command: Command dictionary
 
+        Returns:
+            dict: Response from server
+        """
+        tracer = get_tracer() if get_tracer else None
+        if tracer is None or not tracer.enabled:
+            return self._round_trip(command)
+
+        with tracer.span("connection.round_trip", command=command.get("type")):
+            trace_context = tracer.inject()
+            if trace_context:
+                command = {**command, "trace": trace_context}
+            sent_at = time.time()
+            response = self._round_trip(command, tracer)
+            timings = (
+                response.pop("timings", None) if isinstance(response, dict) else None
+            )
+            if timings:
+                tracer.record_remote_timings(timings, origin=sent_at)
+            return response
+
+    def _round_trip(self, command: Dict[str, Any], tracer=None) -> Dict[str, Any]:
+        """
+        Send one command over a fresh socket and read the response
+
+        Args:
+            command: Command dictionary
+            tracer: Optional tracer used to time response parsing
+
         Returns:
             dict: Response from server
         """
@@ -329,7 +364,10 @@ class FreeCADConnection:
                 return {"error": "Received empty or incomplete response from server"}
 
             try:
-                return json.loads(response_str)
+                if tracer is None:
+                    return json.loads(response_str)
+                with tracer.span("connection.parse_response", bytes=len(response_data)):
+                    return json.loads(response_str)
             except json.JSONDecodeError:
                 logger.debug(f"Received invalid JSON data: '{response_str}'")
                 return {"error": "Invalid JSON response received"}
@@ -18,13 +18,19 @@ Options:
 """
 
 import argparse
+import cProfile
+import io
 import json
 import logging
 import os
+import pstats
 import signal
 import socket
 import sys
+import time
 import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional, Tuple
 
 # Parse command-line arguments
@@ -135,6 +141,23 @@ except ImportError as e:
 
 
 # Server implementation
+# Commands that manage profiling and are never profiled themselves
+PROFILE_COMMANDS = ("start_profile", "stop_profile", "get_profile")
+# Estimated memory of the tessellations kept between exports, least
+# recently used dropped first
+TESSELLATION_CACHE_BYTES = 256 * 1024 * 1024
+# Rough in-memory size of one tessellation point and one facet, as in
+# tools/tessellation_cache.py, which this standalone script cannot import
+POINT_BYTES = 96
+FACET_BYTES = 88
+
+
+def tessellation_size(tessellation) -> int:
+    """Estimate the memory held by a (points, facets) tessellation in bytes."""
+    points, facets = tessellation
+    return len(points) * POINT_BYTES + len(facets) * FACET_BYTES
+
+
 class FreeCADServer:
     def __init__(self, host="localhost", port=12345, debug=False):
         self.host = host
@@ -142,6 +165,14 @@ class FreeCADServer:
         self.debug = debug
         self.socket = None
         self.running = False
+        # Phase timings for the current traced command, None when not tracing
+        self._timings: Optional[List[Dict[str, Any]]] = None
+        self._trace_origin = 0.0
+        # On-demand cProfile session covering command processing
+        self._profile: Optional[cProfile.Profile] = None
+        self._profile_state: Dict[str, Any] = {}
+        self._tessellations: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._tessellation_bytes = 0
 
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -249,8 +280,145 @@ class FreeCADServer:
         except Exception as e:
             logger.error(f"Error sending response: {e}")
 
+    @contextmanager
+    def _phase(self, name: str):
+        """Time a phase of the current command if it is being traced"""
+        if self._timings is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings.append(
+                {
+                    "name": name,
+                    "offset": start - self._trace_origin,
+                    "duration": time.perf_counter() - start,
+                }
+            )
+
+    def _tessellate(self, shape, tolerance: float):
+        """Tessellate a shape, reusing the result while the shape is unchanged."""
+        # hashCode comes from the TShape address, which a recomputed shape
+        # may reuse; each entry keeps its shape to compare with isSame
+        key = (shape.hashCode(), str(shape.Placement), tolerance)
+        cached = self._tessellations.get(key)
+        if cached is not None and cached[0].isSame(shape):
+            self._tessellations.move_to_end(key)
+            return cached[1]
+
+        tessellation = shape.tessellate(tolerance)
+        size = tessellation_size(tessellation)
+        if size > TESSELLATION_CACHE_BYTES:
+            return tessellation
+        if cached is not None:
+            del self._tessellations[key]
+            self._tessellation_bytes -= cached[2]
+        self._tessellations[key] = (shape, tessellation, size)
+        self._tessellation_bytes += size
+        while self._tessellation_bytes > TESSELLATION_CACHE_BYTES:
+            _, evicted = self._tessellations.popitem(last=False)
+            self._tessellation_bytes -= evicted[2]
+        return tessellation
+
     def process_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a command and return a response"""
+        """Process a command and return a response
+
+        When the command carries a ``trace`` context, the response includes
+        ``timings``: phases of the command with offsets relative to receipt.
+        While a profiling session is active the command runs under cProfile.
+        """
+        profile = self._profile
+        if command.get("type") in PROFILE_COMMANDS:
+            profile = None
+        if profile is not None:
+            profile.enable()
+        try:
+            if not command.get("trace"):
+                return self._dispatch_command(command)
+            return self._traced_command(command)
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._count_profiled_command()
+
+    def _traced_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a command and attach its phase timings to the response"""
+        self._timings = []
+        self._trace_origin = time.perf_counter()
+        try:
+            with self._phase(f"command.{command.get('type', '')}"):
+                response = self._dispatch_command(command)
+            if isinstance(response, dict):
+                response["timings"] = self._timings
+            return response
+        finally:
+            self._timings = None
+
+    def _count_profiled_command(self) -> None:
+        """End the profiling session once its duration or command limit is hit"""
+        state = self._profile_state
+        state["commands"] += 1
+        deadline = state.get("deadline")
+        limit = state.get("command_limit")
+        if (deadline is not None and time.time() >= deadline) or (
+            limit is not None and state["commands"] >= limit
+        ):
+            self._finish_profile()
+
+    def _start_profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Profile the next commands for a duration or a number of commands"""
+        if self._profile is not None:
+            return {"error": "A profiling session is running"}
+        duration = params.get("duration")
+        commands = params.get("commands")
+        if duration is None and commands is None:
+            return {"error": "Either duration or commands must be given"}
+        self._profile = cProfile.Profile()
+        self._profile_state = {
+            "status": "running",
+            "started_at": time.time(),
+            "deadline": time.time() + duration if duration is not None else None,
+            "command_limit": commands,
+            "commands": 0,
+        }
+        return {"success": True, **self._profile_state}
+
+    def _finish_profile(self) -> None:
+        """End the profiling session and keep its statistics"""
+        if self._profile is None:
+            return
+        self._profile_state["status"] = "finished"
+        self._profile_state["finished_at"] = time.time()
+        self._profile_state["stats"] = pstats.Stats(self._profile)
+        self._profile = None
+
+    def _get_profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a pstats report of the last profiling session"""
+        state = self._profile_state
+        if not state:
+            return {"error": "No profiling session"}
+        deadline = state.get("deadline")
+        if self._profile is not None and deadline and time.time() >= deadline:
+            self._finish_profile()
+        summary = {k: v for k, v in state.items() if k != "stats"}
+        if "stats" not in state:
+            return {"success": True, **summary}
+
+        stream = io.StringIO()
+        stats = state["stats"]
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(params.get("limit", 50))
+        return {
+            "success": True,
+            **summary,
+            "format": "pstats",
+            "data": stream.getvalue(),
+        }
+
+    def _dispatch_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a command to its handler"""
         command_type = command.get("type", "")
         params = command.get("params", {})
 
@@ -258,6 +426,16 @@ class FreeCADServer:
         if command_type == "ping":
             return {"pong": True}
 
+        elif command_type == "start_profile":
+            return self._start_profile(params)
+
+        elif command_type == "stop_profile":
+            self._finish_profile()
+            return self._get_profile(params)
+
+        elif command_type == "get_profile":
+            return self._get_profile(params)
+
         elif command_type == "get_version":
             version_info = {}
 
@@ -344,7 +522,8 @@ class FreeCADServer:
                     box.Length = length
                     box.Width = width
                     box.Height = height
-                    doc.recompute()
+                    with self._phase("recompute"):
+                        doc.recompute()
 
                     return {
                         "success": True,
@@ -360,7 +539,8 @@ class FreeCADServer:
                     cylinder = doc.addObject("Part::Cylinder", name or "Cylinder")
                     cylinder.Radius = radius
                     cylinder.Height = height
-                    doc.recompute()
+                    with self._phase("recompute"):
+                        doc.recompute()
 
                     return {
                         "success": True,
@@ -444,7 +624,8 @@ class FreeCADServer:
                                 shapes.append(obj.Shape)
 
                         if shapes:
-                            Part.export(shapes, file_path)
+                            with self._phase("write"):
+                                Part.export(shapes, file_path)
                         else:
                             return {
                                 "error": "No valid shapes found in specified objects"
@@ -457,7 +638,8 @@ class FreeCADServer:
                                 shapes.append(obj.Shape)
 
                         if shapes:
-                            Part.export(shapes, file_path)
+                            with self._phase("write"):
+                                Part.export(shapes, file_path)
                         else:
                             return {"error": "No valid shapes found in document"}
 
@@ -468,8 +650,10 @@ class FreeCADServer:
                         for obj_name in objects:
                             obj = doc.getObject(obj_name)
                             if obj and hasattr(obj, "Shape"):
-                                mesh = Mesh.Mesh(obj.Shape.tessellate(0.1))
-                                mesh.write(file_path)
+                                with self._phase("tessellate"):
+                                    mesh = Mesh.Mesh(self._tessellate(obj.Shape, 0.1))
+                                with self._phase("write"):
+                                    mesh.write(file_path)
                                 break  # Only export the first one for now
                         else:
                             return {
@@ -479,8 +663,10 @@ class FreeCADServer:
                         # Export all objects with shapes
                         for obj in doc.Objects:
                             if hasattr(obj, "Shape"):
-                                mesh = Mesh.Mesh(obj.Shape.tessellate(0.1))
-                                mesh.write(file_path)
+                                with self._phase("tessellate"):
+                                    mesh = Mesh.Mesh(self._tessellate(obj.Shape, 0.1))
+                                with self._phase("write"):
+                                    mesh.write(file_path)
                                 break  # Only export the first one for now
                         else:
                             return {"error": "No valid shapes found in document"}
@@ -512,7 +698,8 @@ class FreeCADServer:
                 script_env["_env_values"] = {}
 
                 # Execute the script
-                exec(script, script_env)
+                with self._phase("exec"):
+                    exec(script, script_env)
 
                 # Return any values that were stored in _env_values
                 return {
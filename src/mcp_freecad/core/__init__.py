@@ -1,5 +1,6 @@
 from .cache import ResourceCache, cached_resource
 from .diagnostics import Metric, PerformanceMonitor
+from .disk_cache import DiskCache
 from .recovery import ConnectionRecovery, FreeCADConnectionManager
 from .server import MCPServer
 
@@ -7,6 +8,7 @@ __all__ = [
     "MCPServer",
     "ResourceCache",
     "cached_resource",
+    "DiskCache",
     "ConnectionRecovery",
     "FreeCADConnectionManager",
     "PerformanceMonitor",
@@ -3,6 +3,8 @@ import time
 from threading import Lock
 from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
 
+from .disk_cache import DiskCache
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -34,15 +36,26 @@ class ResourceCache:
     This class provides a simple time-based cache for resource providers.
     Resources are cached for a configurable amount of time to reduce
     the number of expensive operations (like querying FreeCAD).
+
+    An optional persistent second-level cache can be attached. Entries
+    stored with ``persist=True`` are written through to it, and misses in
+    memory for keys read with ``persist=True`` fall back to it before
+    reporting a miss. Other keys never touch the second-level cache.
     """
 
-    def __init__(self, default_ttl: float = 30.0, max_size: int = 100):
+    def __init__(
+        self,
+        default_ttl: float = 30.0,
+        max_size: int = 100,
+        l2: Optional[DiskCache] = None,
+    ):
         """
         Initialize the resource cache.
 
         Args:
             default_ttl: Default time to live in seconds (default: 30 seconds)
             max_size: Maximum number of entries in the cache (default: 100)
+            l2: Optional persistent second-level cache
         """
         self.default_ttl = default_ttl
         self.max_size = max_size
@@ -50,16 +63,19 @@ class ResourceCache:
         self.lock = Lock()
         self.hits = 0
         self.misses = 0
+        self.l2 = l2
         logger.info(
             f"Initialized resource cache with TTL={default_ttl}s, max_size={max_size}"
         )
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, persist: bool = False) -> Optional[Any]:
         """
         Get a value from the cache.
 
         Args:
             key: The cache key
+            persist: The key is stored with ``persist=True``, so look in the
+                second-level cache, if any, when it is not in memory
 
         Returns:
             The cached value, or None if not in cache or expired
@@ -67,19 +83,35 @@ class ResourceCache:
         with self.lock:
             if key in self.cache:
                 entry = self.cache[key]
-                if entry.is_expired():
-                    logger.debug(f"Cache entry for '{key}' is expired")
-                    del self.cache[key]
-                    self.misses += 1
-                    return None
-                logger.debug(f"Cache hit for '{key}'")
-                self.hits += 1
-                return entry.value
+                if not entry.is_expired():
+                    logger.debug(f"Cache hit for '{key}'")
+                    self.hits += 1
+                    return entry.value
+                logger.debug(f"Cache entry for '{key}' is expired")
+                del self.cache[key]
+
+        # Persisted entries are content-addressed, so they outlive the TTL
+        if persist and self.l2 is not None:
+            value = self.l2.get(key)
+            if value is not None:
+                logger.debug(f"Disk cache hit for '{key}'")
+                with self.lock:
+                    self.hits += 1
+                    self._store(key, value, None)
+                return value
+
+        with self.lock:
             logger.debug(f"Cache miss for '{key}'")
             self.misses += 1
             return None
 
-    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        persist: bool = False,
+    ) -> None:
         """
         Set a value in the cache.
 
@@ -87,16 +119,23 @@ class ResourceCache:
             key: The cache key
             value: The value to cache
             ttl: Optional custom TTL, otherwise uses default
+            persist: Also write the value to the second-level cache, if any
         """
         with self.lock:
-            # If cache is full, remove oldest entries
-            if len(self.cache) >= self.max_size:
-                self._evict_entries()
-
-            # Set the new entry
-            self.cache[key] = CacheEntry(value, ttl or self.default_ttl)
+            self._store(key, value, ttl)
             logger.debug(f"Cached value for '{key}' (TTL={ttl or self.default_ttl}s)")
 
+        if persist and self.l2 is not None:
+            self.l2.set(key, value)
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Insert an entry into memory; the caller must hold the lock."""
+        # If cache is full, remove oldest entries
+        if key not in self.cache and len(self.cache) >= self.max_size:
+            self._evict_entries()
+
+        self.cache[key] = CacheEntry(value, ttl or self.default_ttl)
+
     def invalidate(self, key: str) -> None:
         """
         Invalidate a specific cache entry.
@@ -109,6 +148,9 @@ class ResourceCache:
                 del self.cache[key]
                 logger.debug(f"Invalidated cache entry for '{key}'")
 
+        if self.l2 is not None:
+            self.l2.invalidate(key)
+
     def invalidate_pattern(self, pattern: str) -> None:
         """
         Invalidate all cache entries matching a pattern.
@@ -124,12 +166,18 @@ class ResourceCache:
                 f"Invalidated {len(keys_to_remove)} cache entries matching pattern '{pattern}'"
             )
 
+        if self.l2 is not None:
+            self.l2.invalidate_pattern(pattern)
+
     def clear(self) -> None:
-        """Clear all cache entries."""
+        """Clear all cache entries, including the second-level cache."""
         with self.lock:
             self.cache.clear()
             logger.debug("Cleared entire cache")
 
+        if self.l2 is not None:
+            self.l2.clear()
+
     def _evict_entries(self) -> None:
         """Evict old entries when cache is full."""
         # First, remove expired entries
@@ -152,7 +200,7 @@ class ResourceCache:
         with self.lock:
             total = self.hits + self.misses
             hit_rate = self.hits / total if total > 0 else 0.0
-            return {
+            stats = {
                 "size": len(self.cache),
                 "max_size": self.max_size,
                 "hits": self.hits,
@@ -160,6 +208,9 @@ class ResourceCache:
                 "hit_rate": hit_rate,
                 "default_ttl": self.default_ttl,
             }
+        if self.l2 is not None:
+            stats["l2"] = self.l2.get_stats()
+        return stats
 
     def __len__(self) -> int:
         """Get the number of entries in the cache."""
@@ -168,7 +219,10 @@ class ResourceCache:
 
 
 def cached_resource(
-    cache: ResourceCache, key_prefix: str = "", ttl: Optional[float] = None
+    cache: ResourceCache,
+    key_prefix: str = "",
+    ttl: Optional[float] = None,
+    persist: bool = False,
 ):
     """
     Decorator for caching resource provider methods.
@@ -177,6 +231,7 @@ def cached_resource(
         cache: The cache instance to use
         key_prefix: Optional prefix for cache keys
         ttl: Optional custom TTL for this method
+        persist: Also write results to the cache's second-level store
 
     Returns:
         Decorator function
@@ -190,7 +245,7 @@ def cached_resource(
             cache_key = f"{key_prefix}:{func.__name__}:{arg_str}:{kwarg_str}"
 
             # Try to get from cache first
-            cached_value = cache.get(cache_key)
+            cached_value = cache.get(cache_key, persist=persist)
             if cached_value is not None:
                 return cached_value
 
@@ -198,7 +253,7 @@ def cached_resource(
             result = await func(*args, **kwargs)
 
             # Cache the result
-            cache.set(cache_key, result, ttl)
+            cache.set(cache_key, result, ttl, persist=persist)
 
             return result
 
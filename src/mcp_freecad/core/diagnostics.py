@@ -1,5 +1,7 @@
 import asyncio
+import itertools
 import logging
+import math
 import os
 import platform
 import sys
@@ -8,7 +10,7 @@ import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 import psutil
 
@@ -25,12 +27,175 @@ class MetricSample:
     error: Optional[str] = None
 
 
+class LogHistogram:
+    """
+    Log-bucketed histogram with bounded relative error (HDR-style).
+
+    Bucket boundaries grow geometrically from ``lowest`` to ``highest`` so
+    every recorded value is reported within ``precision`` of its true value.
+    Memory is fixed by the bucket count and does not grow with samples.
+    """
+
+    def __init__(
+        self, lowest: float = 1e-6, highest: float = 3600.0, precision: float = 0.01
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            lowest: Smallest distinguishable value (default: 1 microsecond)
+            highest: Largest tracked value, larger values are clamped (default: 1 hour)
+            precision: Relative error per bucket (default: 1%)
+        """
+        self.lowest = lowest
+        self.highest = highest
+        self._log_growth = math.log1p(precision)
+        self.bucket_count = int(math.log(highest / lowest) / self._log_growth) + 2
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+        self.min_value = float("inf")
+        self.max_value = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        index = int(math.log(value / self.lowest) / self._log_growth) + 1
+        return min(index, self.bucket_count - 1)
+
+    def upper_bound(self, index: int) -> float:
+        """Return the exclusive upper bound of a bucket."""
+        return self.lowest * math.exp(index * self._log_growth)
+
+    def record(self, value: float) -> None:
+        """Record a value."""
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.min_value = min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Estimate the value at a quantile.
+
+        Args:
+            quantile: Quantile between 0.0 and 1.0
+
+        Returns:
+            The estimated value, or 0.0 if nothing has been recorded
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to observed range
+                value = self.lowest * math.exp((index - 0.5) * self._log_growth)
+                return min(max(value, self.min_value), self.max_value)
+        return self.max_value
+
+    def cumulative_counts(self, bounds: List[float]) -> List[int]:
+        """
+        Count recorded values at or below each of the given bounds.
+
+        Args:
+            bounds: Ascending upper bounds
+
+        Returns:
+            Cumulative counts, one per bound
+        """
+        result = []
+        seen = 0
+        start = 0
+        for bound in bounds:
+            if bound < self.lowest:
+                result.append(seen)
+                continue
+            # Buckets 0..end-1 have an upper bound at or below ``bound``
+            end = int(math.log(bound / self.lowest) / self._log_growth + 1e-9) + 1
+            end = min(end, self.bucket_count)
+            if end > start:
+                seen += sum(self.counts[start:end])
+                start = end
+            result.append(seen)
+        return result
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+        self.min_value = float("inf")
+        self.max_value = 0.0
+
+
+class RateWindow:
+    """
+    Sliding-window event rate over a fixed number of one-second slots.
+
+    Slots are reused in a ring, so memory is constant regardless of traffic.
+    """
+
+    def __init__(self, span: int = 900):
+        """
+        Initialize the rate window.
+
+        Args:
+            span: Longest window in seconds (default: 15 minutes)
+        """
+        self.span = span
+        self._counts = [0] * span
+        self._seconds = [-1] * span
+
+    def mark(self, now: Optional[float] = None) -> None:
+        """Record one event."""
+        second = int(now if now is not None else time.time())
+        slot = second % self.span
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += 1
+
+    def rate(self, window: int, now: Optional[float] = None) -> float:
+        """
+        Get the average events per second over the trailing window.
+
+        Args:
+            window: Window length in seconds, at most ``span``
+            now: Optional current time, for testing
+
+        Returns:
+            Events per second
+        """
+        window = min(window, self.span)
+        current = int(now if now is not None else time.time())
+        oldest = current - window
+        total = sum(
+            count
+            for second, count in zip(self._seconds, self._counts)
+            if oldest < second <= current
+        )
+        return total / window
+
+
+RATE_WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p99_9": 0.999}
+
+
 @dataclass
 class Metric:
-    """A performance metric with samples."""
+    """
+    A performance metric with constant-memory aggregates.
+
+    Only the most recent ``buffer_size`` samples are kept verbatim; latency
+    distribution and throughput are tracked in fixed-size structures.
+    """
 
     name: str
-    samples: List[MetricSample] = field(default_factory=list)
+    buffer_size: int = 100
+    samples: Deque[MetricSample] = field(init=False)
+    histogram: LogHistogram = field(default_factory=LogHistogram)
+    rates: RateWindow = field(default_factory=RateWindow)
     total_samples: int = 0
     total_duration: float = 0.0
     success_count: int = 0
@@ -39,15 +204,19 @@ class Metric:
     max_duration: float = 0.0
     avg_duration: float = 0.0
 
+    def __post_init__(self) -> None:
+        self.samples = deque(maxlen=self.buffer_size)
+
     def record_sample(
         self, duration: float, success: bool, error: Optional[str] = None
     ) -> None:
         """Record a new sample for this metric."""
+        now = time.time()
         self.samples.append(
-            MetricSample(
-                timestamp=time.time(), duration=duration, success=success, error=error
-            )
+            MetricSample(timestamp=now, duration=duration, success=success, error=error)
         )
+        self.histogram.record(duration)
+        self.rates.mark(now)
         self.total_samples += 1
         self.total_duration += duration
         if success:
@@ -58,11 +227,38 @@ class Metric:
         self.max_duration = max(self.max_duration, duration)
         self.avg_duration = self.total_duration / self.total_samples
 
+    def percentiles(self) -> Dict[str, float]:
+        """Get latency percentiles for this metric."""
+        return {
+            label: self.histogram.percentile(quantile)
+            for label, quantile in PERCENTILES.items()
+        }
+
+    def windowed_rates(self) -> Dict[str, float]:
+        """Get samples per second over the 1, 5 and 15 minute windows."""
+        now = time.time()
+        return {
+            label: self.rates.rate(window, now)
+            for label, window in RATE_WINDOWS.items()
+        }
+
+    def recent_samples(self, limit: int) -> List[MetricSample]:
+        """Get up to ``limit`` of the most recent samples, oldest first."""
+        start = max(0, len(self.samples) - limit)
+        return list(itertools.islice(self.samples, start, None))
+
 
 class PerformanceMonitor:
     """Monitor and track performance metrics."""
 
-    def __init__(self):
+    def __init__(self, sample_buffer_size: int = 100):
+        """
+        Initialize the performance monitor.
+
+        Args:
+            sample_buffer_size: Number of recent samples kept per metric
+        """
+        self.sample_buffer_size = sample_buffer_size
         self.start_time = time.time()
         self.metrics: Dict[str, Metric] = {}
         self.error_counts: Dict[str, int] = defaultdict(int)
@@ -78,7 +274,7 @@ class PerformanceMonitor:
         """Get or create a metric tracker and record a sample."""
         metric = self.metrics.get(metric_name)
         if metric is None:
-            metric = Metric(name=metric_name)
+            metric = Metric(name=metric_name, buffer_size=self.sample_buffer_size)
             self.metrics[metric_name] = metric
         metric.record_sample(duration, success, error)
         return metric
@@ -105,6 +301,8 @@ class PerformanceMonitor:
                     "min_duration": metric.min_duration,
                     "max_duration": metric.max_duration,
                     "avg_duration": metric.avg_duration,
+                    "percentiles": metric.percentiles(),
+                    "rates": metric.windowed_rates(),
                 }
                 for name, metric in self.metrics.items()
             },
@@ -118,7 +316,7 @@ class PerformanceMonitor:
                         "success": sample.success,
                         "error": sample.error,
                     }
-                    for sample in metric.samples[-10:]  # Last 10 samples
+                    for sample in metric.recent_samples(10)
                 ]
                 for name, metric in self.metrics.items()
             },
@@ -145,6 +343,8 @@ class PerformanceMonitor:
             "min_duration": metric.min_duration,
             "max_duration": metric.max_duration,
             "avg_duration": metric.avg_duration,
+            "percentiles": metric.percentiles(),
+            "rates": metric.windowed_rates(),
             "recent_samples": [
                 {
                     "timestamp": sample.timestamp,
@@ -152,7 +352,7 @@ class PerformanceMonitor:
                     "success": sample.success,
                     "error": sample.error,
                 }
-                for sample in metric.samples[-5:]  # Last 5 samples
+                for sample in metric.recent_samples(5)
             ],
         }
 
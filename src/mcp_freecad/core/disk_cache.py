@@ -0,0 +1,289 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute a SHA-256 digest of a file's contents.
+
+    Args:
+        file_path: Path to the file to hash
+        chunk_size: Read size in bytes (default: 1 MiB)
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent second-level cache backed by SQLite.
+
+    Entries survive server restarts and are bounded by total payload size.
+    When the limit is exceeded, the least recently used entries are evicted.
+    Access times are only written back when older than ``touch_interval``,
+    so repeated reads do not each cost a commit. The database is opened
+    lazily on first access so that startup does not pay for it when the
+    cache is never used.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        touch_interval: float = 60.0,
+    ):
+        """
+        Initialize the disk cache.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Maximum total payload size in bytes (default: 64 MiB)
+            touch_interval: Seconds an entry's access time may lag behind
+                before a read updates it (default: 60 seconds)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        # (path) -> ((mtime, size), digest) so unchanged files are not rehashed
+        self._hash_memo: Dict[str, Tuple[Tuple[float, int], str]] = {}
+        logger.info(f"Configured disk cache at {path} (max_bytes={max_bytes})")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and create the schema."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)"
+            )
+            self._conn.commit()
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+            self._total_bytes = row.fetchone()[0]
+            logger.info(
+                f"Opened disk cache {self.path} ({self._total_bytes} bytes in use)"
+            )
+        return self._conn
+
+    def document_key(self, uri: str, file_path: Optional[str] = None) -> str:
+        """
+        Build a cache key from a resource URI and the document file contents.
+
+        The content hash is memoized on (mtime, size), so the file is only
+        re-read when it changes on disk.
+
+        Args:
+            uri: The resource URI
+            file_path: Optional path to the saved document file
+
+        Returns:
+            The cache key
+        """
+        if not file_path or not os.path.exists(file_path):
+            return uri
+
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime, stat.st_size)
+        with self.lock:
+            memo = self._hash_memo.get(file_path)
+        if memo is None or memo[0] != signature:
+            # Hash outside the lock so other cache calls are not blocked
+            memo = (signature, file_content_hash(file_path))
+            with self.lock:
+                self._hash_memo[file_path] = memo
+        return f"{memo[1]}:{uri}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the disk cache.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if not present
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, last_access FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                now = time.time()
+                if now - row[1] > self.touch_interval:
+                    conn.execute(
+                        "UPDATE entries SET last_access = ? WHERE key = ?",
+                        (now, key),
+                    )
+                    conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Disk cache read failed for '{key}': {e}")
+                self.misses += 1
+                return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the disk cache.
+
+        Values must be JSON-serializable; anything else is skipped.
+
+        Args:
+            key: The cache key
+            value: The value to store
+        """
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not persisting '{key}', value is not serializable: {e}")
+            return
+
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug(f"Not persisting '{key}', {size} bytes exceeds limit")
+            return
+
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._total_bytes -= row[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, size, time.time()),
+                )
+                self._total_bytes += size
+                self._evict_entries(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed for '{key}': {e}")
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove a specific entry from the disk cache.
+
+        Args:
+            key: The cache key to remove
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT size FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.commit()
+                    self._total_bytes -= row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache invalidate failed for '{key}': {e}")
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Remove all entries whose key contains a pattern.
+
+        Args:
+            pattern: Substring to match against cache keys
+
+        Returns:
+            The number of entries removed
+        """
+        with self.lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries "
+                    "WHERE instr(key, ?) > 0",
+                    (pattern,),
+                ).fetchone()
+                if row[0]:
+                    conn.execute(
+                        "DELETE FROM entries WHERE instr(key, ?) > 0", (pattern,)
+                    )
+                    conn.commit()
+                    self._total_bytes -= row[1]
+                return row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache invalidate failed for '{pattern}': {e}")
+                return 0
+
+    def clear(self) -> None:
+        """Remove all entries from the disk cache."""
+        with self.lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+                self._total_bytes = 0
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _evict_entries(self, conn: sqlite3.Connection) -> None:
+        """Evict least recently used entries until under the size limit."""
+        evicted = 0
+        while self._total_bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._total_bytes = 0
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            self._total_bytes -= row[1]
+            evicted += 1
+        if evicted:
+            logger.debug(f"Evicted {evicted} disk cache entries")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get disk cache statistics."""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "path": self.path,
+                "opened": self._conn is not None,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0.0,
+            }
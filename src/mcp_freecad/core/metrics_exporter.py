@@ -0,0 +1,264 @@
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from .cache import ResourceCache
+from .diagnostics import PerformanceMonitor
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Latency bucket bounds in seconds, from fast resource reads to slow recomputes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Statistics callable and the labels added to its samples
+MetricsSource = Tuple[Callable[[], Dict[str, Any]], Dict[str, str]]
+
+
+class _Family:
+    """A metric family collected for one scrape."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, suffix: str, labels: Dict[str, str], value: float) -> None:
+        self.samples.append((self.name + suffix, labels, value))
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# TYPE {self.name} {self.metric_type}")
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        for sample_name, labels, value in self.samples:
+            lines.append(
+                f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+
+class OpenMetricsExporter:
+    """
+    Render server, cache, connection and process metrics as OpenMetrics text.
+
+    Everything is read from counters that are already maintained elsewhere,
+    so a scrape only walks existing aggregates. Discovery of the FreeCAD
+    process is rate-limited because scanning the process table is the one
+    expensive step.
+    """
+
+    def __init__(
+        self,
+        performance_monitor: PerformanceMonitor,
+        resource_cache: ResourceCache,
+        connection_manager: Any = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        freecad_pid: Optional[int] = None,
+        process_scan_interval: float = 60.0,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            performance_monitor: Source of latency and error metrics
+            resource_cache: Source of cache statistics
+            connection_manager: Optional FreeCAD connection manager
+            buckets: Histogram bucket upper bounds in seconds
+            freecad_pid: Optional PID of the FreeCAD process to report RSS for
+            process_scan_interval: Minimum seconds between process table scans
+        """
+        self.performance_monitor = performance_monitor
+        self.resource_cache = resource_cache
+        self.connection_manager = connection_manager
+        self.buckets = list(buckets)
+        self.freecad_pid = freecad_pid
+        self.process_scan_interval = process_scan_interval
+        self.sources: Dict[str, MetricsSource] = {}
+        self._own_process = psutil.Process(os.getpid())
+        self._freecad_process: Optional[psutil.Process] = None
+        self._last_scan = 0.0
+
+    def register_source(
+        self,
+        name: str,
+        collect: Callable[[], Dict[str, Any]],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Register an additional source of numeric statistics.
+
+        Each numeric value returned by ``collect`` is exported as a gauge
+        named ``mcp_<prefix>_<key>``, where the prefix is the part of
+        ``name`` before any ``:``. Sources sharing a prefix (for example
+        several AI providers) should use distinct labels.
+
+        Args:
+            name: Unique source name, e.g. "ai_provider:claude"
+            collect: Callable returning a dictionary of statistics
+            labels: Optional labels attached to every sample
+        """
+        self.sources[name] = (collect, labels or {})
+
+    def render(self) -> str:
+        """Render all metrics in the OpenMetrics text format."""
+        families: Dict[str, _Family] = {}
+
+        def family(name: str, metric_type: str, help_text: str) -> _Family:
+            if name not in families:
+                families[name] = _Family(name, metric_type, help_text)
+            return families[name]
+
+        self._collect_performance(family)
+        self._collect_cache(family)
+        self._collect_connection(family)
+        self._collect_processes(family)
+        self._collect_sources(family)
+
+        lines: List[str] = []
+        for metric_family in families.values():
+            metric_family.render(lines)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _collect_performance(self, family: Callable[..., _Family]) -> None:
+        monitor = self.performance_monitor
+        uptime = family("mcp_uptime_seconds", "gauge", "Seconds since start")
+        uptime.add("", {}, time.time() - monitor.start_time)
+
+        duration = family(
+            "mcp_operation_duration_seconds",
+            "histogram",
+            "Latency of tool calls, resource reads and HTTP endpoints",
+        )
+        failures = family(
+            "mcp_operation_errors", "counter", "Failed tool calls and requests"
+        )
+        for name, metric in list(monitor.metrics.items()):
+            labels = {"metric": name}
+            counts = metric.histogram.cumulative_counts(self.buckets)
+            for bound, count in zip(self.buckets, counts):
+                duration.add("_bucket", {**labels, "le": repr(bound)}, count)
+            duration.add("_bucket", {**labels, "le": "+Inf"}, metric.total_samples)
+            duration.add("_count", labels, metric.total_samples)
+            duration.add("_sum", labels, metric.total_duration)
+            failures.add("_total", labels, metric.error_count)
+
+        errors = family("mcp_errors", "counter", "Recorded errors by type")
+        for error_type, count in list(monitor.error_counts.items()):
+            errors.add("_total", {"type": error_type}, count)
+        warnings = family("mcp_warnings", "counter", "Recorded warnings by type")
+        for warning_type, count in list(monitor.warning_counts.items()):
+            warnings.add("_total", {"type": warning_type}, count)
+
+    def _collect_cache(self, family: Callable[..., _Family]) -> None:
+        stats = self.resource_cache.get_stats()
+        family("mcp_cache_hits", "counter", "Resource cache hits").add(
+            "_total", {}, stats["hits"]
+        )
+        family("mcp_cache_misses", "counter", "Resource cache misses").add(
+            "_total", {}, stats["misses"]
+        )
+        family("mcp_cache_hit_ratio", "gauge", "Resource cache hit ratio").add(
+            "", {}, stats["hit_rate"]
+        )
+        family("mcp_cache_entries", "gauge", "Entries in the memory cache").add(
+            "", {}, stats["size"]
+        )
+        l2 = stats.get("l2")
+        if l2:
+            family("mcp_cache_disk_bytes", "gauge", "Bytes in the disk cache").add(
+                "", {}, l2["bytes"]
+            )
+
+    def _collect_connection(self, family: Callable[..., _Family]) -> None:
+        if self.connection_manager is None:
+            return
+        connected = family(
+            "mcp_freecad_connected", "gauge", "Whether FreeCAD is connected"
+        )
+        connected.add("", {}, 1 if self.connection_manager.connected else 0)
+        recovery = getattr(self.connection_manager, "recovery", None)
+        if recovery is not None:
+            family(
+                "mcp_freecad_connection_retries",
+                "gauge",
+                "Consecutive failed connection attempts",
+            ).add("", {}, recovery.retry_count)
+
+    def _collect_processes(self, family: Callable[..., _Family]) -> None:
+        rss = family("mcp_process_resident_memory_bytes", "gauge", "Resident set size")
+        try:
+            rss.add("", {"process": "server"}, self._own_process.memory_info().rss)
+        except psutil.Error as e:
+            logger.debug(f"Could not read server memory usage: {e}")
+
+        process = self._find_freecad_process()
+        if process is not None:
+            try:
+                rss.add("", {"process": "freecad"}, process.memory_info().rss)
+            except psutil.Error:
+                self._freecad_process = None
+
+    def _find_freecad_process(self) -> Optional[psutil.Process]:
+        """Return the FreeCAD process, rescanning at most once per interval."""
+        if self._freecad_process is not None and self._freecad_process.is_running():
+            return self._freecad_process
+
+        self._freecad_process = None
+        if self.freecad_pid is not None:
+            try:
+                self._freecad_process = psutil.Process(self.freecad_pid)
+            except psutil.Error:
+                pass
+            return self._freecad_process
+
+        now = time.time()
+        if now - self._last_scan < self.process_scan_interval:
+            return None
+        self._last_scan = now
+
+        own_pid = self._own_process.pid
+        for process in psutil.process_iter(["name"]):
+            name = (process.info.get("name") or "").lower()
+            if "freecad" in name and process.pid != own_pid:
+                self._freecad_process = process
+                break
+        return self._freecad_process
+
+    def _collect_sources(self, family: Callable[..., _Family]) -> None:
+        for name, (collect, labels) in list(self.sources.items()):
+            prefix = name.split(":", 1)[0]
+            try:
+                stats = collect()
+            except Exception as e:
+                logger.warning(f"Metrics source {name} failed: {e}")
+                continue
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                help_text = f"{prefix} statistic {key}"
+                family(f"mcp_{prefix}_{key}", "gauge", help_text).add("", labels, value)
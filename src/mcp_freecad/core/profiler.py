@@ -0,0 +1,268 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+@dataclass
+class ProfileSession:
+    """State of one profiling run."""
+
+    mode: str
+    started_at: float
+    deadline: Optional[float] = None
+    tool_call_limit: Optional[int] = None
+    interval: float = 0.005
+    tool_calls: int = 0
+    finished_at: Optional[float] = None
+    profile: Optional[cProfile.Profile] = None
+    stacks: Counter = field(default_factory=Counter)
+    sample_count: int = 0
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    sampler: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+
+class Profiler:
+    """
+    On-demand profiler for a running server process.
+
+    Two modes are supported:
+
+    - ``cprofile``: deterministic profiling of the thread that started the
+      session (the event loop thread when started from an endpoint). Start,
+      stop and polling must happen on that thread.
+    - ``sampling``: a background thread snapshots the stacks of all other
+      threads every ``interval`` seconds and aggregates them as collapsed
+      stacks, suitable for flamegraph tools.
+
+    A session ends after ``duration`` seconds, after ``tool_calls`` tool
+    calls have finished, or when stopped explicitly, whichever comes first.
+    Only the most recent session's results are kept.
+    """
+
+    def __init__(self, max_stack_depth: int = 128):
+        """
+        Initialize the profiler.
+
+        Args:
+            max_stack_depth: Maximum frames recorded per sampled stack
+        """
+        self.max_stack_depth = max_stack_depth
+        self.session: Optional[ProfileSession] = None
+        self.lock = threading.Lock()
+
+    def start(
+        self,
+        mode: str = "cprofile",
+        duration: Optional[float] = None,
+        tool_calls: Optional[int] = None,
+        interval: float = 0.005,
+    ) -> Dict[str, Any]:
+        """
+        Start a profiling session.
+
+        Args:
+            mode: "cprofile" or "sampling"
+            duration: Stop after this many seconds
+            tool_calls: Stop after this many tool calls have finished
+            interval: Sampling interval in seconds (sampling mode only)
+
+        Returns:
+            Session status, or an error dictionary
+        """
+        if mode not in PROFILE_MODES:
+            return {"status": "error", "message": f"Unknown profiling mode: {mode}"}
+        if duration is None and tool_calls is None:
+            return {
+                "status": "error",
+                "message": "Either duration or tool_calls must be given",
+            }
+
+        with self.lock:
+            if self.session is not None and self.session.running:
+                return {"status": "error", "message": "A profiling session is running"}
+
+            now = time.time()
+            session = ProfileSession(
+                mode=mode,
+                started_at=now,
+                deadline=now + duration if duration is not None else None,
+                tool_call_limit=tool_calls,
+                interval=interval,
+            )
+            if mode == "cprofile":
+                session.profile = cProfile.Profile()
+                session.profile.enable()
+            else:
+                session.sampler = threading.Thread(
+                    target=self._sample, args=(session,), daemon=True
+                )
+                session.sampler.start()
+            self.session = session
+
+        logger.info(
+            f"Started {mode} profiling (duration={duration}, tool_calls={tool_calls})"
+        )
+        return self.status()
+
+    def tool_call_finished(self) -> None:
+        """Count a finished tool call and stop the session if a limit is reached."""
+        session = self.session
+        if session is None or not session.running:
+            return
+        session.tool_calls += 1
+        self.poll()
+
+    def counted(self, func: Callable) -> Callable:
+        """Decorator that counts calls of an async tool toward session limits."""
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.tool_call_finished()
+
+        return wrapper
+
+    def poll(self) -> None:
+        """Stop the session if its duration or tool call limit has been reached."""
+        session = self.session
+        if session is None or not session.running:
+            return
+        expired = session.deadline is not None and time.time() >= session.deadline
+        exhausted = (
+            session.tool_call_limit is not None
+            and session.tool_calls >= session.tool_call_limit
+        )
+        if expired or exhausted:
+            self.stop()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop the current session.
+
+        Returns:
+            Session status, or an error dictionary if nothing was profiled
+        """
+        with self.lock:
+            session = self.session
+            if session is None:
+                return {"status": "error", "message": "No profiling session"}
+            if session.running:
+                if session.profile is not None:
+                    session.profile.disable()
+                session.stop_event.set()
+                session.finished_at = time.time()
+                logger.info(f"Stopped {session.mode} profiling")
+
+        sampler = session.sampler
+        if sampler is not None and sampler is not threading.current_thread():
+            sampler.join(timeout=1.0)
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Get the state of the current or last session."""
+        session = self.session
+        if session is None:
+            return {"status": "idle"}
+        end = session.finished_at or time.time()
+        return {
+            "status": "running" if session.running else "finished",
+            "mode": session.mode,
+            "started_at": session.started_at,
+            "elapsed": end - session.started_at,
+            "tool_calls": session.tool_calls,
+            "tool_call_limit": session.tool_call_limit,
+            "deadline": session.deadline,
+            "samples": session.sample_count,
+        }
+
+    def result(self, fmt: str = "pstats", limit: int = 50) -> Dict[str, Any]:
+        """
+        Get the results of the last finished session.
+
+        Args:
+            fmt: "pstats" for a text report sorted by cumulative time, or
+                "collapsed" for collapsed stacks (sampling mode only)
+            limit: Maximum number of functions in a pstats report
+
+        Returns:
+            Dictionary with the report under ``data``, or an error dictionary
+        """
+        self.poll()
+        session = self.session
+        if session is None:
+            return {"status": "error", "message": "No profiling session"}
+        if session.running:
+            return {"status": "error", "message": "Profiling session still running"}
+
+        if fmt == "collapsed":
+            if session.mode != "sampling":
+                return {
+                    "status": "error",
+                    "message": "Collapsed stacks require a sampling session",
+                }
+            data = "\n".join(
+                f"{stack} {count}" for stack, count in session.stacks.most_common()
+            )
+        elif fmt == "pstats":
+            data = self._pstats_report(session, limit)
+        else:
+            return {"status": "error", "message": f"Unknown result format: {fmt}"}
+
+        return {**self.status(), "format": fmt, "data": data}
+
+    def _pstats_report(self, session: ProfileSession, limit: int) -> str:
+        if session.profile is None:
+            # Sampling mode: report the hottest leaf frames instead
+            leaves = Counter()
+            for stack, count in session.stacks.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            total = session.sample_count or 1
+            lines = [f"{session.sample_count} samples"]
+            for frame, count in leaves.most_common(limit):
+                lines.append(f"{count:8d} {100.0 * count / total:6.2f}%  {frame}")
+            return "\n".join(lines)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(session.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+    def _sample(self, session: ProfileSession) -> None:
+        """Sampling loop run on a background thread."""
+        own_thread = threading.get_ident()
+        while not session.stop_event.wait(session.interval):
+            if session.deadline is not None and time.time() >= session.deadline:
+                self.stop()
+                break
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < self.max_stack_depth:
+                    code = frame.f_code
+                    frames.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                session.stacks[";".join(reversed(frames))] += 1
+            session.sample_count += 1
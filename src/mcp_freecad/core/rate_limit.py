@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket that allows reservations.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    A reservation takes tokens immediately, letting the balance go negative,
+    and reports how long the caller has to wait before the tokens are
+    actually available. This lets queued requests be served in order
+    without a separate queue structure.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost: float, max_wait: float = 0.0) -> Optional[float]:
+        """
+        Reserve tokens if they become available within ``max_wait`` seconds.
+
+        Args:
+            cost: Number of tokens to take
+            max_wait: Longest acceptable wait in seconds
+
+        Returns:
+            Seconds to wait before proceeding (0.0 if immediate), or None if
+            the reservation was refused and no tokens were taken
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0.0
+            if self.rate <= 0:
+                return None
+            wait = (cost - self.tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self.tokens -= cost
+            return wait
+
+    def retry_after(self, cost: float) -> float:
+        """Seconds until ``cost`` tokens would be available."""
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= cost:
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (cost - self.tokens) / self.rate
+
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of an admission check."""
+
+    admitted: bool
+    waited: float = 0.0
+    retry_after: float = 0.0
+    cost: float = 1.0
+
+
+class RateLimiter:
+    """
+    Per-key admission control with token buckets.
+
+    Each API key gets its own bucket. Requests are weighted by cost, looked
+    up from the ``costs`` table by the longest key that occurs in the
+    request path, so ``{"export": 5}`` weights every export tool. With the
+    ``queue`` policy a request that does not fit waits for tokens up to
+    ``max_queue_wait`` seconds; with ``reject`` (or when the wait would be
+    longer) it is refused with a retry hint.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            config: Rate limit configuration with ``rate``, ``burst``,
+                ``policy``, ``max_queue_wait``, ``costs`` and optional
+                per-key overrides under ``keys``
+        """
+        self.rate = config.get("rate", 10.0)
+        self.burst = config.get("burst", 20.0)
+        self.policy = config.get("policy", "queue")
+        self.max_queue_wait = config.get("max_queue_wait", 5.0)
+        self.costs: Dict[str, float] = config.get("costs", {})
+        self.default_cost = config.get("default_cost", 1.0)
+        self.key_overrides: Dict[str, Dict[str, Any]] = config.get("keys", {})
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = Lock()
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "waiting": 0,
+        }
+        # Longest keys first so the most specific cost wins
+        self._cost_keys = sorted(self.costs, key=len, reverse=True)
+        logger.info(
+            f"Rate limiting enabled: rate={self.rate}/s, burst={self.burst}, "
+            f"policy={self.policy}"
+        )
+
+    def cost_for(self, path: str) -> float:
+        """
+        Get the cost of a request path.
+
+        Args:
+            path: The request path, e.g. "/tools/export_stl/execute"
+
+        Returns:
+            The request cost in tokens
+        """
+        for key in self._cost_keys:
+            if key in path:
+                return self.costs[key]
+        return self.default_cost
+
+    def _bucket(self, api_key: str) -> TokenBucket:
+        with self.lock:
+            bucket = self.buckets.get(api_key)
+            if bucket is None:
+                override = self.key_overrides.get(api_key, {})
+                bucket = TokenBucket(
+                    rate=override.get("rate", self.rate),
+                    capacity=override.get("burst", self.burst),
+                )
+                self.buckets[api_key] = bucket
+            return bucket
+
+    async def admit(self, api_key: str, path: str) -> AdmissionDecision:
+        """
+        Decide whether a request may proceed, waiting for tokens if queued.
+
+        Args:
+            api_key: The authenticated API key
+            path: The request path
+
+        Returns:
+            The admission decision
+        """
+        cost = self.cost_for(path)
+        bucket = self._bucket(api_key)
+        max_wait = self.max_queue_wait if self.policy == "queue" else 0.0
+
+        wait = bucket.reserve(cost, max_wait)
+        if wait is None:
+            self.stats["rejected"] += 1
+            return AdmissionDecision(
+                admitted=False, retry_after=bucket.retry_after(cost), cost=cost
+            )
+
+        if wait > 0:
+            self.stats["queued"] += 1
+            self.stats["queue_wait_seconds"] += wait
+            self.stats["waiting"] += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.stats["waiting"] -= 1
+
+        self.stats["admitted"] += 1
+        return AdmissionDecision(admitted=True, waited=wait, cost=cost)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate limiter statistics."""
+        return {**self.stats, "keys": len(self.buckets)}
@@ -0,0 +1,198 @@
+import dataclasses
+import datetime
+import enum
+import gzip
+import json
+import logging
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    Convert values the JSON encoders do not handle natively.
+
+    Covers numpy arrays and scalars, FreeCAD vectors, rotations, placements
+    and quantities, dataclasses, pydantic models, dates, enums and sets.
+    FreeCAD and numpy checks use duck
+    typing so neither numpy nor FreeCAD has to be importable.
+
+    Args:
+        obj: The value to convert
+
+    Returns:
+        A JSON-serializable equivalent
+
+    Raises:
+        TypeError: If the value has no known conversion
+    """
+    # numpy arrays and scalars
+    if hasattr(obj, "tolist") and hasattr(obj, "dtype"):
+        return obj.tolist()
+    # FreeCAD.Placement
+    if hasattr(obj, "Base") and hasattr(obj, "Rotation"):
+        return {"base": encode_default(obj.Base), "rotation": list(obj.Rotation.Q)}
+    # FreeCAD.Vector
+    if hasattr(obj, "x") and hasattr(obj, "y") and hasattr(obj, "z"):
+        return {"x": obj.x, "y": obj.y, "z": obj.z}
+    # FreeCAD.Rotation
+    if hasattr(obj, "Q") and hasattr(obj, "Axis"):
+        return list(obj.Q)
+    # FreeCAD.Units.Quantity
+    if hasattr(obj, "Value") and hasattr(obj, "Unit"):
+        return obj.Value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON.
+
+    Uses orjson when installed and the standard library otherwise.
+
+    Args:
+        content: The value to serialize
+
+    Returns:
+        The encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            content,
+            default=encode_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        content, default=encode_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when available.
+
+    Returning this response directly from a route also skips FastAPI's
+    ``jsonable_encoder`` pass, which dominates the cost of large nested
+    property dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses above a size threshold.
+
+    zstd is preferred when the client accepts it and the ``zstandard``
+    package is installed, otherwise gzip is used. Streaming responses
+    (for example server-sent events) and already encoded bodies are passed
+    through unchanged, so nothing is buffered beyond a single body message.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            minimum_size: Smallest body in bytes worth compressing
+            gzip_level: gzip compression level (1-9)
+            zstd_level: zstd compression level
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = Headers(scope=scope).get("accept-encoding", "")
+        encodings = {part.split(";")[0].strip() for part in accepted.split(",")}
+        if ZSTD_AVAILABLE and "zstd" in encodings:
+            return "zstd"
+        if "gzip" in encodings:
+            return "gzip"
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body with the given content encoding."""
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, started
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or started:
+                await send(message)
+                return
+
+            started = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            compressible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and not headers.get("content-type", "").startswith("text/event-stream")
+            )
+            if compressible:
+                body = self.compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
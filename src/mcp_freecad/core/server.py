@@ -1,12 +1,15 @@
+import asyncio
+import inspect
 import json
 import logging
+import math
 import time
 from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator, Callable, Dict, Generic, List, Optional, TypeVar
 
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
 from pydantic import BaseModel
 
@@ -14,7 +17,12 @@ from ..tools.base import ToolParams, ToolProvider, ToolResult
 from ..tools.resource import ResourceParams, ResourceProvider, ResourceResult
 from .cache import ResourceCache
 from .diagnostics import PerformanceMonitor
+from .disk_cache import DiskCache
+from .metrics_exporter import CONTENT_TYPE, OpenMetricsExporter
+from .profiler import Profiler
+from .rate_limit import AdmissionDecision, RateLimiter
 from .recovery import ConnectionRecovery, FreeCADConnectionManager, RecoveryConfig
+from .serialization import CompressionMiddleware, FastJSONResponse
 
 T = TypeVar("T")
 
@@ -23,10 +31,28 @@ class AuthManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         logger.info("Initializing authentication manager")
+        self.api_keys = {config.get("api_key", "")} | set(config.get("api_keys", []))
+        # Path prefixes served without authentication or rate limiting
+        self.public_paths = tuple(config.get("public_paths", ["/health", "/metrics"]))
+
+        rate_limit_config = config.get("rate_limit", {})
+        self.rate_limiter: Optional[RateLimiter] = None
+        if rate_limit_config.get("enabled", False):
+            self.rate_limiter = RateLimiter(rate_limit_config)
 
     async def authenticate(self, token: str) -> bool:
         # Simple token authentication for now
-        return token == self.config.get("api_key", "")
+        return token in self.api_keys
+
+    def is_public(self, path: str) -> bool:
+        """Check whether a path is served without authentication."""
+        return path.startswith(self.public_paths)
+
+    async def admit(self, token: str, path: str) -> AdmissionDecision:
+        """Apply the per-key rate limit to an authenticated request."""
+        if self.rate_limiter is None:
+            return AdmissionDecision(admitted=True)
+        return await self.rate_limiter.admit(token, path)
 
 
 class ToolExecutionParams(BaseModel):
@@ -37,12 +63,21 @@ class ResourceAccessParams(BaseModel):
     params: Dict[str, Any]
 
 
+class ProfileParams(BaseModel):
+    mode: str = "cprofile"
+    duration: Optional[float] = None
+    tool_calls: Optional[int] = None
+    interval: float = 0.005
+
+
 class MCPServer:
     def __init__(self, config_path: str = "config.json"):
         self.config = self._load_config(config_path)
         self.resources = {}
         self.tools = {}
         self.event_handlers = {}
+        # Document event provider shared with providers that keep derived state
+        self.document_events = None
         self.auth_manager = AuthManager(self.config.get("auth", {}))
         self.recovery = ConnectionRecovery(
             config=RecoveryConfig(
@@ -57,19 +92,45 @@ class MCPServer:
         self.start_time = time.time()
 
         # Initialize optimization components
+        l2_config = self.config.get("cache", {}).get("l2", {})
+        self.disk_cache = None
+        if l2_config.get("enabled", False):
+            self.disk_cache = DiskCache(
+                path=l2_config.get("path", "cache/resources.sqlite"),
+                max_bytes=l2_config.get("max_bytes", 64 * 1024 * 1024),
+            )
         self.resource_cache = ResourceCache(
             default_ttl=self.config.get("cache", {}).get("default_ttl", 30.0),
             max_size=self.config.get("cache", {}).get("max_size", 100),
+            l2=self.disk_cache,
         )
 
         self.connection_manager = FreeCADConnectionManager(
             config=self.recovery.config, recovery=self.recovery
         )
 
-        self.performance_monitor = PerformanceMonitor()
+        self.performance_monitor = PerformanceMonitor(
+            sample_buffer_size=self.config.get("performance", {}).get(
+                "sample_buffer_size", 100
+            )
+        )
+
+        self.metrics_exporter = OpenMetricsExporter(
+            performance_monitor=self.performance_monitor,
+            resource_cache=self.resource_cache,
+            connection_manager=self.connection_manager,
+            freecad_pid=self.config.get("freecad", {}).get("pid"),
+        )
+
+        if self.auth_manager.rate_limiter is not None:
+            self.register_metrics_source(
+                "rate_limit", self.auth_manager.rate_limiter.get_stats
+            )
+
+        self.profiler = Profiler()
 
         # Initialize FastAPI app
-        self.app = FastAPI()
+        self.app = FastAPI(default_response_class=FastJSONResponse)
         self._setup_routes()
         self._setup_middleware()
 
@@ -113,6 +174,9 @@ class MCPServer:
                 f"Attached connection manager to resource provider {resource_id}"
             )
 
+        if self.document_events is not None:
+            self._attach_document_events(resource_id, resource_provider)
+
         self.resources[resource_id] = resource_provider
         logger.info(f"Registered resource provider for {resource_id}")
 
@@ -134,9 +198,60 @@ class MCPServer:
             tool_provider.set_performance_monitor(self.performance_monitor)
             logger.info(f"Attached performance monitor to tool provider {tool_id}")
 
+        if self.document_events is not None:
+            self._attach_document_events(tool_id, tool_provider)
+
         self.tools[tool_id] = tool_provider
         logger.info(f"Registered tool provider for {tool_id}")
 
+    def _attach_document_events(self, provider_id: str, provider: Any) -> None:
+        """Attach the document events to a provider that keeps derived state."""
+        if hasattr(provider, "attach_events"):
+            provider.attach_events(self.document_events)
+            logger.info(f"Attached document events to provider {provider_id}")
+
+    def get_tool_schemas(self) -> Dict[str, Any]:
+        """
+        Get the schema of every registered tool.
+
+        Schemas are persisted keyed by the content of the module defining
+        the provider, so they are only rebuilt after that module changes.
+
+        Returns:
+            The schemas by tool id
+        """
+        schemas = {}
+        for tool_id, provider in self.tools.items():
+            key = f"tools:{tool_id}/schema"
+            source = inspect.getsourcefile(type(provider))
+            persist = self.disk_cache is not None and source is not None
+            if persist:
+                key = self.disk_cache.document_key(key, source)
+
+            schema = self.resource_cache.get(key, persist=persist)
+            if schema is None:
+                schema = provider.tool_schema.model_dump()
+                self.resource_cache.set(key, schema, persist=persist)
+            schemas[tool_id] = schema
+        return schemas
+
+    def register_metrics_source(
+        self,
+        name: str,
+        collect: Callable[[], Dict[str, Any]],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Register a statistics source to be exported on /metrics.
+
+        Args:
+            name: Unique source name, e.g. "ai_provider:claude"
+            collect: Callable returning a dictionary of numeric statistics
+            labels: Optional labels attached to every exported sample
+        """
+        self.metrics_exporter.register_source(name, collect, labels)
+        logger.info(f"Registered metrics source {name}")
+
     def register_event_handler(self, event_type: str, handler: Any) -> None:
         """
         Register an event handler with the server.
@@ -158,6 +273,14 @@ class MCPServer:
         self.event_handlers[event_type].append(handler)
         logger.info(f"Registered event handler for {event_type}")
 
+        # Document events keep snapshots, indexes and caches of providers
+        # up to date, including providers registered later
+        if event_type == "document" and self.document_events is None:
+            self.document_events = handler
+            providers = list(self.resources.items()) + list(self.tools.items())
+            for provider_id, provider in providers:
+                self._attach_document_events(provider_id, provider)
+
     async def initialize(self) -> None:
         """
         Initialize the server components.
@@ -223,7 +346,20 @@ class MCPServer:
             )
 
             # Execute tool
-            result = await self.tools[tool_id].execute_tool(tool_id, params)
+            start_time = time.time()
+            try:
+                result = await self.tools[tool_id].execute_tool(tool_id, params)
+            except Exception as e:
+                self.performance_monitor.track(
+                    f"tool.{tool_id}",
+                    time.time() - start_time,
+                    success=False,
+                    error=str(e),
+                )
+                raise
+            finally:
+                self.profiler.tool_call_finished()
+            self.performance_monitor.track(f"tool.{tool_id}", time.time() - start_time)
 
             # Emit post-execution event
             await self._emit_event(
@@ -292,6 +428,11 @@ class MCPServer:
                 "server_uptime": time.time() - self.start_time,
             }
 
+        @self.app.get("/tools")
+        async def list_tools():
+            """List the registered tools with their schemas."""
+            return self.get_tool_schemas()
+
         @self.app.post("/tools/{tool_id}/execute")
         async def execute_tool(tool_id: str, request: ToolExecutionParams):
             """Execute a tool."""
@@ -305,13 +446,60 @@ class MCPServer:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Resource {resource_id} not found",
                 )
-            return await self.resources[resource_id].get_resource(params=request.params)
+            return FastJSONResponse(
+                await self.resources[resource_id].get_resource(params=request.params)
+            )
 
         @self.app.get("/diagnostics")
         async def get_diagnostics():
             """Get server diagnostics."""
             return self.performance_monitor.get_diagnostics_report()
 
+        @self.app.post("/diagnostics/profile/start")
+        async def start_profile(request: ProfileParams):
+            """Profile this process for a duration or a number of tool calls."""
+            result = self.profiler.start(
+                mode=request.mode,
+                duration=request.duration,
+                tool_calls=request.tool_calls,
+                interval=request.interval,
+            )
+            if result.get("status") == "error":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=result["message"]
+                )
+            if request.duration is not None:
+                # cProfile must be stopped on the event loop thread
+                asyncio.get_running_loop().call_later(
+                    request.duration, self.profiler.poll
+                )
+            return result
+
+        @self.app.post("/diagnostics/profile/stop")
+        async def stop_profile():
+            """Stop the running profiling session."""
+            return self.profiler.stop()
+
+        @self.app.get("/diagnostics/profile")
+        async def get_profile(format: str = "pstats", limit: int = 50):
+            """Get profiling status, or results once the session has finished."""
+            self.profiler.poll()
+            if self.profiler.status()["status"] != "finished":
+                return self.profiler.status()
+            result = self.profiler.result(fmt=format, limit=limit)
+            if result.get("status") == "error":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=result["message"]
+                )
+            return result
+
+        @self.app.get("/metrics")
+        async def get_metrics():
+            """Expose server metrics in OpenMetrics text format."""
+            return Response(
+                content=self.metrics_exporter.render(), media_type=CONTENT_TYPE
+            )
+
         @self.app.post("/cache/clear")
         async def clear_cache():
             """Clear the resource cache."""
@@ -323,7 +511,7 @@ class MCPServer:
 
         @self.app.middleware("http")
         async def auth_middleware(request: Request, call_next):
-            if request.url.path.startswith("/health"):
+            if self.auth_manager.is_public(request.url.path):
                 return await call_next(request)
 
             token = request.headers.get("Authorization", "").replace("Bearer ", "")
@@ -332,6 +520,16 @@ class MCPServer:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid authentication token",
                 )
+
+            decision = await self.auth_manager.admit(token, request.url.path)
+            if not decision.admitted:
+                logger.debug(f"Rate limited {request.url.path} (cost {decision.cost})")
+                retry_after = min(3600, max(1, math.ceil(decision.retry_after)))
+                return JSONResponse(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    content={"detail": "Rate limit exceeded"},
+                    headers={"Retry-After": str(retry_after)},
+                )
             return await call_next(request)
 
         @self.app.middleware("http")
@@ -353,3 +551,12 @@ class MCPServer:
                     error=str(e),
                 )
                 raise
+
+        compression = self.config.get("compression", {})
+        if compression.get("enabled", True):
+            self.app.add_middleware(
+                CompressionMiddleware,
+                minimum_size=compression.get("minimum_size", 1024),
+                gzip_level=compression.get("gzip_level", 6),
+                zstd_level=compression.get("zstd_level", 3),
+            )
@@ -0,0 +1,349 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    sampled: bool = True
+    # Finished spans of the whole trace, shared by every span in it
+    _trace_spans: List["Span"] = field(default_factory=list, repr=False)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, or 0.0 while the span is open."""
+        return (self.end_time - self.start_time) if self.end_time else 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class JsonlSpanExporter:
+    """Append finished traces to a local JSON Lines file, one span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+class OTLPJsonSpanExporter:
+    """
+    Send traces to an OTLP/HTTP collector using the JSON encoding.
+
+    Requests are made from a background thread so tool calls never wait on
+    the collector. Traces are dropped if the queue is full.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "mcp-freecad",
+        timeout: float = 5.0,
+        max_queue: int = 1000,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+
+    def export(self, spans: List[Span]) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.debug("Trace export queue full, dropping trace")
+
+    def _run(self) -> None:
+        import requests
+
+        while True:
+            spans = self._queue.get()
+            try:
+                requests.post(
+                    self.endpoint, json=self.encode(spans), timeout=self.timeout
+                )
+            except Exception as e:
+                logger.debug(f"Failed to export trace to {self.endpoint}: {e}")
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        """Encode spans as an OTLP ExportTraceServiceRequest."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "mcp_freecad"},
+                            "spans": [self._encode_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _encode_span(self, span: Span) -> Dict[str, Any]:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in span.attributes.items()
+            ],
+            "status": {"code": 2 if span.status == "error" else 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "mcp_freecad_current_span", default=None
+)
+
+
+class Tracer:
+    """
+    Lightweight tracer with head-based sampling.
+
+    The sampling decision is made when a root span starts and inherited by
+    all of its children. When a root span finishes, the whole trace is
+    handed to the exporter. Without an exporter nothing is recorded.
+    """
+
+    def __init__(self, exporter: Any = None, sample_rate: float = 1.0):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Object with an ``export(spans)`` method, or None to disable
+            sample_rate: Fraction of traces to record, between 0.0 and 1.0
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    def current_span(self) -> Optional[Span]:
+        """Return the active span in this context, if any."""
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Start a span as a child of the current one.
+
+        Args:
+            name: Span name
+            **attributes: Initial span attributes
+
+        Yields:
+            The span, or None when tracing is disabled
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        if parent is None:
+            span = Span(
+                name=name,
+                trace_id=uuid.uuid4().hex,
+                span_id=uuid.uuid4().hex[:16],
+                attributes=dict(attributes),
+                sampled=random.random() < self.sample_rate,
+            )
+        else:
+            span = Span(
+                name=name,
+                trace_id=parent.trace_id,
+                span_id=uuid.uuid4().hex[:16],
+                parent_id=parent.span_id,
+                attributes=dict(attributes),
+                sampled=parent.sampled,
+                _trace_spans=parent._trace_spans,
+            )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set_attribute("error", str(e))
+            raise
+        finally:
+            span.end_time = time.time()
+            _current_span.reset(token)
+            if span.sampled:
+                span._trace_spans.append(span)
+                if parent is None:
+                    self._export(span._trace_spans)
+
+    def inject(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the trace context to propagate to a remote process.
+
+        Returns:
+            A dictionary with trace and parent span IDs, or None if the
+            current trace is not being recorded
+        """
+        span = _current_span.get()
+        if span is None or not span.sampled:
+            return None
+        return {"trace_id": span.trace_id, "span_id": span.span_id}
+
+    def record_remote_timings(
+        self, timings: List[Dict[str, Any]], origin: Optional[float] = None
+    ) -> None:
+        """
+        Add timings reported by a remote process as children of the current span.
+
+        Args:
+            timings: Entries with ``name``, ``offset`` and ``duration`` in seconds,
+                where ``offset`` is relative to when the remote received the call
+            origin: Local time the request was sent, defaults to the span start
+        """
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return
+        base = origin if origin is not None else parent.start_time
+        for timing in timings:
+            start = base + float(timing.get("offset", 0.0))
+            parent._trace_spans.append(
+                Span(
+                    name=f"freecad.{timing.get('name', 'unknown')}",
+                    trace_id=parent.trace_id,
+                    span_id=uuid.uuid4().hex[:16],
+                    parent_id=parent.span_id,
+                    start_time=start,
+                    end_time=start + float(timing.get("duration", 0.0)),
+                    attributes={"remote": True},
+                    _trace_spans=parent._trace_spans,
+                )
+            )
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(sorted(spans, key=lambda s: s.start_time))
+        except Exception as e:
+            logger.warning(f"Failed to export trace: {e}")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _tracer
+
+
+def configure_tracing(config: Dict[str, Any]) -> Tracer:
+    """
+    Configure the process-wide tracer from the ``tracing`` config section.
+
+    Args:
+        config: Tracing configuration with ``enabled``, ``sample_rate``,
+            ``exporter`` ("jsonl" or "otlp"), ``path`` and ``endpoint``
+
+    Returns:
+        The configured tracer
+    """
+    if not config.get("enabled", False):
+        _tracer.exporter = None
+        return _tracer
+
+    exporter_type = config.get("exporter", "jsonl")
+    if exporter_type == "otlp":
+        _tracer.exporter = OTLPJsonSpanExporter(
+            endpoint=config.get("endpoint", "http://localhost:4318/v1/traces"),
+            service_name=config.get("service_name", "mcp-freecad"),
+        )
+    else:
+        _tracer.exporter = JsonlSpanExporter(config.get("path", "logs/traces.jsonl"))
+    _tracer.sample_rate = config.get("sample_rate", 1.0)
+    logger.info(
+        f"Tracing enabled ({exporter_type} exporter, sample_rate={_tracer.sample_rate})"
+    )
+    return _tracer
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that runs an async function inside a span.
+
+    Args:
+        name: Span name, defaults to the function name
+    """
+
+    def decorator(func: Callable):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with _tracer.span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
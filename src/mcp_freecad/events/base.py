@@ -1,14 +1,18 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Coroutine, Dict, Set
+from typing import Any, Callable, Coroutine, Dict, List, Set
 
 EventHandler = Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
 
+logger = logging.getLogger(__name__)
+
 
 class EventProvider(ABC):
     """Base class for all event providers in the MCP server."""
 
     def __init__(self):
         self.listeners: Set[str] = set()
+        self.subscribers: List[EventHandler] = []
 
     def add_listener(self, client_id: str) -> None:
         """
@@ -29,6 +33,28 @@ class EventProvider(ABC):
         if client_id in self.listeners:
             self.listeners.remove(client_id)
 
+    def add_subscriber(self, handler: EventHandler) -> None:
+        """
+        Add an in-process handler that receives every emitted event.
+
+        Args:
+            handler: Coroutine function called with the event data
+        """
+        self.subscribers.append(handler)
+
+    async def notify_subscribers(self, event_data: Dict[str, Any]) -> None:
+        """
+        Pass an event to all in-process subscribers.
+
+        Args:
+            event_data: The event data
+        """
+        for handler in self.subscribers:
+            try:
+                await handler(event_data)
+            except Exception as e:
+                logger.error(f"Error in event subscriber: {e}")
+
     async def handle_event(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """
         Handle an event from an external source.
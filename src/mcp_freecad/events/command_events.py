@@ -66,9 +66,11 @@ class CommandExecutionEventProvider(EventProvider):
         logger.info(f"Command executed: {command_name}")
 
         # Create event data
+        active_document = getattr(self.app, "ActiveDocument", None)
         event_data = {
             "type": "command_executed",
             "command": command_name,
+            "document": active_document.Name if active_document else None,
             "timestamp": time.time(),
         }
 
@@ -102,6 +104,7 @@ class CommandExecutionEventProvider(EventProvider):
             event_type: The type of event
             event_data: The event data
         """
+        await self.notify_subscribers(event_data)
         if self.event_router is not None:
             await self.event_router.broadcast_event(event_type, event_data)
         else:
@@ -1,12 +1,32 @@
 import asyncio
 import logging
 import time
-from typing import Any, Dict, Set
+from typing import Any, Dict, Optional, Set
 
 from ..events.base import EventProvider
 
 logger = logging.getLogger(__name__)
 
+# Events only passed to in-process subscribers. A recompute changes many
+# properties of many objects; clients learn about it from document_changed.
+INTERNAL_EVENTS = ("object_changed",)
+
+
+class _DocumentObserver:
+    """Forwards FreeCAD document observer callbacks to the event provider."""
+
+    def __init__(self, provider: "DocumentEventProvider"):
+        self.provider = provider
+
+    def slotCreatedObject(self, obj):
+        self.provider._on_object_event("object_created", obj)
+
+    def slotDeletedObject(self, obj):
+        self.provider._on_object_event("object_deleted", obj)
+
+    def slotChangedObject(self, obj, prop):
+        self.provider._on_object_event("object_changed", obj, prop)
+
 
 class DocumentEventProvider(EventProvider):
     """Event provider for FreeCAD document events."""
@@ -22,6 +42,8 @@ class DocumentEventProvider(EventProvider):
         super().__init__()
         self.app = freecad_app
         self.event_router = event_router
+        # Loop events are posted to when FreeCAD calls back from another thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         if self.app is None:
             try:
@@ -43,6 +65,11 @@ class DocumentEventProvider(EventProvider):
             logger.warning("FreeCAD not available, cannot set up signal handlers")
             return
 
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("No running event loop yet to post FreeCAD callbacks to")
+
         try:
             # Connect to document changed signal
             if hasattr(self.app, "signalDocumentChanged"):
@@ -64,6 +91,12 @@ class DocumentEventProvider(EventProvider):
                 self.app.signalActiveDocument.connect(self._on_active_document_changed)
                 logger.info("Connected to FreeCAD active document signal")
 
+            # Observe object creation, deletion and property changes
+            if hasattr(self.app, "addDocumentObserver"):
+                self._observer = _DocumentObserver(self)
+                self.app.addDocumentObserver(self._observer)
+                logger.info("Registered FreeCAD document observer")
+
             # Connect to GUI selection changed signal if available
             if hasattr(self.app, "Gui") and hasattr(self.app.Gui, "Selection"):
                 if hasattr(self.app.Gui.Selection, "signalSelectionChanged"):
@@ -84,7 +117,23 @@ class DocumentEventProvider(EventProvider):
             "timestamp": time.time(),
             "recomputed_objects": [obj.Name for obj in doc.Objects if obj.State],
         }
-        asyncio.create_task(self.emit_event("document_changed", event_data))
+        self._post("document_changed", event_data)
+
+    def _on_object_event(self, event_type: str, obj, prop: str = None):
+        """Handle an object created, deleted or changed event."""
+        logger.debug(f"{event_type}: {obj.Name} {prop or ''}")
+        event_data = {
+            "type": event_type,
+            "document": obj.Document.Name if hasattr(obj, "Document") else None,
+            "object": obj.Name,
+            "timestamp": time.time(),
+        }
+        if prop is not None:
+            event_data["property"] = prop
+        if event_type == "object_deleted":
+            # Read while the object still exists; its inputs may be freed
+            event_data["out_list"] = [o.Name for o in getattr(obj, "OutList", [])]
+        self._post(event_type, event_data)
 
     def _on_document_created(self, doc):
         """Handle document created event."""
@@ -94,7 +143,7 @@ class DocumentEventProvider(EventProvider):
             "document": doc.Name,
             "timestamp": time.time(),
         }
-        asyncio.create_task(self.emit_event("document_created", event_data))
+        self._post("document_created", event_data)
 
     def _on_document_closed(self, doc_name):
         """Handle document closed event."""
@@ -104,7 +153,7 @@ class DocumentEventProvider(EventProvider):
             "document": doc_name,
             "timestamp": time.time(),
         }
-        asyncio.create_task(self.emit_event("document_closed", event_data))
+        self._post("document_closed", event_data)
 
     def _on_active_document_changed(self, doc):
         """Handle active document changed event."""
@@ -114,7 +163,7 @@ class DocumentEventProvider(EventProvider):
             "document": doc.Name if doc else None,
             "timestamp": time.time(),
         }
-        asyncio.create_task(self.emit_event("active_document_changed", event_data))
+        self._post("active_document_changed", event_data)
 
     def _on_selection_changed(self):
         """Handle selection changed event."""
@@ -137,16 +186,43 @@ class DocumentEventProvider(EventProvider):
             "selection": selected_objects,
             "timestamp": time.time(),
         }
-        asyncio.create_task(self.emit_event("selection_changed", event_data))
+        self._post("selection_changed", event_data)
+
+    def _post(self, event_type: str, event_data: Dict[str, Any]) -> None:
+        """
+        Schedule an event on the event loop from a FreeCAD callback.
+
+        FreeCAD may call back from a thread without a running loop, such as
+        the GUI thread or a recompute run in an executor; the event is then
+        handed to the loop the provider was set up on, so subscribers like
+        the document snapshot still see it.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._loop = loop
+            loop.create_task(self.emit_event(event_type, event_data))
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(
+                self._loop.create_task, self.emit_event(event_type, event_data)
+            )
+        else:
+            logger.warning(f"No event loop to emit {event_type} event on, dropped")
 
     async def emit_event(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """
-        Emit an event to all listeners.
+        Emit an event to in-process subscribers and, unless it is one of
+        INTERNAL_EVENTS, to the event router.
 
         Args:
             event_type: The type of event
             event_data: The event data
         """
+        await self.notify_subscribers(event_data)
+        if event_type in INTERNAL_EVENTS:
+            return
         if self.event_router is not None:
             await self.event_router.broadcast_event(event_type, event_data)
         else:
@@ -1,9 +1,92 @@
 import logging
 import platform
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+VECTOR_PROPERTY_TYPES = {
+    "App::PropertyVector",
+    "App::PropertyVectorDistance",
+    "App::PropertyPosition",
+    "App::PropertyDirection",
+}
+
+QUANTITY_PROPERTY_TYPES = {
+    "App::PropertyQuantity",
+    "App::PropertyQuantityConstraint",
+    "App::PropertyLength",
+    "App::PropertyDistance",
+    "App::PropertyAngle",
+    "App::PropertyArea",
+    "App::PropertyVolume",
+    "App::PropertyAcceleration",
+    "App::PropertyForce",
+    "App::PropertyPressure",
+    "App::PropertySpeed",
+}
+
+
+def _serialize_value(value):
+    """Fallback serializer for properties without a typed serializer"""
+    # Convert complex types to serializable format
+    if hasattr(value, "__dict__"):
+        return str(value)
+    return value
+
+
+def _serialize_vector(value):
+    return {"x": value.x, "y": value.y, "z": value.z}
+
+
+def _serialize_placement(value):
+    return {"base": _serialize_vector(value.Base), "rotation": list(value.Rotation.Q)}
+
+
+def _serialize_quantity(value):
+    # Some properties hold plain floats depending on the FreeCAD version
+    return getattr(value, "Value", value)
+
+
+def _serialize_link(value):
+    return value.Name if value is not None else None
+
+
+def _serialize_link_list(value):
+    return [obj.Name for obj in value]
+
+
+def _serialize_link_sub(value):
+    if not value:
+        return None
+    obj, subelements = value
+    if isinstance(subelements, str):
+        subelements = [subelements]
+    return {"object": obj.Name, "subelements": list(subelements)}
+
+
+def _serialize_link_sub_list(value):
+    return [_serialize_link_sub(item) for item in value]
+
+
+def _property_serializer(prop_type: str) -> Callable[[Any], Any]:
+    """Choose the serializer for a property type"""
+    if prop_type in VECTOR_PROPERTY_TYPES:
+        return _serialize_vector
+    if prop_type == "App::PropertyPlacement":
+        return _serialize_placement
+    if prop_type in QUANTITY_PROPERTY_TYPES:
+        return _serialize_quantity
+    # Most specific link kinds first, e.g. PropertyLinkSubList before PropertyLink
+    if prop_type.startswith("App::PropertyLinkSubList"):
+        return _serialize_link_sub_list
+    if prop_type.startswith("App::PropertyLinkSub"):
+        return _serialize_link_sub
+    if prop_type.startswith("App::PropertyLinkList"):
+        return _serialize_link_list
+    if prop_type.startswith("App::PropertyLink"):
+        return _serialize_link
+    return _serialize_value
+
 
 class CADContextExtractor:
     """Extracts context information from FreeCAD."""
@@ -16,6 +99,12 @@ class CADContextExtractor:
             freecad_app: Optional FreeCAD application instance. If None, will try to import FreeCAD.
         """
         self.app = freecad_app
+        # Property (name, type, serializer) lists keyed by TypeId and the
+        # object's property names, so objects with dynamic properties get
+        # their own entry
+        self._property_schemas: Dict[
+            Tuple[str, Tuple[str, ...]], List[Tuple[str, str, Callable[[Any], Any]]]
+        ] = {}
         if self.app is None:
             try:
                 import FreeCAD
@@ -90,74 +179,97 @@ class CADContextExtractor:
             "object_hierarchy": self._extract_object_hierarchy(doc),
         }
 
-    def _extract_objects_context(self, doc) -> List[Dict[str, Any]]:
+    def _extract_objects_context(
+        self, doc, properties: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Extract information about all objects in a document"""
-        objects = []
-        for obj in doc.Objects:
-            objects.append(
-                {
-                    "id": obj.Name,
-                    "label": obj.Label,
-                    "type": obj.TypeId,
-                    "visibility": obj.Visibility,
-                    "properties": self._extract_object_properties(obj),
-                }
-            )
-        return objects
+        if properties is not None:
+            properties = set(properties)
+        return [self._extract_object_context(obj, properties) for obj in doc.Objects]
 
-    def _extract_object_properties(self, obj) -> Dict[str, Any]:
-        """Extract properties of an object"""
-        properties = {}
-        for prop in obj.PropertiesList:
-            try:
-                prop_type = obj.getTypeIdOfProperty(prop)
-                prop_value = getattr(obj, prop)
+    def _extract_object_context(
+        self, obj, properties: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Extract information about a single object"""
+        return {
+            "id": obj.Name,
+            "label": obj.Label,
+            "type": obj.TypeId,
+            "visibility": obj.Visibility,
+            "properties": self._extract_object_properties(obj, properties),
+        }
 
-                # Convert complex types to serializable format
-                if hasattr(prop_value, "__dict__"):
-                    prop_value = str(prop_value)
+    def _get_property_schema(self, obj) -> List[Tuple[str, str, Callable[[Any], Any]]]:
+        """Get the cached (name, type, serializer) list for an object's properties"""
+        key = (obj.TypeId, tuple(obj.PropertiesList))
+        schema = self._property_schemas.get(key)
+        if schema is None:
+            schema = []
+            for prop in key[1]:
+                try:
+                    prop_type = obj.getTypeIdOfProperty(prop)
+                except Exception as e:
+                    logger.debug(f"Could not get type of {prop} on {obj.Name}: {e}")
+                    continue
+                schema.append((prop, prop_type, _property_serializer(prop_type)))
+            self._property_schemas[key] = schema
+        return schema
+
+    def _extract_object_properties(
+        self, obj, properties: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract properties of an object
+
+        Args:
+            obj: The FreeCAD object
+            properties: Names of the properties to read, or None for all.
+                Other properties are never read from the object.
+
+        Returns:
+            Property type and serialized value by property name
+        """
+        if properties is not None and not isinstance(properties, (set, frozenset)):
+            properties = set(properties)
 
-                properties[prop] = {"type": prop_type, "value": prop_value}
+        result = {}
+        for prop, prop_type, serialize in self._get_property_schema(obj):
+            if properties is not None and prop not in properties:
+                continue
+            try:
+                value = serialize(getattr(obj, prop))
+                result[prop] = {"type": prop_type, "value": value}
             except Exception as e:
                 # Skip properties that can't be serialized
                 logger.debug(f"Could not extract property {prop} from {obj.Name}: {e}")
 
-        return properties
+        return result
 
     def _extract_object_hierarchy(self, doc) -> Dict[str, Any]:
         """Extract the hierarchical structure of objects in a document"""
-        hierarchy = {}
-
-        # Create a dictionary of all objects
         all_objects = {
             obj.Name: {"label": obj.Label, "type": obj.TypeId, "children": []}
             for obj in doc.Objects
         }
 
-        # Identify parent-child relationships
+        # Identify parent-child relationships in one pass, recording each
+        # object's parent so roots can be found without searching children
+        parents: Dict[str, str] = {}
         for obj in doc.Objects:
             # Check for Group property (used by many container objects)
-            if hasattr(obj, "Group") and obj.Group:
-                for child in obj.Group:
-                    if child.Name in all_objects:
-                        all_objects[obj.Name]["children"].append(child.Name)
-
-        # Build the root level (objects with no parents)
-        root_objects = []
-        for obj_name, obj_data in all_objects.items():
-            is_child = False
-            for other_obj in all_objects.values():
-                if obj_name in other_obj["children"]:
-                    is_child = True
-                    break
+            group = getattr(obj, "Group", None)
+            if not group:
+                continue
+            children = all_objects[obj.Name]["children"]
+            for child in group:
+                if child.Name in all_objects:
+                    children.append(child.Name)
+                    parents.setdefault(child.Name, obj.Name)
 
-            if not is_child:
-                root_objects.append(obj_name)
+        # The root level is every object without a parent
+        root_objects = [name for name in all_objects if name not in parents]
 
-        # Build the final hierarchy
-        hierarchy = {"root": root_objects, "objects": all_objects}
-
-        return hierarchy
+        return {"root": root_objects, "objects": all_objects}
 
     def _extract_selection_context(self) -> List[Dict[str, Any]]:
         """Extract information about the current selection"""
@@ -179,3 +291,46 @@ class CADContextExtractor:
                 }
             )
         return selection
+
+
+def extract_subtree(
+    hierarchy: Dict[str, Any], root: Optional[str] = None, depth: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Cut a subtree out of an object hierarchy.
+
+    Objects deeper than ``depth`` are left out, but the objects at the
+    boundary keep their ``children`` names so clients can fetch them later.
+
+    Args:
+        hierarchy: Hierarchy as returned by ``_extract_object_hierarchy``
+        root: Name of the subtree root, or None for the document roots
+        depth: Number of levels below the root to include, or None for all
+
+    Returns:
+        A hierarchy of the same shape containing only the subtree
+    """
+    all_objects = hierarchy.get("objects", {})
+    if root is None:
+        roots = list(hierarchy.get("root", []))
+    elif root in all_objects:
+        roots = [root]
+    else:
+        return {"error": f"Object not found: {root}"}
+
+    objects = {}
+    level = roots
+    current_depth = 0
+    while level:
+        next_level = []
+        for name in level:
+            if name in objects:
+                continue
+            objects[name] = all_objects[name]
+            next_level.extend(all_objects[name]["children"])
+        if depth is not None and current_depth >= depth:
+            break
+        level = next_level
+        current_depth += 1
+
+    return {"root": roots, "objects": objects}
@@ -0,0 +1,208 @@
+import bisect
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Net status of an object after two successive changes, keyed by
+# (status so far, next change). None means the object did not exist before
+# the requested revision and does not exist now.
+_TRANSITIONS = {
+    (None, "created"): "created",
+    (None, "changed"): "modified",
+    (None, "deleted"): "deleted",
+    ("created", "changed"): "created",
+    ("created", "deleted"): "transient",
+    ("modified", "changed"): "modified",
+    ("modified", "deleted"): "deleted",
+    ("modified", "created"): "modified",
+    ("deleted", "created"): "modified",
+    ("deleted", "changed"): "modified",
+    ("transient", "created"): "created",
+    ("transient", "changed"): "created",
+}
+
+
+class DocumentJournal:
+    """Change entries of one document, ordered by revision."""
+
+    def __init__(self, base_revision: int = 0):
+        # Changes at or before this revision are no longer available
+        self.base_revision = base_revision
+        self.revision = base_revision
+        self.revisions: List[int] = []
+        self.entries: List[Tuple[str, str]] = []
+
+    def append(self, revision: int, name: str, kind: str) -> None:
+        self.revisions.append(revision)
+        self.entries.append((name, kind))
+        self.revision = revision
+
+    def compact(self, max_entries: int) -> None:
+        """Drop the oldest entries, keeping whole revisions, down to half size."""
+        if len(self.entries) <= max_entries:
+            return
+        cutoff = self.revisions[len(self.entries) - max_entries // 2 - 1]
+        keep = bisect.bisect_right(self.revisions, cutoff)
+        del self.revisions[:keep]
+        del self.entries[:keep]
+        self.base_revision = cutoff
+
+
+class ChangeJournal:
+    """
+    Per-document journal of object changes with revision numbers.
+
+    Fed by document and command events, the journal answers "what changed
+    since revision N" with the net set of created, modified and deleted
+    objects, so clients can re-read only those instead of the whole
+    document. Revisions come from one counter shared by all documents, so
+    they never repeat even when a document is closed and reopened. The
+    counter restarts with every journal, so version tags also carry the
+    journal's random ``epoch``.
+
+    Each document keeps at most ``max_entries`` entries. When it grows past
+    that, the oldest half is dropped and requests for changes before the
+    remaining entries are told to re-read the document instead.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the change journal.
+
+        Args:
+            max_entries: Maximum number of entries kept per document
+        """
+        self.max_entries = max(2, max_entries)
+        self.revision = 0
+        # Tells revisions of this journal apart from those of earlier runs
+        self.epoch = uuid.uuid4().hex
+        self.documents: Dict[str, DocumentJournal] = {}
+        self.live = False
+
+    def attach(self, *event_providers) -> None:
+        """
+        Record changes from event providers.
+
+        Args:
+            event_providers: Document and command event providers
+        """
+        for provider in event_providers:
+            provider.add_subscriber(self.handle_event)
+        self.live = True
+
+    def _journal(self, name: str) -> DocumentJournal:
+        journal = self.documents.get(name)
+        if journal is None:
+            journal = DocumentJournal()
+            self.documents[name] = journal
+        return journal
+
+    def document_revision(self, name: str) -> int:
+        """Get the revision of the last recorded change to a document."""
+        journal = self.documents.get(name)
+        return journal.revision if journal is not None else 0
+
+    def version_tag(self, name: str) -> str:
+        """Get a version tag for a document, unique across journals."""
+        return f"{name}:{self.epoch}:{self.document_revision(name)}"
+
+    def record(self, name: str, changes: List[Tuple[str, str]]) -> int:
+        """
+        Record changes to a document as one new revision.
+
+        Args:
+            name: Document name
+            changes: (object or command name, kind) pairs where kind is
+                "created", "changed", "deleted" or "command"
+
+        Returns:
+            The new revision
+        """
+        self.revision += 1
+        journal = self._journal(name)
+        for object_name, kind in changes:
+            journal.append(self.revision, object_name, kind)
+        journal.revision = self.revision
+        journal.compact(self.max_entries)
+        return self.revision
+
+    def reset(self, name: str) -> int:
+        """Forget the history of a document; older revisions require a re-read."""
+        self.revision += 1
+        self.documents[name] = DocumentJournal(self.revision)
+        return self.revision
+
+    def changes(self, name: str, since: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the net changes to a document after a revision.
+
+        Args:
+            name: Document name
+            since: Revision the client is up to date with
+
+        Returns:
+            Lists of created, modified and deleted object names and executed
+            commands, or None if the journal no longer reaches back to
+            ``since`` and the client must re-read the document
+        """
+        journal = self._journal(name)
+        if since < journal.base_revision:
+            return None
+
+        status: Dict[str, Optional[str]] = {}
+        commands = []
+        start = bisect.bisect_right(journal.revisions, since)
+        for object_name, kind in journal.entries[start:]:
+            if kind == "command":
+                commands.append(object_name)
+                continue
+            previous = status.get(object_name)
+            status[object_name] = _TRANSITIONS.get((previous, kind), previous)
+
+        result: Dict[str, Any] = {
+            "created": [],
+            "modified": [],
+            "deleted": [],
+            "commands": commands,
+        }
+        for object_name, state in status.items():
+            if state in ("created", "modified", "deleted"):
+                result[state].append(object_name)
+        return result
+
+    async def handle_event(self, event_data: Dict[str, Any]) -> None:
+        """
+        Record a document or command event.
+
+        Args:
+            event_data: The event data, including its ``type``
+        """
+        event_type = event_data.get("type")
+        doc_name = event_data.get("document")
+        if doc_name is None:
+            return
+
+        if event_type in ("document_created", "document_closed"):
+            self.reset(doc_name)
+        elif event_type == "document_changed":
+            recomputed = event_data.get("recomputed_objects")
+            if recomputed is None:
+                self.reset(doc_name)
+            elif recomputed:
+                self.record(doc_name, [(name, "changed") for name in recomputed])
+        elif event_type in ("object_created", "object_changed", "object_deleted"):
+            kind = event_type[len("object_") :]
+            self.record(doc_name, [(event_data["object"], kind)])
+        elif event_type == "command_executed":
+            self.record(doc_name, [(event_data["command"], "command")])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics."""
+        return {
+            "live": self.live,
+            "revision": self.revision,
+            "documents": len(self.documents),
+            "entries": sum(len(j.entries) for j in self.documents.values()),
+        }
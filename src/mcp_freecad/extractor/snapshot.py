@@ -0,0 +1,298 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .cad_context import CADContextExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentState:
+    """Snapshot of one document: header fields and per-object records."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.label = name
+        self.file: Optional[str] = None
+        # Object names in document order
+        self.order: List[str] = []
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        # Objects whose records must be re-extracted before the next read
+        self.dirty: Set[str] = set()
+        # Set when objects may have been added or removed
+        self.structure_dirty = True
+        self.hierarchy: Optional[Dict[str, Any]] = None
+
+
+class DocumentSnapshot:
+    """
+    Incrementally maintained in-memory snapshot of FreeCAD documents.
+
+    A document is extracted in full the first time it is read. After that,
+    document and object events only mark the affected objects dirty, and
+    the next read re-extracts just those objects. Reads therefore cost time
+    proportional to the response plus the number of changed objects.
+
+    The snapshot is only trusted while it is ``live``, i.e. attached to an
+    event source with :meth:`attach`. Without one, every read re-extracts
+    the requested document so results are never stale.
+    """
+
+    def __init__(self, extractor: CADContextExtractor):
+        """
+        Initialize the snapshot.
+
+        Args:
+            extractor: Extractor used to read documents and objects
+        """
+        self.extractor = extractor
+        self.documents: Dict[str, DocumentState] = {}
+        self.live = False
+        self.stats = {"full_extractions": 0, "object_extractions": 0, "events": 0}
+
+    @property
+    def app(self):
+        return self.extractor.app
+
+    def _get_freecad_document(self, name: str):
+        if self.app is None:
+            return None
+        try:
+            return self.app.getDocument(name)
+        except Exception:
+            return None
+
+    def active_document_name(self) -> Optional[str]:
+        """Return the name of the active document, if any."""
+        if self.app is None or self.app.ActiveDocument is None:
+            return None
+        return self.app.ActiveDocument.Name
+
+    def get_document(self, name: str) -> Optional[DocumentState]:
+        """
+        Get an up-to-date snapshot of a document.
+
+        Args:
+            name: Document name
+
+        Returns:
+            The document state, or None if the document does not exist
+        """
+        doc = self._get_freecad_document(name)
+        if doc is None:
+            self.documents.pop(name, None)
+            return None
+
+        state = self.documents.get(name)
+        if state is None or not self.live:
+            state = DocumentState(name)
+            self.documents[name] = state
+            self.stats["full_extractions"] += 1
+
+        self._refresh(state, doc)
+        return state
+
+    def _refresh(self, state: DocumentState, doc) -> None:
+        """Bring a document state up to date with pending changes."""
+        if state.structure_dirty:
+            state.label = doc.Label
+            state.file = doc.FileName if hasattr(doc, "FileName") else None
+            names = [obj.Name for obj in doc.Objects]
+            current = set(names)
+            for removed in set(state.objects) - current:
+                del state.objects[removed]
+            state.dirty.update(current - set(state.objects))
+            state.dirty &= current
+            state.order = names
+            state.structure_dirty = False
+            state.hierarchy = None
+
+        if state.dirty:
+            for name in state.dirty:
+                obj = doc.getObject(name)
+                if obj is None:
+                    state.objects.pop(name, None)
+                    continue
+                state.objects[name] = self.extractor._extract_object_context(obj)
+            self.stats["object_extractions"] += len(state.dirty)
+            state.dirty.clear()
+            # Any object may have changed its Group
+            state.hierarchy = None
+
+    def objects(
+        self, name: str, properties: Optional[Iterable[str]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get object records of a document in document order.
+
+        Args:
+            name: Document name
+            properties: Property names to include, or None for all
+
+        Returns:
+            The object records, or None if the document does not exist
+        """
+        if properties is not None and not self.live:
+            # Nothing is reused between reads, so only read what is asked for
+            doc = self._get_freecad_document(name)
+            if doc is None:
+                return None
+            return self.extractor._extract_objects_context(doc, properties)
+
+        state = self.get_document(name)
+        if state is None:
+            return None
+        records = [state.objects[obj_name] for obj_name in state.order]
+        return self._project(records, properties)
+
+    @staticmethod
+    def _project(
+        records: List[Dict[str, Any]], properties: Optional[Iterable[str]]
+    ) -> List[Dict[str, Any]]:
+        """Limit the properties of object records without modifying them."""
+        if properties is None:
+            return records
+
+        properties = set(properties)
+        return [
+            {
+                **record,
+                "properties": {
+                    prop: value
+                    for prop, value in record["properties"].items()
+                    if prop in properties
+                },
+            }
+            for record in records
+        ]
+
+    def object_records(
+        self,
+        name: str,
+        object_names: Iterable[str],
+        properties: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the records of some objects of a document.
+
+        Without an event source only the named objects are extracted.
+
+        Args:
+            name: Document name
+            object_names: Names of the objects; missing objects are skipped
+            properties: Property names to include, or None for all
+
+        Returns:
+            The object records in the order of ``object_names``
+        """
+        if self.live:
+            state = self.get_document(name)
+            if state is None:
+                return []
+            records = [
+                state.objects[obj] for obj in object_names if obj in state.objects
+            ]
+            return self._project(records, properties)
+
+        doc = self._get_freecad_document(name)
+        if doc is None:
+            return []
+        if properties is not None:
+            properties = set(properties)
+        records = []
+        for obj_name in object_names:
+            obj = doc.getObject(obj_name)
+            if obj is not None:
+                records.append(self.extractor._extract_object_context(obj, properties))
+        return records
+
+    def hierarchy(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the object hierarchy of a document."""
+        state = self.get_document(name)
+        if state is None:
+            return None
+        if state.hierarchy is None:
+            doc = self._get_freecad_document(name)
+            state.hierarchy = self.extractor._extract_object_hierarchy(doc)
+        return state.hierarchy
+
+    def document_context(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a document in the same shape as the extractor's active document."""
+        state = self.get_document(name)
+        if state is None:
+            return None
+        return {
+            "name": state.name,
+            "label": state.label,
+            "file": state.file,
+            "objects": self.objects(name),
+            "object_hierarchy": self.hierarchy(name),
+        }
+
+    def attach(self, event_provider) -> None:
+        """
+        Keep the snapshot up to date from an event provider's events.
+
+        Args:
+            event_provider: An EventProvider emitting document events
+        """
+        event_provider.add_subscriber(self.handle_event)
+        # Anything extracted before now may have missed changes
+        self.documents.clear()
+        self.live = True
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached state so it is re-extracted on the next read.
+
+        Args:
+            name: Document to drop, or None for all documents
+        """
+        if name is None:
+            self.documents.clear()
+        else:
+            self.documents.pop(name, None)
+
+    async def handle_event(self, event_data: Dict[str, Any]) -> None:
+        """
+        Apply a document event to the snapshot.
+
+        Understands the events emitted by DocumentEventProvider:
+        ``document_changed``, ``document_closed`` and the object-level
+        ``object_created``, ``object_changed`` and ``object_deleted``.
+
+        Args:
+            event_data: The event data, including its ``type``
+        """
+        self.stats["events"] += 1
+        event_type = event_data.get("type")
+        doc_name = event_data.get("document")
+        state = self.documents.get(doc_name)
+
+        if event_type == "document_closed":
+            self.documents.pop(doc_name, None)
+        elif state is None:
+            # Not loaded yet; it will be extracted in full on first read
+            return
+        elif event_type == "document_changed":
+            recomputed = event_data.get("recomputed_objects")
+            if recomputed is None:
+                self.documents.pop(doc_name, None)
+            else:
+                state.dirty.update(recomputed)
+                state.structure_dirty = True
+        elif event_type in ("object_created", "object_deleted"):
+            state.structure_dirty = True
+        elif event_type == "object_changed":
+            obj_name = event_data.get("object")
+            state.dirty.add(obj_name)
+            if obj_name not in state.objects:
+                state.structure_dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics."""
+        return {
+            **self.stats,
+            "live": self.live,
+            "documents": len(self.documents),
+            "objects": sum(len(state.objects) for state in self.documents.values()),
+        }
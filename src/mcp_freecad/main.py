@@ -14,7 +14,7 @@ import sys
 from pathlib import Path
 from typing import Any, Dict
 
-from . import TOOL_PROVIDERS, __version__
+from . import RESOURCE_PROVIDERS, TOOL_PROVIDERS, __version__
 from .core.server import MCPServer
 
 logger = logging.getLogger(__name__)
@@ -57,6 +57,13 @@ def get_default_config() -> Dict[str, Any]:
             "enable_measurement": True,
             "enable_code_generator": True,
         },
+        "resources": {
+            "enable_cad_model": True,
+            "enable_constraints": True,
+            "enable_materials": True,
+            "enable_measurements": True,
+        },
+        "events": {"enable_document_events": True},
         "logging": {"level": "INFO", "file": "logs/mcp_freecad.log"},
     }
 
@@ -83,6 +90,23 @@ async def setup_server(config: Dict[str, Any]) -> MCPServer:
     # if tools_config.get("enable_export_import", True):
     #     server.register_tool("export_import", TOOL_PROVIDERS["export_import"]())
 
+    # Register resource providers based on configuration
+    resources_config = config.get("resources", {})
+    for resource_id, get_provider in RESOURCE_PROVIDERS.items():
+        if resources_config.get(f"enable_{resource_id}", True):
+            server.register_resource(resource_id, get_provider()())
+            logger.info(f"Registered {resource_id} resource provider")
+
+    # With FreeCAD in this process, document events keep the providers'
+    # snapshots, indexes and caches up to date instead of re-reading
+    if config.get("events", {}).get("enable_document_events", True):
+        from .events.document_events import DocumentEventProvider
+
+        document_events = DocumentEventProvider()
+        if document_events.app is not None:
+            server.register_event_handler("document", document_events)
+            logger.info("Registered document event provider")
+
     # Initialize server
     await server.initialize()
 
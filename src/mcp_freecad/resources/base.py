@@ -1,10 +1,31 @@
+import json
+import os
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 
 
+def document_modified(doc) -> bool:
+    """
+    Check whether a document may have changes not saved to its file.
+
+    Only the GUI tracks unsaved changes, so without it every document
+    counts as modified.
+    """
+    try:
+        import FreeCADGui
+
+        gui_doc = FreeCADGui.getDocument(doc.Name)
+    except Exception:
+        return True
+    return gui_doc is None or bool(gui_doc.Modified)
+
+
 class ResourceProvider(ABC):
     """Base class for all resource providers in the MCP server."""
 
+    # Shared resource cache, attached by the server
+    cache = None
+
     @abstractmethod
     async def get_resource(
         self, uri: str, params: Optional[Dict[str, Any]] = None
@@ -20,3 +41,62 @@ class ResourceProvider(ABC):
             The resource data
         """
         pass
+
+    def get_version(
+        self, uri: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a cheap version tag for a resource without building it.
+
+        Providers that know when a resource changes (e.g. from a document
+        revision or file modification time) return a tag that changes
+        whenever the resource does, so conditional requests can be answered
+        without reading the resource. The default returns None, in which
+        case the response content is hashed instead.
+
+        Args:
+            uri: The resource URI
+            params: Optional parameters for the resource
+
+        Returns:
+            The version tag, or None if unknown
+        """
+        return None
+
+    def set_cache(self, cache) -> None:
+        """
+        Attach the server's resource cache.
+
+        Args:
+            cache: A ResourceCache, possibly backed by a disk cache
+        """
+        self.cache = cache
+
+    def document_cache_key(
+        self, uri: str, doc, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a key for persisting a resource of a saved, unmodified document.
+
+        The key combines the content hash of the document file with the URI
+        and parameters, so it stays valid across restarts until the file
+        changes.
+
+        Args:
+            uri: The resource URI
+            doc: The document the resource is read from
+            params: Optional parameters for the resource
+
+        Returns:
+            The key, or None if there is no disk cache or the document has
+            unsaved changes
+        """
+        l2 = getattr(self.cache, "l2", None)
+        file_path = getattr(doc, "FileName", "")
+        if l2 is None or not file_path or not os.path.isfile(file_path):
+            return None
+        if document_modified(doc):
+            return None
+        if params:
+            uri = f"{uri}?{json.dumps(params, sort_keys=True, default=str)}"
+        return l2.document_key(uri, file_path)
@@ -1,24 +1,45 @@
+import base64
+import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
-from ..extractor.cad_context import CADContextExtractor
+from ..extractor.cad_context import CADContextExtractor, extract_subtree
+from ..extractor.journal import ChangeJournal
+from ..extractor.snapshot import DocumentSnapshot
 from ..resources.base import ResourceProvider
 
 logger = logging.getLogger(__name__)
 
 
+def encode_cursor(object_name: str) -> str:
+    """Encode an opaque pagination cursor pointing after an object."""
+    payload = json.dumps({"after": object_name}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a pagination cursor into the name of the object it points after."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+    except Exception:
+        raise ValueError(f"Invalid or expired cursor: {cursor}")
+
+
 class CADModelResourceProvider(ResourceProvider):
     """Resource provider for CAD model data."""
 
-    def __init__(self, freecad_app=None):
+    def __init__(self, freecad_app=None, max_journal_entries: int = 10000):
         """
         Initialize the CAD model resource provider.
 
         Args:
             freecad_app: Optional FreeCAD application instance. If None, will try to import FreeCAD.
+            max_journal_entries: Change journal entries kept per document
         """
         self.extractor = CADContextExtractor(freecad_app)
+        self.snapshot = DocumentSnapshot(self.extractor)
+        self.journal = ChangeJournal(max_journal_entries)
 
     async def get_resource(
         self, uri: str, params: Optional[Dict[str, Any]] = None
@@ -27,7 +48,11 @@ class CADModelResourceProvider(ResourceProvider):
         Retrieve a CAD model resource.
 
         Args:
-            uri: The resource URI in format "cad://model/[document_name]/[resource_type]"
+            uri: The resource URI in format
+                "cad://model/[document_name]/[resource_type][?query]"; the
+                tree resource accepts "root" and "depth" to return a subtree and
+                the objects resource accepts "properties", "fields", "type",
+                "limit" and "cursor"; the changes resource accepts "since"
             params: Optional parameters for the resource
 
         Returns:
@@ -35,17 +60,7 @@ class CADModelResourceProvider(ResourceProvider):
         """
         logger.info(f"Retrieving CAD model resource: {uri}")
 
-        # Parse the URI to determine what information is being requested
-        # Format: "cad://model/[document_name]/[resource_type]"
-        parsed_uri = urlparse(uri)
-
-        if parsed_uri.scheme != "cad":
-            raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
-
-        path_parts = parsed_uri.path.strip("/").split("/")
-
-        if len(path_parts) < 2 or path_parts[0] != "model":
-            raise ValueError(f"Invalid URI format: {uri}, expected 'cad://model/...'")
+        path_parts, params = self._parse_uri(uri, params)
 
         # Handle special case: if document_name is 'current', use active document
         if path_parts[1] == "current":
@@ -59,34 +74,100 @@ class CADModelResourceProvider(ResourceProvider):
                 document_name, path_parts[2:] if len(path_parts) > 2 else [], params
             )
 
+    def get_version(
+        self, uri: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a version tag for object, tree and changes resources.
+
+        The tag is the document's change journal revision, with the
+        journal's epoch so tags from an earlier run never match, and is only
+        available while events are attached. Other resources, such as the
+        selection or document headers, change without journal entries.
+
+        Args:
+            uri: The resource URI
+            params: Optional parameters for the resource
+
+        Returns:
+            The version tag, or None if the resource has none
+        """
+        if not self.journal.live:
+            return None
+
+        path_parts, _ = self._parse_uri(uri, params)
+        if len(path_parts) < 3 or path_parts[2] not in ("objects", "tree", "changes"):
+            return None
+
+        document_name = path_parts[1]
+        if document_name == "current":
+            document_name = self.snapshot.active_document_name()
+            if document_name is None:
+                return None
+        return self.journal.version_tag(document_name)
+
+    @staticmethod
+    def _parse_uri(
+        uri: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """Split a cad://model URI into path parts and merged parameters."""
+        # Parse the URI to determine what information is being requested
+        # Format: "cad://model/[document_name]/[resource_type]"
+        parsed_uri = urlparse(uri)
+
+        if parsed_uri.scheme != "cad":
+            raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
+
+        # Query parameters in the URI, e.g. "?root=Body&depth=1", are merged
+        # with explicit params, which take precedence
+        query = {key: values[0] for key, values in parse_qs(parsed_uri.query).items()}
+        params = {**query, **(params or {})}
+
+        # "cad://model/..." puts "model" in the netloc
+        path_parts = f"{parsed_uri.netloc}{parsed_uri.path}".strip("/").split("/")
+
+        if len(path_parts) < 2 or path_parts[0] != "model":
+            raise ValueError(f"Invalid URI format: {uri}, expected 'cad://model/...'")
+
+        return path_parts, params
+
+    def attach_events(self, event_provider, command_provider=None) -> None:
+        """
+        Keep the document snapshot and change journal up to date from events.
+
+        Until this is called, every read re-extracts the requested document
+        and the changes resource is unavailable.
+
+        Args:
+            event_provider: A DocumentEventProvider for the same FreeCAD instance
+            command_provider: Optional CommandExecutionEventProvider whose
+                commands are listed in the changes resource
+        """
+        self.snapshot.attach(event_provider)
+        providers = [event_provider]
+        if command_provider is not None:
+            providers.append(command_provider)
+        self.journal.attach(*providers)
+
     async def _handle_current_document_resource(
         self, resource_path: list, params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Handle resource requests for the current document."""
+        document_name = self.snapshot.active_document_name()
+        if document_name is not None:
+            return self._document_resource(document_name, resource_path, params)
+
         if not resource_path:
-            # Return information about the active document
-            context = self.extractor.extract_full_context()
-            return context.get("active_document", {"error": "No active document"})
+            return {"error": "No active document"}
 
         resource_type = resource_path[0]
 
         if resource_type == "objects":
-            # Return list of objects in the active document
-            context = self.extractor.extract_full_context()
-            active_doc = context.get("active_document", {})
-            return {"objects": active_doc.get("objects", [])}
-
+            return {"objects": []}
         elif resource_type == "tree":
-            # Return object hierarchy of the active document
-            context = self.extractor.extract_full_context()
-            active_doc = context.get("active_document", {})
-            return {"hierarchy": active_doc.get("object_hierarchy", {})}
-
+            return {"hierarchy": {}}
         elif resource_type == "selection":
-            # Return currently selected objects
-            context = self.extractor.extract_full_context()
-            return {"selection": context.get("selection", [])}
-
+            return {"selection": self.extractor._extract_selection_context()}
         else:
             raise ValueError(f"Unknown resource type: {resource_type}")
 
@@ -97,19 +178,184 @@ class CADModelResourceProvider(ResourceProvider):
         params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Handle resource requests for a specific document."""
-        # This is simplified for now, would need to handle specific document lookup
-        context = self.extractor.extract_full_context()
+        doc = self.snapshot._get_freecad_document(document_name)
+        if doc is None:
+            return {"error": f"Document not found: {document_name}"}
+
+        # The header and selection are read from FreeCAD directly, so they
+        # never need the document's objects extracted
+        if not resource_path:
+            return {
+                "document": {
+                    "name": doc.Name,
+                    "label": doc.Label,
+                    "file": getattr(doc, "FileName", None),
+                    "objects_count": len(doc.Objects),
+                    "modified": doc.Modified,
+                }
+            }
+        if resource_path[0] == "selection":
+            return {"selection": self.extractor._extract_selection_context()}
 
-        # Find the specified document in the list of documents
-        doc_info = None
-        for doc in context.get("documents", []):
-            if doc.get("name") == document_name:
-                doc_info = doc
-                break
+        return self._document_resource(document_name, resource_path, params)
 
-        if not doc_info:
-            return {"error": f"Document not found: {document_name}"}
+    def _document_resource(
+        self,
+        document_name: str,
+        resource_path: list,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Serve a document sub-resource from the snapshot."""
+        if not resource_path:
+            return self.snapshot.document_context(document_name) or {
+                "error": f"Document not found: {document_name}"
+            }
+
+        resource_type = resource_path[0]
+
+        if resource_type == "objects":
+            properties = self._list_param(params, "properties")
+            objects = self.snapshot.objects(document_name, properties) or []
+            return self._select_objects(objects, params or {})
+
+        elif resource_type == "tree":
+            hierarchy = self.snapshot.hierarchy(document_name) or {}
+            if params and ("root" in params or "depth" in params):
+                hierarchy = extract_subtree(
+                    hierarchy, params.get("root"), self._int_param(params, "depth", 0)
+                )
+            return {"hierarchy": hierarchy}
+
+        elif resource_type == "selection":
+            # Selection is read directly; its cost is proportional to its size
+            return {"selection": self.extractor._extract_selection_context()}
+
+        elif resource_type == "changes":
+            return self._document_changes(document_name, params or {})
+
+        else:
+            raise ValueError(f"Unknown resource type: {resource_type}")
+
+    def _document_changes(
+        self, document_name: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Get the objects created, modified and deleted since a revision.
+
+        Args:
+            document_name: Document name
+            params: Request parameters with ``since`` and optional ``properties``
+
+        Returns:
+            The changes, or ``resync: true`` if the journal no longer reaches
+            back to ``since`` and the document must be read again
+        """
+        if not self.journal.live:
+            return {"error": "Change journal is not attached to document events"}
+
+        since = self._int_param(params, "since", 0) or 0
+        revision = self.journal.revision
+        if since > revision:
+            raise ValueError(f"Invalid since: {since} is after revision {revision}")
+
+        result: Dict[str, Any] = {
+            "document": document_name,
+            "revision": revision,
+            "since": since,
+        }
+        changes = self.journal.changes(document_name, since)
+        if changes is None:
+            result["resync"] = True
+            return result
+
+        properties = self._list_param(params, "properties")
+        result.update(
+            {
+                "resync": False,
+                "created": self.snapshot.object_records(
+                    document_name, changes["created"], properties
+                ),
+                "modified": self.snapshot.object_records(
+                    document_name, changes["modified"], properties
+                ),
+                "deleted": changes["deleted"],
+                "commands": changes["commands"],
+            }
+        )
+        return result
+
+    def _select_objects(
+        self, objects: List[Dict[str, Any]], params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Apply the type filter, cursor, limit and field projection to objects.
+
+        Cursors name the last object of the previous page rather than an
+        offset, so they stay valid while the document is unchanged and keep
+        working when objects are added elsewhere in the document.
+
+        Args:
+            objects: Object records in document order
+            params: Request parameters
+
+        Returns:
+            The objects resource, with ``next_cursor`` when paginated
+        """
+        types = self._list_param(params, "type")
+        if types:
+            types = set(types)
+            objects = [obj for obj in objects if obj["type"] in types]
+
+        limit = self._int_param(params, "limit", 1)
+        cursor = params.get("cursor")
+        if cursor:
+            after = decode_cursor(cursor)
+            for index, obj in enumerate(objects):
+                if obj["id"] == after:
+                    objects = objects[index + 1 :]
+                    break
+            else:
+                raise ValueError(f"Invalid or expired cursor: {cursor}")
+
+        result: Dict[str, Any] = {}
+        if limit is not None or cursor:
+            result["next_cursor"] = None
+            if limit is not None and len(objects) > limit:
+                objects = objects[:limit]
+                result["next_cursor"] = encode_cursor(objects[-1]["id"])
+
+        fields = self._list_param(params, "fields")
+        if fields:
+            # The id is always kept so objects can be told apart
+            fields = ["id"] + [field for field in fields if field != "id"]
+            objects = [
+                {field: obj[field] for field in fields if field in obj}
+                for obj in objects
+            ]
+
+        result["objects"] = objects
+        return result
+
+    @staticmethod
+    def _int_param(params: Dict[str, Any], name: str, minimum: int) -> Optional[int]:
+        """Parse an optional integer parameter with a lower bound."""
+        value = params.get(name)
+        if value is None:
+            return None
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {name}: {value}")
+        if number < minimum:
+            raise ValueError(f"Invalid {name}: {value}")
+        return number
 
-        # For now, we only support basic document info
-        # In a full implementation, we would need to extract specific document context
-        return {"document": doc_info}
+    @staticmethod
+    def _list_param(params: Optional[Dict[str, Any]], name: str) -> Optional[list]:
+        """Parse an optional list parameter given as a list or comma-separated."""
+        value = (params or {}).get(name)
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return list(value)
@@ -1,9 +1,12 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from ..extractor.cad_context import CADContextExtractor
+from ..extractor.journal import ChangeJournal
 from ..resources.base import ResourceProvider
+from .constraint_index import ConstraintIndex
+from .sketch_analysis import analyze_sketch, sketch_signature
 
 logger = logging.getLogger(__name__)
 
@@ -11,15 +14,22 @@ logger = logging.getLogger(__name__)
 class ConstraintResourceProvider(ResourceProvider):
     """Resource provider for constraints in CAD models."""
 
-    def __init__(self, freecad_app=None):
+    def __init__(self, freecad_app=None, max_journal_entries: int = 10000):
         """
         Initialize the constraint resource provider.
 
         Args:
             freecad_app: Optional FreeCAD application instance. If None, will try to import FreeCAD.
+            max_journal_entries: Change journal entries kept per document
         """
         self.extractor = CADContextExtractor(freecad_app)
         self.app = freecad_app
+        self.journal = ChangeJournal(max_journal_entries)
+        # Constraint index of each document, rebuilt when its revision changes
+        self._indexes: Dict[str, ConstraintIndex] = {}
+        # Analysis of each (document, sketch) with the revision and signature
+        # of the sketch it was made at
+        self._sketch_analyses: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
         if self.app is None:
             try:
@@ -48,18 +58,7 @@ class ConstraintResourceProvider(ResourceProvider):
         """
         logger.info(f"Retrieving constraint resource: {uri}")
 
-        # Parse the URI
-        parsed_uri = urlparse(uri)
-
-        if parsed_uri.scheme != "cad":
-            raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
-
-        path_parts = parsed_uri.path.strip("/").split("/")
-
-        if len(path_parts) < 1 or path_parts[0] != "constraints":
-            raise ValueError(
-                f"Invalid URI format: {uri}, expected 'cad://constraints/...'"
-            )
+        path_parts = self._parse_uri(uri)
 
         # Handle different resource types
         if len(path_parts) == 1:
@@ -72,6 +71,8 @@ class ConstraintResourceProvider(ResourceProvider):
             # Return constraints for a specific sketch
             if len(path_parts) < 3:
                 return {"error": "No sketch specified"}
+            if len(path_parts) > 3 and path_parts[3] == "analysis":
+                return await self._get_sketch_analysis(path_parts[2])
             return await self._get_sketch_constraints(path_parts[2])
         elif resource_type == "assembly":
             # Return assembly constraints
@@ -80,12 +81,85 @@ class ConstraintResourceProvider(ResourceProvider):
                 return await self._get_assembly_constraints()
             # Return assembly constraints for a specific object
             return await self._get_object_assembly_constraints(path_parts[2])
+        elif resource_type == "graph":
+            # Return the object/constraint graph as adjacency lists
+            return await self._get_constraint_graph()
         elif resource_type == "types":
             # Return available constraint types
-            return await self._get_constraint_types()
+            return await self._get_cached_constraint_types()
         else:
             raise ValueError(f"Unknown resource type: {resource_type}")
 
+    @staticmethod
+    def _parse_uri(uri: str) -> List[str]:
+        """Split a constraints URI into its path parts."""
+        parsed_uri = urlparse(uri)
+
+        if parsed_uri.scheme != "cad":
+            raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
+
+        # "cad://constraints/..." puts "constraints" in the netloc
+        path_parts = f"{parsed_uri.netloc}{parsed_uri.path}".strip("/").split("/")
+
+        if path_parts[0] != "constraints":
+            raise ValueError(
+                f"Invalid URI format: {uri}, expected 'cad://constraints/...'"
+            )
+        return path_parts
+
+    def attach_events(self, event_provider) -> None:
+        """
+        Rebuild constraint indexes only when their document changes.
+
+        Until this is called, the index of a document is rebuilt on every
+        request.
+
+        Args:
+            event_provider: A DocumentEventProvider for the same FreeCAD instance
+        """
+        self.journal.attach(event_provider)
+
+    def get_version(
+        self, uri: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a version tag for assembly constraint resources.
+
+        The tag is the active document's change journal revision, with the
+        journal's epoch so tags from an earlier run never match, and is only
+        available while events are attached.
+
+        Args:
+            uri: The resource URI
+            params: Optional parameters for the resource
+
+        Returns:
+            The version tag, or None if the resource has none
+        """
+        if not self.journal.live or self.app is None:
+            return None
+
+        path_parts = self._parse_uri(uri)
+        if len(path_parts) < 2 or path_parts[1] not in ("assembly", "graph"):
+            return None
+
+        doc = self.app.ActiveDocument
+        if not doc:
+            return None
+        return self.journal.version_tag(doc.Name)
+
+    def _constraint_index(self, doc) -> ConstraintIndex:
+        """Get the constraint index of a document, rebuilding it if outdated."""
+        revision = None
+        if self.journal.live:
+            revision = self.journal.document_revision(doc.Name)
+
+        index = self._indexes.get(doc.Name)
+        if index is None or revision is None or index.revision != revision:
+            index = ConstraintIndex(doc, revision)
+            self._indexes[doc.Name] = index
+        return index
+
     async def _get_all_constraints(self) -> Dict[str, Any]:
         """Get summary of all constraints in the active document."""
         if self.app is None:
@@ -97,35 +171,9 @@ class ConstraintResourceProvider(ResourceProvider):
             if not doc:
                 return {"error": "No active document"}
 
-            # Collect all sketch constraints
-            sketch_constraints = []
-            assembly_constraints = []
-
-            # Find all sketch objects
-            for obj in doc.Objects:
-                if obj.TypeId == "Sketcher::SketchObject":
-                    sketch_name = obj.Name
-                    constraints_count = (
-                        len(obj.Constraints) if hasattr(obj, "Constraints") else 0
-                    )
-
-                    sketch_constraints.append(
-                        {
-                            "sketch_name": sketch_name,
-                            "label": obj.Label,
-                            "constraints_count": constraints_count,
-                        }
-                    )
-
-            # Find all assembly constraints (if Assembly workbench is available)
-            # This is workbench-specific and would need to be adapted based on which
-            # assembly workbench is being used (A2Plus, Assembly4, etc.)
-            for obj in doc.Objects:
-                if hasattr(obj, "Type") and "Constraint" in obj.Type:
-                    if any(asm_type in obj.Type for asm_type in ["Assembly", "A2p"]):
-                        assembly_constraints.append(
-                            {"name": obj.Name, "label": obj.Label, "type": obj.Type}
-                        )
+            index = self._constraint_index(doc)
+            sketch_constraints = index.sketches
+            assembly_constraints = list(index.constraints.values())
 
             return {
                 "resource_type": "all_constraints",
@@ -288,6 +336,81 @@ class ConstraintResourceProvider(ResourceProvider):
             logger.error(f"Error getting sketch constraints: {e}")
             return {"error": f"Error getting sketch constraints: {str(e)}"}
 
+    async def _get_sketch_analysis(self, sketch_name: str) -> Dict[str, Any]:
+        """Get the constraint analysis of a sketch, solving it once per change."""
+        if self.app is None:
+            return self._mock_sketch_analysis(sketch_name)
+
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"error": "No active document"}
+
+            sketch = doc.getObject(sketch_name)
+            if not sketch:
+                return {"error": f"Sketch not found: {sketch_name}"}
+
+            if sketch.TypeId != "Sketcher::SketchObject":
+                return {"error": f"Object is not a sketch: {sketch_name}"}
+
+            key = (doc.Name, sketch_name)
+            cached = self._sketch_analyses.get(key)
+            revision = None
+            if self.journal.live:
+                revision = self.journal.document_revision(doc.Name)
+                if cached is not None and cached["revision"] == revision:
+                    return {**cached["analysis"], "cached": True}
+
+            # The document changed, but maybe not this sketch
+            signature = sketch_signature(sketch)
+            if cached is not None and cached["signature"] == signature:
+                cached["revision"] = revision
+                return {**cached["analysis"], "cached": True}
+
+            analysis = {
+                "resource_type": "sketch_analysis",
+                "sketch_name": sketch_name,
+                "label": sketch.Label,
+                **analyze_sketch(sketch),
+            }
+            self._sketch_analyses[key] = {
+                "revision": revision,
+                "signature": signature,
+                "analysis": analysis,
+            }
+            return {**analysis, "cached": False}
+
+        except Exception as e:
+            logger.error(f"Error analyzing sketch: {e}")
+            return {"error": f"Error analyzing sketch: {str(e)}"}
+
+    def _mock_sketch_analysis(self, sketch_name: str) -> Dict[str, Any]:
+        """Provide a mock sketch analysis when FreeCAD is not available."""
+        return {
+            "resource_type": "sketch_analysis",
+            "sketch_name": sketch_name,
+            "label": sketch_name,
+            "geometry_count": 4,
+            "constraint_count": 6,
+            "degrees_of_freedom": 10,
+            "components": [
+                {
+                    "geometry": [0, 1, 2, 3],
+                    "constraints": [0, 1, 2, 3, 4, 5],
+                    "degrees_of_freedom": 10,
+                    "over_constrained": False,
+                    "grounded": False,
+                }
+            ],
+            "redundant": [],
+            "conflicting": [],
+            "solver": None,
+            "fully_constrained": False,
+            "analysis_time_ms": 0.0,
+            "cached": False,
+            "note": "Mock data (FreeCAD not available)",
+        }
+
     def _mock_sketch_constraints(self, sketch_name: str) -> Dict[str, Any]:
         """Provide mock sketch constraint data when FreeCAD is not available."""
         return {
@@ -394,57 +517,8 @@ class ConstraintResourceProvider(ResourceProvider):
             if not doc:
                 return {"error": "No active document"}
 
-            # Assembly constraints are workbench-specific
-            # This implementation is based on common patterns found in Assembly workbenches
-            # It would need to be adapted based on which assembly workbench is being used
-
-            constraints = []
-
-            # Look for objects that might be assembly constraints
-            for obj in doc.Objects:
-                if hasattr(obj, "Type") and "Constraint" in obj.Type:
-                    if any(asm_type in obj.Type for asm_type in ["Assembly", "A2p"]):
-                        constraint_data = {
-                            "name": obj.Name,
-                            "label": obj.Label,
-                            "type": obj.Type,
-                        }
-
-                        # Get linked objects (different workbenches handle this differently)
-                        linked_objects = []
-
-                        # A2Plus approach
-                        if hasattr(obj, "Object1"):
-                            linked_objects.append(obj.Object1)
-                        if hasattr(obj, "Object2"):
-                            linked_objects.append(obj.Object2)
-
-                        # Assembly4 approach
-                        if hasattr(obj, "References"):
-                            for ref in obj.References:
-                                linked_objects.append(ref[0].Name)
-
-                        constraint_data["linked_objects"] = linked_objects
-
-                        # Get constraint parameters
-                        parameters = {}
-                        for prop in obj.PropertiesList:
-                            if prop not in [
-                                "Name",
-                                "Label",
-                                "Type",
-                                "Object1",
-                                "Object2",
-                                "References",
-                            ]:
-                                try:
-                                    parameters[prop] = getattr(obj, prop)
-                                except:
-                                    pass
-
-                        constraint_data["parameters"] = parameters
-
-                        constraints.append(constraint_data)
+            index = self._constraint_index(doc)
+            constraints = [index.describe(name) for name in index.constraints]
 
             return {
                 "resource_type": "assembly_constraints",
@@ -511,71 +585,7 @@ class ConstraintResourceProvider(ResourceProvider):
             if not obj:
                 return {"error": f"Object not found: {object_name}"}
 
-            # Find constraints related to this object
-            constraints = []
-
-            for doc_obj in doc.Objects:
-                if hasattr(doc_obj, "Type") and "Constraint" in doc_obj.Type:
-                    if any(
-                        asm_type in doc_obj.Type for asm_type in ["Assembly", "A2p"]
-                    ):
-                        is_related = False
-
-                        # A2Plus approach
-                        if hasattr(doc_obj, "Object1") and doc_obj.Object1 == obj.Name:
-                            is_related = True
-                        if hasattr(doc_obj, "Object2") and doc_obj.Object2 == obj.Name:
-                            is_related = True
-
-                        # Assembly4 approach
-                        if hasattr(doc_obj, "References"):
-                            for ref in doc_obj.References:
-                                if ref[0].Name == obj.Name:
-                                    is_related = True
-                                    break
-
-                        if is_related:
-                            constraint_data = {
-                                "name": doc_obj.Name,
-                                "label": doc_obj.Label,
-                                "type": doc_obj.Type,
-                            }
-
-                            # Get linked objects
-                            linked_objects = []
-
-                            # A2Plus approach
-                            if hasattr(doc_obj, "Object1"):
-                                linked_objects.append(doc_obj.Object1)
-                            if hasattr(doc_obj, "Object2"):
-                                linked_objects.append(doc_obj.Object2)
-
-                            # Assembly4 approach
-                            if hasattr(doc_obj, "References"):
-                                for ref in doc_obj.References:
-                                    linked_objects.append(ref[0].Name)
-
-                            constraint_data["linked_objects"] = linked_objects
-
-                            # Get constraint parameters
-                            parameters = {}
-                            for prop in doc_obj.PropertiesList:
-                                if prop not in [
-                                    "Name",
-                                    "Label",
-                                    "Type",
-                                    "Object1",
-                                    "Object2",
-                                    "References",
-                                ]:
-                                    try:
-                                        parameters[prop] = getattr(doc_obj, prop)
-                                    except:
-                                        pass
-
-                            constraint_data["parameters"] = parameters
-
-                            constraints.append(constraint_data)
+            constraints = self._constraint_index(doc).constraints_of(object_name)
 
             return {
                 "resource_type": "object_assembly_constraints",
@@ -619,6 +629,66 @@ class ConstraintResourceProvider(ResourceProvider):
             "note": "Mock data (FreeCAD not available)",
         }
 
+    async def _get_constraint_graph(self) -> Dict[str, Any]:
+        """Get the assembly constraint graph of the active document."""
+        if self.app is None:
+            return self._mock_constraint_graph()
+
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"error": "No active document"}
+
+            index = self._constraint_index(doc)
+            return {
+                "resource_type": "constraint_graph",
+                "document": doc.Name,
+                "constraint_count": len(index.constraints),
+                "object_count": len(index.by_object),
+                **index.graph(),
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting constraint graph: {e}")
+            return {"error": f"Error getting constraint graph: {str(e)}"}
+
+    def _mock_constraint_graph(self) -> Dict[str, Any]:
+        """Provide a mock constraint graph when FreeCAD is not available."""
+        return {
+            "resource_type": "constraint_graph",
+            "document": "Document",
+            "constraint_count": 3,
+            "object_count": 3,
+            "objects": {
+                "Part001": ["Constraint001", "Constraint002"],
+                "Part002": ["Constraint002", "Constraint003"],
+                "Part003": ["Constraint003"],
+            },
+            "constraints": {
+                "Constraint001": ["Part001"],
+                "Constraint002": ["Part001", "Part002"],
+                "Constraint003": ["Part002", "Part003"],
+            },
+            "note": "Mock data (FreeCAD not available)",
+        }
+
+    async def _get_cached_constraint_types(self) -> Dict[str, Any]:
+        """Get the constraint types, persisted per FreeCAD version."""
+        try:
+            version = ".".join(str(part) for part in self.app.Version()[:3])
+        except Exception:
+            version = None
+        if self.cache is None or version is None:
+            return await self._get_constraint_types()
+
+        key = f"freecad-{version}:cad://constraints/types"
+        types = self.cache.get(key, persist=True)
+        if types is None:
+            types = await self._get_constraint_types()
+            if "error" not in types:
+                self.cache.set(key, types, persist=True)
+        return types
+
     async def _get_constraint_types(self) -> Dict[str, Any]:
         """Get available constraint types."""
         if self.app is None:
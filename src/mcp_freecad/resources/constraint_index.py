@@ -0,0 +1,127 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ASSEMBLY_CONSTRAINT_MARKERS = ("Assembly", "A2p")
+
+# Properties that are reported separately rather than as parameters
+NON_PARAMETER_PROPERTIES = {
+    "Name",
+    "Label",
+    "Type",
+    "Object1",
+    "Object2",
+    "References",
+}
+
+
+def is_assembly_constraint(obj) -> bool:
+    """Check whether an object is an assembly constraint of a known workbench."""
+    obj_type = getattr(obj, "Type", None)
+    if not isinstance(obj_type, str) or "Constraint" not in obj_type:
+        return False
+    return any(marker in obj_type for marker in ASSEMBLY_CONSTRAINT_MARKERS)
+
+
+def linked_object_names(obj) -> List[str]:
+    """Get the names of the objects an assembly constraint links."""
+    linked = []
+
+    # A2Plus approach
+    for prop in ("Object1", "Object2"):
+        if hasattr(obj, prop):
+            value = getattr(obj, prop)
+            linked.append(getattr(value, "Name", value))
+
+    # Assembly4 approach
+    if hasattr(obj, "References"):
+        for ref in obj.References:
+            linked.append(ref[0].Name)
+
+    return linked
+
+
+class ConstraintIndex:
+    """
+    Assembly constraints of one document indexed both ways.
+
+    Built in a single pass over the document: constraint -> linked objects
+    and object -> constraints. Constraint parameters are read only when a
+    constraint is first returned, so a per-object lookup costs time
+    proportional to the number of constraints on that object.
+    """
+
+    def __init__(self, doc, revision: Optional[int] = None):
+        """
+        Build the index.
+
+        Args:
+            doc: The FreeCAD document
+            revision: Document revision the index was built at, if known
+        """
+        self.document = doc.Name
+        self.revision = revision
+        self.constraints: Dict[str, Dict[str, Any]] = {}
+        self.links: Dict[str, List[str]] = {}
+        self.by_object: Dict[str, List[str]] = {}
+        self.sketches: List[Dict[str, Any]] = []
+        self._objects: Dict[str, Any] = {}
+        self._parameters: Dict[str, Dict[str, Any]] = {}
+
+        for obj in doc.Objects:
+            if obj.TypeId == "Sketcher::SketchObject":
+                self.sketches.append(
+                    {
+                        "sketch_name": obj.Name,
+                        "label": obj.Label,
+                        "constraints_count": (
+                            len(obj.Constraints) if hasattr(obj, "Constraints") else 0
+                        ),
+                    }
+                )
+            elif is_assembly_constraint(obj):
+                linked = linked_object_names(obj)
+                self.constraints[obj.Name] = {
+                    "name": obj.Name,
+                    "label": obj.Label,
+                    "type": obj.Type,
+                }
+                self.links[obj.Name] = linked
+                self._objects[obj.Name] = obj
+                for name in dict.fromkeys(linked):
+                    self.by_object.setdefault(name, []).append(obj.Name)
+
+    def _read_parameters(self, name: str) -> Dict[str, Any]:
+        parameters = self._parameters.get(name)
+        if parameters is None:
+            obj = self._objects[name]
+            parameters = {}
+            for prop in obj.PropertiesList:
+                if prop in NON_PARAMETER_PROPERTIES:
+                    continue
+                try:
+                    parameters[prop] = getattr(obj, prop)
+                except Exception:
+                    pass
+            self._parameters[name] = parameters
+        return parameters
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """Get the full description of a constraint, including parameters."""
+        return {
+            **self.constraints[name],
+            "linked_objects": list(self.links[name]),
+            "parameters": self._read_parameters(name),
+        }
+
+    def constraints_of(self, object_name: str) -> List[Dict[str, Any]]:
+        """Get the constraints that link an object."""
+        return [self.describe(name) for name in self.by_object.get(object_name, [])]
+
+    def graph(self) -> Dict[str, Any]:
+        """Get the constraint graph as adjacency lists in both directions."""
+        return {
+            "objects": {name: list(c) for name, c in self.by_object.items()},
+            "constraints": {name: list(o) for name, o in self.links.items()},
+        }
@@ -1,10 +1,12 @@
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from ..extractor.cad_context import CADContextExtractor
 from ..resources.base import ResourceProvider
+from ..resources.material_library import MaterialLibrary
+from ..resources.material_query import MaterialTable, parse_quantities, parse_quantity
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +23,9 @@ class MaterialResourceProvider(ResourceProvider):
         """
         self.extractor = CADContextExtractor(freecad_app)
         self.app = freecad_app
-        self._materials_cache = None
+        self.library: Optional[MaterialLibrary] = None
+        # (library generation, table) for property range queries
+        self._table: Optional[Tuple[int, MaterialTable]] = None
 
         if self.app is None:
             try:
@@ -35,6 +39,13 @@ class MaterialResourceProvider(ResourceProvider):
                 )
                 self.app = None
 
+        if self.app is not None:
+            self.library = MaterialLibrary(
+                self._material_directories,
+                self._parse_material_file,
+                index_path=self._material_index_path(),
+            )
+
     async def get_resource(
         self, uri: str, params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
@@ -56,7 +67,8 @@ class MaterialResourceProvider(ResourceProvider):
         if parsed_uri.scheme != "cad":
             raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
 
-        path_parts = parsed_uri.path.strip("/").split("/")
+        # "cad://materials/..." puts "materials" in the netloc
+        path_parts = f"{parsed_uri.netloc}{parsed_uri.path}".strip("/").split("/")
 
         if len(path_parts) < 1 or path_parts[0] != "materials":
             raise ValueError(
@@ -66,13 +78,20 @@ class MaterialResourceProvider(ResourceProvider):
         # Handle different resource types
         if len(path_parts) == 1:
             # Return list of available materials
-            return await self._get_available_materials()
+            return await self._cached_library_resource(
+                uri, self._get_available_materials
+            )
 
         resource_type = path_parts[1]
 
         if resource_type == "library":
             # Return materials from the material library
-            return await self._get_material_library()
+            return await self._cached_library_resource(uri, self._get_material_library)
+        elif resource_type == "query":
+            # Range query over numeric material properties
+            query = parse_qs(parsed_uri.query)
+            query = {key: values[0] for key, values in query.items()}
+            return await self._query_materials({**query, **(params or {})})
         elif resource_type == "object":
             # Return material assigned to a specific object
             if len(path_parts) < 3:
@@ -82,23 +101,39 @@ class MaterialResourceProvider(ResourceProvider):
             # Return detailed information about a specific material
             if len(path_parts) < 3:
                 return {"error": "No material specified"}
-            return await self._get_material_info(path_parts[2])
+            return await self._cached_library_resource(
+                uri, lambda: self._get_material_info(path_parts[2])
+            )
         else:
             raise ValueError(f"Unknown resource type: {resource_type}")
 
+    async def _cached_library_resource(
+        self, uri: str, build: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Get a library resource, persisted until a material file changes."""
+        if self.cache is None or self.library is None:
+            return await build()
+
+        self._load_material_library()
+        key = f"{self.library.signature()}:{uri}"
+        result = self.cache.get(key, persist=True)
+        if result is None:
+            result = await build()
+            if "error" not in result:
+                self.cache.set(key, result, persist=True)
+        return result
+
     async def _get_available_materials(self) -> Dict[str, Any]:
         """Get list of all available materials."""
         if self.app is None:
             return self._mock_available_materials()
 
         try:
-            # Cache materials if not already done
-            if self._materials_cache is None:
-                self._materials_cache = self._load_material_library()
+            materials_by_name = self._load_material_library()
 
             # Create a list of material names and categories
             materials = []
-            for material_name, material_data in self._materials_cache.items():
+            for material_name, material_data in materials_by_name.items():
                 materials.append(
                     {
                         "name": material_name,
@@ -117,6 +152,83 @@ class MaterialResourceProvider(ResourceProvider):
             logger.error(f"Error getting available materials: {e}")
             return {"error": f"Error getting available materials: {str(e)}"}
 
+    def _material_table(self) -> Optional[MaterialTable]:
+        """Get the query table, rebuilt when the library changes."""
+        materials_by_name = self._load_material_library()
+        if self.library is None:
+            return None
+        if self._table is None or self._table[0] != self.library.generation:
+            self._table = (self.library.generation, MaterialTable(materials_by_name))
+        return self._table[1]
+
+    async def _query_materials(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query materials by numeric property ranges.
+
+        Parameters are ``<Property>.min`` and ``<Property>.max`` bounds, which
+        may carry units ("190 GPa"), ``name``, ``parent`` and ``category``
+        filters, ``sort`` (a property, "-" prefix for descending), ``limit``
+        and ``fields`` (extra properties to return). Values are in SI units.
+
+        Args:
+            params: The query parameters
+
+        Returns:
+            The matching materials
+        """
+        table = self._material_table()
+        if table is None:
+            return {"error": "Material library not available"}
+
+        ranges: Dict[str, List[Optional[float]]] = {}
+        for key, value in params.items():
+            prop, _, bound = key.rpartition(".")
+            if bound not in ("min", "max") or not prop:
+                continue
+            number = parse_quantity(value)
+            if number is None:
+                raise ValueError(f"Invalid quantity for {key}: {value}")
+            ranges.setdefault(prop, [None, None])[bound == "max"] = number
+
+        sort = params.get("sort")
+        descending = bool(sort) and sort.startswith("-")
+        if sort:
+            sort = sort.lstrip("-+")
+
+        limit = params.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid limit: {limit}")
+            if limit < 1:
+                raise ValueError(f"Invalid limit: {limit}")
+
+        rows, truncated = table.query(
+            {prop: tuple(bounds) for prop, bounds in ranges.items()},
+            name=params.get("name"),
+            parent=params.get("parent"),
+            category=params.get("category"),
+            sort=sort or None,
+            descending=descending,
+            limit=limit,
+        )
+
+        fields = params.get("fields") or ""
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(",") if field.strip()]
+        requested = [*ranges, *([sort] if sort else []), *fields]
+        properties = list(dict.fromkeys(requested))
+        properties = [prop for prop in properties if prop in table.columns]
+
+        return {
+            "resource_type": "material_query",
+            "count": len(rows),
+            "truncated": truncated,
+            "units": "SI",
+            "materials": [table.row(row, properties) for row in rows],
+        }
+
     def _mock_available_materials(self) -> Dict[str, Any]:
         """Provide mock material data when FreeCAD is not available."""
         return {
@@ -158,13 +270,11 @@ class MaterialResourceProvider(ResourceProvider):
             return self._mock_material_library()
 
         try:
-            # Cache materials if not already done
-            if self._materials_cache is None:
-                self._materials_cache = self._load_material_library()
+            materials_by_name = self._load_material_library()
 
             # Organize materials by category
             categories = {}
-            for material_name, material_data in self._materials_cache.items():
+            for material_name, material_data in materials_by_name.items():
                 category = material_data.get("category", "Unknown")
 
                 if category not in categories:
@@ -326,15 +436,13 @@ class MaterialResourceProvider(ResourceProvider):
             return self._mock_material_info(material_name)
 
         try:
-            # Cache materials if not already done
-            if self._materials_cache is None:
-                self._materials_cache = self._load_material_library()
+            materials_by_name = self._load_material_library()
 
             # Find the material
-            if material_name not in self._materials_cache:
+            if material_name not in materials_by_name:
                 return {"error": f"Material not found: {material_name}"}
 
-            material_data = self._materials_cache[material_name]
+            material_data = materials_by_name[material_name]
 
             return {
                 "resource_type": "material_info",
@@ -416,46 +524,59 @@ class MaterialResourceProvider(ResourceProvider):
 
     def _load_material_library(self) -> Dict[str, Dict[str, Any]]:
         """Load materials from FreeCAD's material library."""
-        materials = {}
-
-        if not self.app:
-            return materials
+        if self.library is None:
+            return {}
 
         try:
-            # Get the material library paths
-            if hasattr(self.app, "getResourceDir"):
-                resource_dir = self.app.getResourceDir()
-                material_dirs = [
-                    os.path.join(resource_dir, "Mod", "Material", "StandardMaterial"),
-                    os.path.join(resource_dir, "Mod", "Material", "FluidMaterial"),
-                ]
-
-                # Add user material directory if it exists
-                user_material_dir = os.path.join(
-                    self.app.getUserAppDataDir(), "Material"
-                )
-                if os.path.exists(user_material_dir):
-                    material_dirs.append(user_material_dir)
-
-                # Scan directories for material files
-                for material_dir in material_dirs:
-                    if os.path.exists(material_dir):
-                        for filename in os.listdir(material_dir):
-                            if filename.endswith(".FCMat"):
-                                material_path = os.path.join(material_dir, filename)
-                                material_name = os.path.splitext(filename)[0]
+            return self.library.load()
+        except Exception as e:
+            logger.error(f"Error loading material library: {e}")
+            return {}
 
-                                # Read and parse the material file
-                                material_data = self._parse_material_file(material_path)
+    def _material_directories(self) -> List[str]:
+        """Get the material directories, user materials last."""
+        material_dirs = []
+        if hasattr(self.app, "getResourceDir"):
+            resource_dir = self.app.getResourceDir()
+            material_dirs = [
+                os.path.join(resource_dir, "Mod", "Material", "StandardMaterial"),
+                os.path.join(resource_dir, "Mod", "Material", "FluidMaterial"),
+            ]
+
+            # Add user material directory if it exists
+            user_material_dir = os.path.join(self.app.getUserAppDataDir(), "Material")
+            if os.path.exists(user_material_dir):
+                material_dirs.append(user_material_dir)
+        return material_dirs
+
+    def _material_index_path(self) -> Optional[str]:
+        """Get the path of the persisted material index, next to user data."""
+        if not hasattr(self.app, "getUserAppDataDir"):
+            return None
+        return os.path.join(self.app.getUserAppDataDir(), "mcp_material_index.json")
+
+    def get_version(
+        self, uri: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Get a version tag for library resources.
 
-                                if material_data:
-                                    materials[material_name] = material_data
+        Library listings only change when material files do, so the library
+        signature, a digest of the files' mtimes and sizes, identifies them.
+        Unlike the library generation it is the same in every process, so
+        tags stay valid across restarts. Object materials are not versioned.
 
-            return materials
+        Args:
+            uri: The resource URI
+            params: Optional parameters for the resource
 
-        except Exception as e:
-            logger.error(f"Error loading material library: {e}")
-            return {}
+        Returns:
+            The version tag, or None if the resource has none
+        """
+        if self.library is None or "/object" in uri:
+            return None
+        self._load_material_library()
+        return f"materials:{self.library.signature()}"
 
     def _parse_material_file(self, file_path: str) -> Dict[str, Any]:
         """Parse a FreeCAD material file."""
@@ -495,6 +616,10 @@ class MaterialResourceProvider(ResourceProvider):
                             material_data["properties"][key] = value
 
                 material_data["category"] = category
+                # Numeric values in SI units for range queries
+                material_data["quantities"] = parse_quantities(
+                    material_data["properties"]
+                )
 
             return material_data
 
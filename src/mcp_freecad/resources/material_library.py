@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the parsed material format changes, e.g. SI quantities
+INDEX_VERSION = 2
+
+
+class MaterialLibrary:
+    """
+    Indexed view of the ``.FCMat`` files in a set of material directories.
+
+    Every parsed file is kept in an index together with its modification
+    time and size, and the index is persisted to disk so a restart does not
+    reparse the library. On each load the directories are checked: a
+    directory whose mtime is unchanged is not listed again, only its known
+    files are stat-ed, and only new or modified files are parsed, in
+    parallel on a thread pool. Adding one user material therefore parses
+    one file rather than the whole standard library.
+    """
+
+    def __init__(
+        self,
+        directories: Callable[[], List[str]],
+        parse_file: Callable[[str], Dict[str, Any]],
+        index_path: Optional[str] = None,
+        check_interval: float = 2.0,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the material library.
+
+        Args:
+            directories: Returns the material directories in priority order;
+                materials in later directories override earlier ones
+            parse_file: Parses one material file into its data dict
+            index_path: Optional path of the persisted index file
+            check_interval: Seconds between checks of the directories
+            max_workers: Thread pool size for parsing (default: executor default)
+        """
+        self.directories = directories
+        self.parse_file = parse_file
+        self.index_path = index_path
+        self.check_interval = check_interval
+        self.max_workers = max_workers
+        self.lock = Lock()
+        # directory -> {"mtime": ns, "files": {filename: [mtime_ns, size, data]}}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._materials: Optional[Dict[str, Dict[str, Any]]] = None
+        self._checked = 0.0
+        # Incremented whenever the set of materials changes
+        self.generation = 0
+        # (generation, digest) of the indexed files
+        self._signature: Optional[Tuple[int, str]] = None
+        self.stats = {"loads": 0, "files_parsed": 0, "index_loaded": False}
+        self._read_index()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all materials by name, reloading changed files if needed.
+
+        Returns:
+            Material data by material name
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self._materials is None or now - self._checked >= self.check_interval:
+                self._checked = now
+                if self._refresh() or self._materials is None:
+                    self._materials = self._build_materials()
+                    self.generation += 1
+            return self._materials
+
+    def signature(self) -> str:
+        """
+        Get a digest of the indexed files with their mtimes and sizes.
+
+        Unlike the generation, which restarts at 0 in every process, the
+        signature is the same for the same material files, so it can key
+        data persisted across restarts.
+        """
+        with self.lock:
+            if self._signature is None or self._signature[0] != self.generation:
+                digest = hashlib.sha256(f"v{INDEX_VERSION}".encode())
+                for directory, entry in self._index.items():
+                    for name in sorted(entry["files"]):
+                        mtime, size = entry["files"][name][:2]
+                        digest.update(f"\n{directory}/{name}:{mtime}:{size}".encode())
+                self._signature = (self.generation, digest.hexdigest())
+            return self._signature[1]
+
+    def invalidate(self) -> None:
+        """Force a check of the directories on the next load."""
+        with self.lock:
+            self._checked = 0.0
+            self._materials = None
+
+    def _refresh(self) -> bool:
+        """Bring the index up to date with the directories."""
+        self.stats["loads"] += 1
+        directories = [d for d in self.directories() if os.path.isdir(d)]
+        changed = list(self._index) != directories
+        for removed in set(self._index) - set(directories):
+            del self._index[removed]
+
+        to_parse: List[Tuple[str, str, int, int]] = []
+        for directory in directories:
+            to_parse.extend(self._scan_directory(directory))
+            changed = changed or self._index[directory].pop("changed", False)
+
+        if to_parse:
+            changed = True
+            self._parse_files(to_parse)
+            self._write_index()
+        elif changed:
+            self._write_index()
+        return changed
+
+    def _scan_directory(self, directory: str) -> List[Tuple[str, str, int, int]]:
+        """Find new and modified files in a directory, dropping removed ones."""
+        entry = self._index.get(directory)
+        dir_mtime = os.stat(directory).st_mtime_ns
+        if entry is None:
+            entry = {"mtime": None, "files": {}}
+            self._index[directory] = entry
+
+        files: Dict[str, List[Any]] = entry["files"]
+        if entry["mtime"] == dir_mtime:
+            # No files were added or removed; only edits need checking
+            names = list(files)
+        else:
+            names = [name for name in os.listdir(directory) if name.endswith(".FCMat")]
+            removed = set(files) - set(names)
+            for name in removed:
+                del files[name]
+            entry["mtime"] = dir_mtime
+            entry["changed"] = bool(removed)
+
+        to_parse = []
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                files.pop(name, None)
+                entry["changed"] = True
+                continue
+            known = files.get(name)
+            if known is None or known[:2] != [stat.st_mtime_ns, stat.st_size]:
+                to_parse.append((directory, name, stat.st_mtime_ns, stat.st_size))
+        return to_parse
+
+    def _parse_files(self, to_parse: List[Tuple[str, str, int, int]]) -> None:
+        """Parse files, in parallel when there is more than one."""
+        paths = [os.path.join(directory, name) for directory, name, _, _ in to_parse]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self.parse_file, paths))
+        else:
+            results = [self.parse_file(path) for path in paths]
+
+        for (directory, name, mtime, size), data in zip(to_parse, results):
+            self._index[directory]["files"][name] = [mtime, size, data]
+        self.stats["files_parsed"] += len(paths)
+        logger.info(f"Parsed {len(paths)} material files")
+
+    def _build_materials(self) -> Dict[str, Dict[str, Any]]:
+        materials = {}
+        for directory in self.directories():
+            entry = self._index.get(directory)
+            if entry is None:
+                continue
+            for name in sorted(entry["files"]):
+                data = entry["files"][name][2]
+                if data:
+                    materials[os.path.splitext(name)[0]] = data
+        return materials
+
+    def _read_index(self) -> None:
+        """Load the persisted index, ignoring it if missing or outdated."""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                return
+            self._index = index["directories"]
+            self.stats["index_loaded"] = True
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring material index {self.index_path}: {e}")
+
+    def _write_index(self) -> None:
+        """Persist the index atomically."""
+        if not self.index_path:
+            return
+        try:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "directories": self._index}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write material index {self.index_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get material library statistics."""
+        return {
+            **self.stats,
+            "generation": self.generation,
+            "materials": len(self._materials or {}),
+        }
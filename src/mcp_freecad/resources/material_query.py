@@ -0,0 +1,272 @@
+import bisect
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Scale of each unit to SI base units
+UNITS = {
+    "m": 1.0,
+    "g": 1e-3,
+    "s": 1.0,
+    "K": 1.0,
+    "A": 1.0,
+    "mol": 1.0,
+    "cd": 1.0,
+    "N": 1.0,
+    "Pa": 1.0,
+    "J": 1.0,
+    "W": 1.0,
+    "V": 1.0,
+    "C": 1.0,
+    "F": 1.0,
+    "H": 1.0,
+    "T": 1.0,
+    "S": 1.0,
+    "Ohm": 1.0,
+    "Hz": 1.0,
+    "l": 1e-3,
+    "L": 1e-3,
+    "bar": 1e5,
+    "psi": 6894.757293168,
+    "min": 60.0,
+    "h": 3600.0,
+    "%": 0.01,
+}
+
+PREFIXES = {
+    "T": 1e12,
+    "G": 1e9,
+    "M": 1e6,
+    "k": 1e3,
+    "h": 1e2,
+    "da": 1e1,
+    "d": 1e-1,
+    "c": 1e-2,
+    "m": 1e-3,
+    "µ": 1e-6,
+    "μ": 1e-6,
+    "u": 1e-6,
+    "n": 1e-9,
+    "p": 1e-12,
+}
+
+# Temperatures with an offset, as (scale, offset) to kelvin
+TEMPERATURE_UNITS = {
+    "°C": (1.0, 273.15),
+    "degC": (1.0, 273.15),
+    "°F": (5 / 9, 255.372),
+}
+
+_NUMBER = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$")
+_FACTOR = re.compile(r"^(.+?)(?:\^([-+]?\d+))?$")
+
+
+def _unit_factor(unit: str) -> Optional[float]:
+    """Get the SI scale of a single unit such as "MPa" or "m^3"."""
+    match = _FACTOR.match(unit)
+    if match is None:
+        return None
+    symbol, exponent = match.group(1), int(match.group(2) or 1)
+    if symbol in UNITS:
+        scale = UNITS[symbol]
+    else:
+        for prefix in sorted(PREFIXES, key=len, reverse=True):
+            if symbol.startswith(prefix) and symbol[len(prefix) :] in UNITS:
+                scale = PREFIXES[prefix] * UNITS[symbol[len(prefix) :]]
+                break
+        else:
+            return None
+    return scale**exponent
+
+
+def parse_quantity(text: Any) -> Optional[float]:
+    """
+    Parse a quantity string such as "7850 kg/m^3" or "200 GPa" into SI units.
+
+    Every part after a "/" divides, so "W/m/K" is W/(m*K). Temperatures in
+    °C and °F are converted to kelvin. Plain numbers are returned as is.
+
+    Args:
+        text: The quantity string, or a number
+
+    Returns:
+        The value in SI base units, or None if it is not a single quantity
+    """
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return float(text)
+    if not isinstance(text, str):
+        return None
+
+    match = _NUMBER.match(text)
+    if match is None:
+        return None
+    value, unit = float(match.group(1)), match.group(2)
+    if not unit:
+        return value
+    if unit in TEMPERATURE_UNITS:
+        scale, offset = TEMPERATURE_UNITS[unit]
+        return value * scale + offset
+
+    parts = unit.replace(" ", "").split("/")
+    scale = 1.0
+    for index, part in enumerate(parts):
+        for factor in re.split(r"[*·]", part):
+            if not factor or factor == "1":
+                continue
+            unit_scale = _unit_factor(factor)
+            if unit_scale is None:
+                return None
+            scale = scale * unit_scale if index == 0 else scale / unit_scale
+    return value * scale
+
+
+def parse_quantities(properties: Dict[str, Any]) -> Dict[str, float]:
+    """Parse every property value that is a single quantity."""
+    quantities = {}
+    for key, value in properties.items():
+        number = parse_quantity(value)
+        if number is not None:
+            quantities[key] = number
+    return quantities
+
+
+class SortedIndex:
+    """Property values sorted ascending with the rows they belong to."""
+
+    def __init__(self, column: List[Optional[float]]):
+        pairs = sorted(
+            (value, row) for row, value in enumerate(column) if value is not None
+        )
+        self.values = [value for value, _ in pairs]
+        self.rows = [row for _, row in pairs]
+
+    def range(self, low: Optional[float], high: Optional[float]) -> List[int]:
+        """Get the rows whose value lies in [low, high]."""
+        start = 0 if low is None else bisect.bisect_left(self.values, low)
+        end = len(self.values)
+        if high is not None:
+            end = bisect.bisect_right(self.values, high)
+        return self.rows[start:end]
+
+
+class MaterialTable:
+    """
+    Column-wise material properties with sorted indexes for range queries.
+
+    Built once per library generation from the SI ``quantities`` of each
+    material. Range filters are answered with binary searches on the sorted
+    index of each property and intersected starting from the most selective
+    one; sorting with a limit walks the sort property's index in order and
+    stops after ``limit`` matches.
+    """
+
+    def __init__(self, materials: Dict[str, Dict[str, Any]]):
+        """
+        Build the table.
+
+        Args:
+            materials: Material data by name, with ``quantities`` in SI units
+        """
+        self.names = sorted(materials)
+        self.parents = [materials[name].get("parent") for name in self.names]
+        self.categories = [materials[name].get("category") for name in self.names]
+        self.columns: Dict[str, List[Optional[float]]] = {}
+        for row, name in enumerate(self.names):
+            for key, value in materials[name].get("quantities", {}).items():
+                column = self.columns.get(key)
+                if column is None:
+                    column = self.columns[key] = [None] * len(self.names)
+                column[row] = value
+        self.indexes = {key: SortedIndex(col) for key, col in self.columns.items()}
+
+    def _check_property(self, key: str) -> None:
+        if key not in self.columns:
+            raise ValueError(f"Unknown material property: {key}")
+
+    def query(
+        self,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        name: Optional[str] = None,
+        parent: Optional[str] = None,
+        category: Optional[str] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[int], bool]:
+        """
+        Find materials matching filters.
+
+        Args:
+            ranges: Inclusive (min, max) SI bounds by property; None is open
+            name: Case-insensitive substring of the material name
+            parent: Parent (``Father``) material, case-insensitive
+            category: Category, case-insensitive
+            sort: Property to sort by, or None for name order. Materials
+                without that property are left out
+            descending: Sort from largest to smallest
+            limit: Maximum number of rows to return
+
+        Returns:
+            The matching rows in order, and whether more rows matched than
+            ``limit`` allowed
+        """
+        ranges = ranges or {}
+        for key in ranges:
+            self._check_property(key)
+        if sort is not None:
+            self._check_property(sort)
+
+        candidates: Optional[Set[int]] = None
+        # Most selective filter first keeps the intersections small
+        row_lists = sorted(
+            (self.indexes[key].range(low, high) for key, (low, high) in ranges.items()),
+            key=len,
+        )
+        for rows in row_lists:
+            candidates = set(rows) if candidates is None else candidates & set(rows)
+            if not candidates:
+                return [], False
+
+        name = name.lower() if name is not None else None
+        parent = parent.lower() if parent is not None else None
+        category = category.lower() if category is not None else None
+
+        def matches(row: int) -> bool:
+            if candidates is not None and row not in candidates:
+                return False
+            if name is not None and name not in self.names[row].lower():
+                return False
+            if parent is not None and (self.parents[row] or "").lower() != parent:
+                return False
+            if category is not None:
+                return (self.categories[row] or "").lower() == category
+            return True
+
+        if sort is not None:
+            order = self.indexes[sort].rows
+        elif candidates is not None:
+            order = sorted(candidates)
+        else:
+            order = list(range(len(self.names)))
+        if descending:
+            order = order[::-1]
+
+        # Stop as soon as one row more than the limit has been found
+        result = []
+        for row in order:
+            if matches(row):
+                result.append(row)
+                if limit is not None and len(result) > limit:
+                    return result[:limit], True
+        return result, False
+
+    def row(self, row: int, properties: List[str]) -> Dict[str, Any]:
+        """Get a result record with the SI values of some properties."""
+        return {
+            "name": self.names[row],
+            "parent": self.parents[row],
+            "category": self.categories[row],
+            "values": {key: self.columns[key][row] for key in properties},
+        }
@@ -54,27 +54,44 @@ class MeasurementResourceProvider(ResourceProvider):
         if parsed_uri.scheme != "cad":
             raise ValueError(f"Invalid URI scheme: {parsed_uri.scheme}, expected 'cad'")
 
-        path_parts = parsed_uri.path.strip("/").split("/")
+        # "cad://measurements/..." puts "measurements" in the netloc
+        path_parts = f"{parsed_uri.netloc}{parsed_uri.path}".strip("/").split("/")
 
         if len(path_parts) < 2 or path_parts[0] != "measurements":
             raise ValueError(
                 f"Invalid URI format: {uri}, expected 'cad://measurements/...'"
             )
 
-        # Get measurement type
-        measurement_type = path_parts[1]
-
-        # Handle different measurement types
+        # Measurements of a saved, unmodified document are persisted
+        doc = getattr(self.app, "ActiveDocument", None)
+        key = self.document_cache_key(uri, doc, params) if doc is not None else None
+        if key is not None:
+            cached = self.cache.get(key, persist=True)
+            if cached is not None:
+                return cached
+
+        result = await self._measure(path_parts[1], path_parts[2:], params)
+        if key is not None and "error" not in result:
+            self.cache.set(key, result, persist=True)
+        return result
+
+    async def _measure(
+        self,
+        measurement_type: str,
+        path_parts: List[str],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Dispatch to the measurement of the given type."""
         if measurement_type == "distance":
-            return await self._measure_distance(path_parts[2:], params)
+            return await self._measure_distance(path_parts, params)
         elif measurement_type == "area":
-            return await self._measure_area(path_parts[2:], params)
+            return await self._measure_area(path_parts, params)
         elif measurement_type == "volume":
-            return await self._measure_volume(path_parts[2:], params)
+            return await self._measure_volume(path_parts, params)
         elif measurement_type == "angle":
-            return await self._measure_angle(path_parts[2:], params)
+            return await self._measure_angle(path_parts, params)
         elif measurement_type == "bounding_box":
-            return await self._measure_bounding_box(path_parts[2:], params)
+            return await self._measure_bounding_box(path_parts, params)
         else:
             raise ValueError(f"Unknown measurement type: {measurement_type}")
 
@@ -0,0 +1,266 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Degrees of freedom of each sketch geometry type, by TypeId without "Part::Geom"
+GEOMETRY_DOF = {
+    "Point": 2,
+    "LineSegment": 4,
+    "Circle": 3,
+    "ArcOfCircle": 5,
+    "Ellipse": 5,
+    "ArcOfEllipse": 7,
+    "ArcOfHyperbola": 7,
+    "ArcOfParabola": 6,
+}
+
+# Degrees of freedom removed by each driving constraint type. Block and
+# InternalAlignment remove all freedoms of their first geometry instead.
+CONSTRAINT_DOF = {
+    "Coincident": 2,
+    "PointOnObject": 1,
+    "Horizontal": 1,
+    "Vertical": 1,
+    "Parallel": 1,
+    "Perpendicular": 1,
+    "Tangent": 1,
+    "Equal": 1,
+    "Symmetric": 2,
+    "Distance": 1,
+    "DistanceX": 1,
+    "DistanceY": 1,
+    "Radius": 1,
+    "Diameter": 1,
+    "Angle": 1,
+    "Weight": 1,
+    "SnellsLaw": 1,
+}
+
+# Constraints that fix a single geometry relative to the sketch origin
+FIXING_CONSTRAINTS = {"Block", "DistanceX", "DistanceY"}
+
+# Constraints whose two references can be swapped without changing them
+SYMMETRIC_CONSTRAINTS = {"Coincident", "Parallel", "Perpendicular", "Tangent", "Equal"}
+
+# Return codes of SketchObject.solve()
+SOLVER_STATUS = {
+    0: "solved",
+    -1: "solver_failed",
+    -2: "redundant_constraints",
+    -3: "conflicting_constraints",
+    -4: "over_constrained",
+    -5: "malformed_constraints",
+}
+
+# Geometry ids below this are unset references (Sketcher's GeoUndef)
+GEO_UNDEF = -2000
+
+
+def geometry_type(geo) -> str:
+    """Get a sketch geometry type, e.g. "LineSegment" for Part::GeomLineSegment."""
+    name = geo.TypeId.split(":")[-1]
+    return name[4:] if name.startswith("Geom") else name
+
+
+def geometry_dof(geo) -> int:
+    """Get the degrees of freedom of a sketch geometry."""
+    geo_type = geometry_type(geo)
+    if geo_type == "BSplineCurve":
+        # Pole positions and weights
+        return 3 * getattr(geo, "NbPoles", 0)
+    return GEOMETRY_DOF.get(geo_type, 0)
+
+
+def is_driving(constraint) -> bool:
+    """Check whether a constraint is active and not a reference dimension."""
+    return getattr(constraint, "Driving", True) and getattr(
+        constraint, "IsActive", True
+    )
+
+
+def constraint_key(constraint) -> Tuple[Any, ...]:
+    """Get the type, references and value of a constraint as a tuple."""
+    return (
+        constraint.Type,
+        getattr(constraint, "First", GEO_UNDEF),
+        getattr(constraint, "FirstPos", 0),
+        getattr(constraint, "Second", GEO_UNDEF),
+        getattr(constraint, "SecondPos", 0),
+        getattr(constraint, "Third", GEO_UNDEF),
+        getattr(constraint, "ThirdPos", 0),
+        getattr(constraint, "Value", 0.0),
+        is_driving(constraint),
+    )
+
+
+def sketch_signature(sketch) -> Tuple[Any, ...]:
+    """Get a signature that changes whenever the sketch's structure changes."""
+    return (
+        tuple(geo.TypeId for geo in sketch.Geometry),
+        tuple(constraint_key(c) for c in sketch.Constraints),
+    )
+
+
+def _removed_dof(key: Tuple[Any, ...], geometry_dofs: List[int]) -> int:
+    constraint_type, first, first_pos, second, second_pos = key[:5]
+    if constraint_type in ("Block", "InternalAlignment"):
+        return geometry_dofs[first] if 0 <= first < len(geometry_dofs) else 0
+    if constraint_type in ("Tangent", "Perpendicular") and first_pos and second_pos:
+        # Endpoint to endpoint also makes the points coincident
+        return 3
+    return CONSTRAINT_DOF.get(constraint_type, 0)
+
+
+def _reference_key(key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Get the type and references of a constraint, with symmetric ones ordered."""
+    constraint_type = key[0]
+    first, second = key[1:3], key[3:5]
+    if constraint_type in SYMMETRIC_CONSTRAINTS and second < first:
+        first, second = second, first
+    return (constraint_type,) + first + second + key[5:7]
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+
+def _duplicate_groups(
+    keys: List[Tuple[Any, ...]],
+) -> Tuple[List[List[int]], List[List[int]]]:
+    """Find driving constraints on the same references, as redundant or conflicting."""
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for index, key in enumerate(keys):
+        if key[8]:
+            groups.setdefault(_reference_key(key), []).append(index)
+
+    redundant, conflicting = [], []
+    for indexes in groups.values():
+        if len(indexes) < 2:
+            continue
+        values = {keys[index][7] for index in indexes}
+        (redundant if len(values) == 1 else conflicting).append(indexes)
+    return redundant, conflicting
+
+
+def analyze_sketch(sketch, solve: bool = True) -> Dict[str, Any]:
+    """
+    Analyze the constraint graph of a sketch.
+
+    Geometries are the nodes of the graph and driving constraints connect
+    the geometries they reference; the axes and external geometry are fixed
+    and not part of it. For each connected component the remaining degrees
+    of freedom are estimated by counting: the freedoms of its geometries
+    minus those removed by its constraints. A component with more freedoms
+    removed than it has is over-constrained. Constraints repeating the same
+    references are reported as redundant, or as conflicting when their
+    values differ. The solver, if run, gives the authoritative status.
+
+    Args:
+        sketch: The Sketcher::SketchObject
+        solve: Run the sketch solver and time it
+
+    Returns:
+        The analysis
+    """
+    start = time.perf_counter()
+    geometry_dofs = [geometry_dof(geo) for geo in sketch.Geometry]
+    keys = [constraint_key(c) for c in sketch.Constraints]
+
+    components = _UnionFind(len(geometry_dofs))
+    grounded = set()
+    for key in keys:
+        if not key[8]:
+            continue
+        references = [geo for geo in (key[1], key[3], key[5]) if geo > GEO_UNDEF]
+        internal = [geo for geo in references if 0 <= geo < len(geometry_dofs)]
+        for geo in internal[1:]:
+            components.union(internal[0], geo)
+        if internal and (
+            len(internal) < len(references)
+            or (key[0] in FIXING_CONSTRAINTS and len(references) == 1)
+        ):
+            grounded.add(internal[0])
+
+    members: Dict[int, Dict[str, Any]] = {}
+    for geo in range(len(geometry_dofs)):
+        root = components.find(geo)
+        component = members.setdefault(
+            root, {"geometry": [], "constraints": [], "dof": 0, "removed": 0}
+        )
+        component["geometry"].append(geo)
+        component["dof"] += geometry_dofs[geo]
+    grounded = {components.find(geo) for geo in grounded}
+
+    for index, key in enumerate(keys):
+        if not key[8]:
+            continue
+        first_internal = next(
+            (geo for geo in (key[1], key[3], key[5]) if 0 <= geo < len(geometry_dofs)),
+            None,
+        )
+        if first_internal is None:
+            continue
+        component = members[components.find(first_internal)]
+        component["constraints"].append(index)
+        component["removed"] += _removed_dof(key, geometry_dofs)
+
+    result_components = []
+    for root, component in members.items():
+        remaining = component["dof"] - component["removed"]
+        result_components.append(
+            {
+                "geometry": component["geometry"],
+                "constraints": component["constraints"],
+                "degrees_of_freedom": max(remaining, 0),
+                "over_constrained": remaining < 0,
+                "grounded": root in grounded,
+            }
+        )
+
+    redundant, conflicting = _duplicate_groups(keys)
+    degrees_of_freedom = sum(c["degrees_of_freedom"] for c in result_components)
+    analysis: Dict[str, Any] = {
+        "geometry_count": len(geometry_dofs),
+        "constraint_count": len(keys),
+        "degrees_of_freedom": degrees_of_freedom,
+        "components": result_components,
+        "redundant": redundant,
+        "conflicting": conflicting,
+        "solver": None,
+    }
+
+    fully_constrained: Optional[bool] = None
+    if solve and hasattr(sketch, "solve"):
+        solve_start = time.perf_counter()
+        code = sketch.solve()
+        solve_time = time.perf_counter() - solve_start
+        analysis["solver"] = {
+            "code": code,
+            "status": SOLVER_STATUS.get(code, "unknown"),
+            "solve_time_ms": round(solve_time * 1000, 3),
+        }
+        fully_constrained = getattr(sketch, "FullyConstrained", None)
+        if code != 0:
+            fully_constrained = False
+
+    if fully_constrained is None:
+        fully_constrained = (
+            degrees_of_freedom == 0
+            and not conflicting
+            and not any(c["over_constrained"] for c in result_components)
+        )
+    analysis["fully_constrained"] = bool(fully_constrained)
+    analysis["analysis_time_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return analysis
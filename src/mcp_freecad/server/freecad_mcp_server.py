@@ -11,6 +11,7 @@ Usage:
 
 import argparse
 import asyncio
+import contextlib
 import json
 import logging
 import logging.handlers
@@ -74,11 +75,62 @@ except ImportError:
         FREECAD_CONNECTION_AVAILABLE = False
         FreeCADConnection = None  # Define as None if unavailable
 
+# --- Tracing & Profiling Import ---
+try:
+    from src.mcp_freecad.core.profiler import Profiler
+    from src.mcp_freecad.core.tracing import configure_tracing, get_tracer, traced
+except ImportError:
+    try:
+        # Fallback if running from within the server directory structure
+        from ...core.profiler import Profiler
+        from ...core.tracing import configure_tracing, get_tracer, traced
+    except ImportError:
+        logging.warning(
+            "Tracing and profiling modules could not be imported. "
+            "Server will run without tracing and profiling."
+        )
+
+        class _NoopTracer:
+            @contextlib.contextmanager
+            def span(self, name: str, **attributes: Any):
+                yield None
+
+        _NOOP_TRACER = _NoopTracer()
+
+        def get_tracer() -> _NoopTracer:
+            return _NOOP_TRACER
+
+        def configure_tracing(config: Dict[str, Any]) -> _NoopTracer:
+            return _NOOP_TRACER
+
+        def traced(name: Optional[str] = None):
+            return lambda func: func
+
+        class Profiler:
+            UNAVAILABLE = {"status": "error", "message": "Profiler not available"}
+
+            def counted(self, func):
+                return func
+
+            def start(self, **kwargs) -> Dict[str, Any]:
+                return dict(self.UNAVAILABLE)
+
+            def stop(self) -> Dict[str, Any]:
+                return dict(self.UNAVAILABLE)
+
+            def poll(self) -> None:
+                pass
+
+            def status(self) -> Dict[str, Any]:
+                return {"status": "idle"}
+
+
 # --- Configuration & Globals ---
 VERSION = "1.0.0"  # Server version
 CONFIG_PATH = "config.json"  # Path relative to repo root
 CONFIG: Dict[str, Any] = {}
 FC_CONNECTION: Optional[FreeCADConnection] = None
+PROFILER = Profiler()
 
 # Ensure logs directory exists
 LOG_DIR = "logs"
@@ -385,9 +437,10 @@ async def execute_script_in_freecad(
 
         while retry_count < max_retries:
             try:
-                result = FC_CONNECTION.execute_command(
-                    "execute_script", {"script": script}
-                )
+                with get_tracer().span("execute_script", script_bytes=len(script)):
+                    result = FC_CONNECTION.execute_command(
+                        "execute_script", {"script": script}
+                    )
 
                 # Await if the connection method is async
                 if asyncio.iscoroutine(result):
@@ -449,11 +502,18 @@ async def execute_script_in_freecad(
         raise FastMCPError(f"Server error during script execution: {str(e)}")
 
 
+# --- Tool Instrumentation ---
+def instrumented(func):
+    """Trace a tool and count its calls toward on-demand profiling sessions."""
+    return traced()(PROFILER.counted(func))
+
+
 # --- Tool Definitions ---
 
 
 # == FreeCAD Document/Object Tools ==
 @mcp.tool()
+@instrumented
 async def freecad_create_document(name: str = "Unnamed") -> Dict[str, Any]:
     """Create a new FreeCAD document."""
     if not FC_CONNECTION:
@@ -479,6 +539,7 @@ async def freecad_create_document(name: str = "Unnamed") -> Dict[str, Any]:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_list_documents() -> Dict[str, Any]:
     """List all open documents in FreeCAD."""
     logger.info("Executing freecad.list_documents")
@@ -529,6 +590,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_list_objects(document: Optional[str] = None) -> Dict[str, Any]:
     """List objects in a specific document (or active one if none specified)."""
     logger.info(f"Executing freecad.list_objects (Document: {document})")
@@ -594,6 +656,7 @@ except Exception as e:
 
 # == Part Primitive Creation Tools ==
 @mcp.tool()
+@instrumented
 async def freecad_create_box(
     length: float,
     width: float,
@@ -662,6 +725,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_create_cylinder(
     radius: float,
     height: float,
@@ -730,6 +794,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_create_sphere(
     radius: float,
     name: str = "Sphere",
@@ -796,6 +861,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_create_cone(
     radius1: float,
     height: float,
@@ -867,6 +933,7 @@ except Exception as e:
 
 # == Part Boolean Operation Tools ==
 @mcp.tool()
+@instrumented
 async def freecad_boolean_union(
     object1: str, object2: str, name: str = "Union"
 ) -> Dict[str, Any]:
@@ -943,6 +1010,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_boolean_cut(
     object1: str, object2: str, name: str = "Cut"
 ) -> Dict[str, Any]:
@@ -1017,6 +1085,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_boolean_intersection(
     object1: str, object2: str, name: str = "Intersection"
 ) -> Dict[str, Any]:
@@ -1095,6 +1164,7 @@ except Exception as e:
 
 # == FreeCAD Object Manipulation Tools ==
 @mcp.tool()
+@instrumented
 async def freecad_move_object(
     object_name: str,
     x: Optional[float] = None,
@@ -1186,6 +1256,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_rotate_object(
     object_name: str, angle_x: float = 0.0, angle_y: float = 0.0, angle_z: float = 0.0
 ) -> Dict[str, Any]:
@@ -1291,6 +1362,7 @@ except Exception as e:
 
 
 @mcp.tool()
+@instrumented
 async def freecad_export_stl(
     file_path: str, objects: Optional[List[str]] = None, document: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -1434,6 +1506,79 @@ result_json = json.dumps({{"success": success, "error": error_msg}})
                 raise e
 
 
+# == Diagnostics Tools ==
+
+
+@mcp.tool()
+async def freecad_profile_start(
+    target: str = "server",
+    mode: str = "cprofile",
+    duration: Optional[float] = None,
+    tool_calls: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Profile the MCP server ("server"), FreeCAD ("freecad") or "both" for a
+    number of seconds or for the next N tool calls. FreeCAD supports cProfile only."""
+    if target not in ("server", "freecad", "both"):
+        raise FastMCPError(f"Invalid target '{target}'")
+    if duration is None and tool_calls is None:
+        raise FastMCPError("Either duration or tool_calls must be given")
+
+    result: Dict[str, Any] = {}
+    if target in ("server", "both"):
+        result["server"] = PROFILER.start(
+            mode=mode, duration=duration, tool_calls=tool_calls
+        )
+        if result["server"].get("status") == "error":
+            raise FastMCPError(result["server"]["message"])
+        if duration is not None:
+            # cProfile must be stopped on the event loop thread
+            asyncio.get_running_loop().call_later(duration, PROFILER.poll)
+
+    if target in ("freecad", "both"):
+        if not FC_CONNECTION or not FC_CONNECTION.is_connected():
+            raise FastMCPError("Not connected to FreeCAD")
+        # Each tool call reaches FreeCAD as at least one command
+        response = FC_CONNECTION.execute_command(
+            "start_profile", {"duration": duration, "commands": tool_calls}
+        )
+        if "error" in response:
+            raise FastMCPError(f"FreeCAD profiling error: {response['error']}")
+        result["freecad"] = response
+
+    return result
+
+
+@mcp.tool()
+async def freecad_profile_result(
+    target: str = "server", format: str = "pstats", limit: int = 50, stop: bool = False
+) -> Dict[str, Any]:
+    """Get profiling results as a pstats report or collapsed stacks ("collapsed",
+    sampling mode only). With stop=True the running session is ended first."""
+    if target not in ("server", "freecad", "both"):
+        raise FastMCPError(f"Invalid target '{target}'")
+
+    result: Dict[str, Any] = {}
+    if target in ("server", "both"):
+        if stop:
+            PROFILER.stop()
+        PROFILER.poll()
+        if PROFILER.status()["status"] == "finished":
+            result["server"] = PROFILER.result(fmt=format, limit=limit)
+        else:
+            result["server"] = PROFILER.status()
+
+    if target in ("freecad", "both"):
+        if not FC_CONNECTION or not FC_CONNECTION.is_connected():
+            raise FastMCPError("Not connected to FreeCAD")
+        command = "stop_profile" if stop else "get_profile"
+        response = FC_CONNECTION.execute_command(command, {"limit": limit})
+        if "error" in response:
+            raise FastMCPError(f"FreeCAD profiling error: {response['error']}")
+        result["freecad"] = response
+
+    return result
+
+
 # --- Resource Definitions ---
 
 
@@ -1578,6 +1723,7 @@ async def main():
 
     # --- Load Configuration ---
     CONFIG = load_config(args.config)
+    configure_tracing(CONFIG.get("tracing", {}))
     if args.host:
         CONFIG.setdefault("freecad", {})["host"] = args.host
     if args.port:
@@ -2,6 +2,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from .base import ToolProvider, ToolResult, ToolSchema
+from .interference import InterferenceChecker
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,8 @@ class AssemblyToolProvider(ToolProvider):
     def __init__(self, freecad_app=None):
         """Initialize the assembly tool provider."""
         self.app = freecad_app
+        # Interference checker of each assembly, keeping the last run
+        self.interference: Dict[str, InterferenceChecker] = {}
         if self.app is None:
             try:
                 import FreeCAD
@@ -40,6 +43,7 @@ class AssemblyToolProvider(ToolProvider):
                             "create_constraint",
                             "list_parts",
                             "move_part",
+                            "check_interference",
                         ],
                         "description": "The assembly action to perform",
                     },
@@ -72,6 +76,11 @@ class AssemblyToolProvider(ToolProvider):
                         "items": {"type": "number"},
                         "description": "Rotation angles [rx, ry, rz] in degrees",
                     },
+                    "clearance": {
+                        "type": "number",
+                        "description": "Minimum distance between parts in mm "
+                        "for check_interference",
+                    },
                 },
                 "required": ["action"],
             },
@@ -112,6 +121,8 @@ class AssemblyToolProvider(ToolProvider):
                 return await self._list_parts(params)
             elif action == "move_part":
                 return await self._move_part(params)
+            elif action == "check_interference":
+                return await self._check_interference(params)
             else:
                 return self.format_result("error", error=f"Unknown action: {action}")
 
@@ -323,6 +334,42 @@ class AssemblyToolProvider(ToolProvider):
         except Exception as e:
             return self.format_result("error", error=f"Failed to move part: {e}")
 
+    async def _check_interference(self, params: Dict[str, Any]) -> ToolResult:
+        """Check the parts of an assembly for collisions and clearance."""
+        try:
+            assembly_name = params.get("assembly_name")
+            clearance = params.get("clearance", 0.0)
+            doc = self._get_active_document()
+
+            assembly = doc.getObject(assembly_name)
+            if not assembly:
+                return self.format_result(
+                    "error", error=f"Assembly '{assembly_name}' not found"
+                )
+
+            shapes = {}
+            for obj in assembly.Group:
+                if hasattr(obj, "Shape") and not obj.Shape.isNull():
+                    if obj.Shape.Solids:
+                        shapes[obj.Name] = obj.Shape
+
+            key = f"{doc.Name}/{assembly.Name}"
+            checker = self.interference.get(key)
+            if checker is None:
+                checker = self.interference[key] = InterferenceChecker()
+            result = checker.check(
+                shapes, clearance, incremental=params.get("incremental", True)
+            )
+
+            return self.format_result(
+                "success", result={"assembly_name": assembly_name, **result}
+            )
+
+        except Exception as e:
+            return self.format_result(
+                "error", error=f"Failed to check interference: {e}"
+            )
+
     def _get_active_document(self):
         """Get the active document or create a new one if none exists."""
         if self.app.ActiveDocument:
@@ -0,0 +1,134 @@
+import logging
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Axis-aligned box as (xmin, ymin, zmin, xmax, ymax, zmax)
+Box = Tuple[float, float, float, float, float, float]
+
+
+def shape_box(shape) -> Box:
+    """Get the axis-aligned bounding box of a shape as a tuple."""
+    bbox = shape.BoundBox
+    return (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+
+
+def has_shape(obj) -> bool:
+    """Check whether a document object has a non-null shape."""
+    return hasattr(obj, "Shape") and not obj.Shape.isNull()
+
+
+def is_top_level_solid(obj) -> bool:
+    """
+    Check whether an object is a visible solid not used by another shape.
+
+    Objects consumed by a shaped object in their InList, such as the base
+    and tool of a Cut or the features inside a Body, are left out along
+    with hidden objects, so a feature and its result are not reported as
+    overlapping.
+    """
+    if not has_shape(obj) or not obj.Shape.Solids:
+        return False
+    if not getattr(obj, "Visibility", True):
+        return False
+    return not any(has_shape(parent) for parent in getattr(obj, "InList", []))
+
+
+def top_level_solids(doc) -> List[Any]:
+    """Get the objects batch queries use when none are named."""
+    return [obj for obj in doc.Objects if is_top_level_solid(obj)]
+
+
+def box_distance(a: Box, b: Box) -> float:
+    """Get the smallest distance between two boxes, 0 if they overlap."""
+    total = 0.0
+    for axis in range(3):
+        gap = max(a[axis] - b[axis + 3], b[axis] - a[axis + 3], 0.0)
+        total += gap * gap
+    return total**0.5
+
+
+def sweep_and_prune(
+    boxes: Sequence[Box],
+    margin: float = 0.0,
+    groups: Optional[Sequence[int]] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Find the pairs of boxes that overlap once grown by a margin.
+
+    The boxes are sorted by their lower x bound and swept in that order,
+    keeping the boxes whose x interval is still open; only those are tested
+    on y and z. This is O(n log n + k) for k overlapping x intervals instead
+    of testing all n² pairs. With numpy, each box is tested against all the
+    boxes starting inside its x interval at once.
+
+    Args:
+        boxes: The boxes to test
+        margin: Distance by which boxes may be apart and still be paired
+        groups: Optional group of each box; only boxes of different groups
+            are paired
+
+    Returns:
+        The (i, j) index pairs with i < j
+    """
+    if NUMPY_AVAILABLE and boxes:
+        return _sweep_and_prune_numpy(boxes, margin, groups)
+
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+    active: List[int] = []
+    pairs: Set[Tuple[int, int]] = set()
+    for i in order:
+        box = boxes[i]
+        # Drop boxes that end before this one starts
+        active = [j for j in active if boxes[j][3] + margin >= box[0]]
+        for j in active:
+            other = boxes[j]
+            if groups is not None and groups[i] == groups[j]:
+                continue
+            if (
+                box[1] <= other[4] + margin
+                and other[1] <= box[4] + margin
+                and box[2] <= other[5] + margin
+                and other[2] <= box[5] + margin
+            ):
+                pairs.add((min(i, j), max(i, j)))
+        active.append(i)
+    return sorted(pairs)
+
+
+def _sweep_and_prune_numpy(
+    boxes: Sequence[Box], margin: float, groups: Optional[Sequence[int]]
+) -> List[Tuple[int, int]]:
+    array = np.asarray(boxes, dtype=float).reshape(-1, 6)
+    order = np.argsort(array[:, 0], kind="stable")
+    swept = array[order]
+    group_array = np.asarray(groups)[order] if groups is not None else None
+    # Boxes after i in sweep order that start before i ends overlap it on x
+    ends = np.searchsorted(swept[:, 0], swept[:, 3] + margin, side="right")
+
+    pairs: Set[Tuple[int, int]] = set()
+    for i in range(len(swept)):
+        start, end = i + 1, int(ends[i])
+        if end <= start:
+            continue
+        box, others = swept[i], swept[start:end]
+        mask = (
+            (others[:, 1] <= box[4] + margin)
+            & (box[1] <= others[:, 4] + margin)
+            & (others[:, 2] <= box[5] + margin)
+            & (box[2] <= others[:, 5] + margin)
+        )
+        if group_array is not None:
+            mask &= group_array[start:end] != group_array[i]
+        first = int(order[i])
+        for other in order[start:end][mask]:
+            other = int(other)
+            pairs.add((min(first, other), max(first, other)))
+    return sorted(pairs)
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from .mesh_writer import write_binary_stl, write_obj
+from .tessellation_cache import get_tessellation_cache, tessellate_shape
+
+logger = logging.getLogger(__name__)
+
+# Shape method writing each exact format
+SHAPE_WRITERS = {
+    "step": "exportStep",
+    "stp": "exportStep",
+    "iges": "exportIges",
+    "igs": "exportIges",
+    "brep": "exportBrep",
+}
+MESH_WRITERS = {"stl": write_binary_stl, "obj": write_obj}
+BULK_FORMATS = sorted(set(SHAPE_WRITERS) | set(MESH_WRITERS))
+
+
+def export_shape(
+    shape, task: Dict[str, Any], tessellate: Callable[..., Any]
+) -> Dict[str, Any]:
+    """
+    Write one shape to its own file.
+
+    Args:
+        shape: The shape
+        task: Export task with ``object``, ``format``, ``path``,
+            ``tessellation`` and ``angular_deflection``
+        tessellate: Function tessellating a shape for mesh formats
+
+    Returns:
+        Manifest entry for the file
+    """
+    timings = {}
+    start = time.perf_counter()
+    entry = {"object": task["object"], "format": task["format"], "path": task["path"]}
+    writer = MESH_WRITERS.get(task["format"])
+    if writer is not None:
+        tessellation = tessellate(
+            shape, task["tessellation"], task.get("angular_deflection")
+        )
+        timings["tessellate"] = time.perf_counter() - start
+        start = time.perf_counter()
+        stats = writer(task["path"], [(task["object"], tessellation)])
+        entry["triangles"] = stats["triangles"]
+    else:
+        getattr(shape, SHAPE_WRITERS[task["format"]])(task["path"])
+    timings["write"] = time.perf_counter() - start
+    entry["bytes"] = os.path.getsize(task["path"])
+    entry["timings"] = timings
+    entry["status"] = "success"
+    return entry
+
+
+def _failed(task: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    return {
+        "object": task["object"],
+        "format": task["format"],
+        "path": task["path"],
+        "status": "error",
+        "message": str(error),
+    }
+
+
+def _init_worker(paths: List[str]) -> None:
+    """Give a spawned worker the module path of the parent, FreeCAD included."""
+    for path in paths:
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def export_worker(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load a shape from its BREP file and export it, in a worker process.
+
+    Args:
+        task: Export task as for export_shape, plus the ``brep`` path
+
+    Returns:
+        Manifest entry for the file, with the worker's process id
+    """
+    start = time.perf_counter()
+    try:
+        import Part
+
+        shape = Part.Shape()
+        shape.read(task["brep"])
+        load_time = time.perf_counter() - start
+        entry = export_shape(shape, task, tessellate_shape)
+        entry["timings"]["load"] = load_time
+    except Exception as e:
+        entry = _failed(task, e)
+    entry["worker"] = os.getpid()
+    return entry
+
+
+class BulkExporter:
+    """
+    Exports many objects, each to its own file, across worker processes.
+
+    Every shape is serialized to a BREP file once in the FreeCAD process.
+    A pool of headless worker processes then loads the BREP files and does
+    the tessellation and file writing in parallel. Workers are started with
+    the "spawn" method, as FreeCAD must not be forked, and are kept between
+    exports so FreeCAD is imported once per worker. With one worker the
+    shapes are exported in-process through the shared tessellation cache.
+    """
+
+    def __init__(self, workers: Optional[int] = None, executable: Optional[str] = None):
+        """
+        Initialize the bulk exporter.
+
+        Args:
+            workers: Number of worker processes (default: one per CPU)
+            executable: Python interpreter for the workers, needed when
+                running inside the FreeCAD GUI, whose executable is not a
+                plain Python interpreter
+
+        Raises:
+            ValueError: If workers is not a positive integer
+        """
+        if workers is not None and (
+            not isinstance(workers, int) or isinstance(workers, bool) or workers < 1
+        ):
+            raise ValueError(f"workers must be a positive integer, got {workers!r}")
+        self.workers = workers or os.cpu_count() or 1
+        self.executable = executable
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            if self.executable:
+                context.set_executable(self.executable)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(list(sys.path),),
+            )
+        return self._pool
+
+    async def _run_in_pool(
+        self, pool: ProcessPoolExecutor, task: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Export one task in a worker, failing it if the pool broke."""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, export_worker, task)
+        except BrokenProcessPool as e:
+            # A worker died, e.g. crashing in OCC; the pool cannot take new
+            # tasks, so it is dropped and the next export starts a new one
+            if self._pool is pool:
+                logger.warning(f"Bulk export worker pool broke: {e}")
+                pool.shutdown(wait=False)
+                self._pool = None
+            return _failed(task, e)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def export(
+        self,
+        objects: List[Any],
+        format_name: str,
+        output_dir: str,
+        tessellation: float = 1.0,
+        angular_deflection: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export each object to ``<output_dir>/<name>.<format>``.
+
+        Args:
+            objects: Objects with a Shape
+            format_name: One of BULK_FORMATS
+            output_dir: Directory for the files, created if missing
+            tessellation: Linear deflection for mesh formats
+            angular_deflection: Optional angular deflection for mesh formats
+
+        Returns:
+            Manifest with one entry per file, including its timings
+        """
+        start = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        tasks = [
+            {
+                "object": obj.Name,
+                "format": format_name,
+                "path": os.path.join(output_dir, f"{obj.Name}.{format_name}"),
+                "tessellation": tessellation,
+                "angular_deflection": angular_deflection,
+            }
+            for obj in objects
+        ]
+
+        serialize_time = 0.0
+        if self.workers <= 1 or len(tasks) <= 1:
+            workers = 1
+            cache = get_tessellation_cache()
+            files = []
+            for obj, task in zip(objects, tasks):
+                try:
+                    files.append(export_shape(obj.Shape, task, cache.tessellate))
+                except Exception as e:
+                    files.append(_failed(task, e))
+        else:
+            workers = min(self.workers, len(tasks))
+            brep_dir = tempfile.mkdtemp(prefix="mcp_bulk_export_")
+            try:
+                # Objects whose shape cannot be serialized fail on their own
+                files = [None] * len(tasks)
+                pending = []
+                serialize_start = time.perf_counter()
+                for index, (obj, task) in enumerate(zip(objects, tasks)):
+                    task["brep"] = os.path.join(brep_dir, f"{obj.Name}.brep")
+                    try:
+                        obj.Shape.exportBrep(task["brep"])
+                        pending.append(index)
+                    except Exception as e:
+                        files[index] = _failed(task, e)
+                serialize_time = time.perf_counter() - serialize_start
+
+                if pending:
+                    pool = self._get_pool()
+                    entries = await asyncio.gather(
+                        *[self._run_in_pool(pool, tasks[index]) for index in pending]
+                    )
+                    for index, entry in zip(pending, entries):
+                        files[index] = entry
+            finally:
+                shutil.rmtree(brep_dir, ignore_errors=True)
+
+        failed = sum(1 for entry in files if entry["status"] != "success")
+        total_time = time.perf_counter() - start
+        logger.info(
+            f"Bulk export of {len(files)} files with {workers} workers "
+            f"in {total_time:.2f}s, {failed} failed"
+        )
+        return {
+            "format": format_name,
+            "output_dir": output_dir,
+            "workers": workers,
+            "file_count": len(files) - failed,
+            "failed_count": failed,
+            "serialize_time": serialize_time,
+            "total_time": total_time,
+            "files": list(files),
+        }
@@ -3,7 +3,11 @@ import os
 import tempfile
 from typing import Any, Dict, List, Optional
 
-from ..tools.base import ToolProvider
+from ..tools.base import ToolProvider, ToolSchema
+from .bulk_export import BULK_FORMATS, BulkExporter
+from .import_jobs import ISOLATED_FORMATS, ImportJobManager
+from .mesh_writer import write_binary_stl, write_obj
+from .tessellation_cache import get_tessellation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +122,68 @@ class ExportImportToolProvider(ToolProvider):
                 )
                 self.app = None
 
+        self.bulk_exporter = BulkExporter()
+        self.import_jobs = ImportJobManager()
+
+    @property
+    def tool_schema(self) -> ToolSchema:
+        """Get the schema for export/import tools."""
+        return ToolSchema(
+            name="export_import",
+            description="Tools for exporting and importing CAD files",
+            parameters={
+                "type": "object",
+                "properties": {
+                    "tool_id": {
+                        "type": "string",
+                        "enum": [
+                            "export",
+                            "bulk_export",
+                            "import",
+                            "import_status",
+                            "cancel_import",
+                            "list_formats",
+                            "convert",
+                        ],
+                        "description": "The operation to perform",
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "Parameters for the operation",
+                    },
+                },
+                "required": ["tool_id"],
+            },
+            returns={
+                "type": "object",
+                "properties": {
+                    "status": {"type": "string"},
+                    "format": {"type": "string"},
+                    "output_path": {"type": "string"},
+                },
+            },
+            examples=[
+                {
+                    "tool_id": "export",
+                    "params": {
+                        "format": "stl",
+                        "output_path": "/tmp/part.stl",
+                        "tessellation": 0.1,
+                    },
+                },
+                {
+                    "tool_id": "bulk_export",
+                    "params": {"format": "step", "output_dir": "/tmp/parts"},
+                },
+                {"tool_id": "import", "params": {"file_path": "/tmp/part.step"}},
+                {
+                    "tool_id": "import",
+                    "params": {"file_path": "/tmp/large.step", "background": True},
+                },
+                {"tool_id": "import_status", "params": {"job_id": "..."}},
+            ],
+        )
+
     async def execute_tool(
         self, tool_id: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -144,8 +210,14 @@ class ExportImportToolProvider(ToolProvider):
         # Handle different tools
         if tool_id == "export":
             return await self._export_file(params)
+        elif tool_id == "bulk_export":
+            return await self._bulk_export(params)
         elif tool_id == "import":
             return await self._import_file(params)
+        elif tool_id == "import_status":
+            return await self._import_status(params)
+        elif tool_id == "cancel_import":
+            return await self._cancel_import(params)
         elif tool_id == "list_formats":
             return await self._list_formats(params)
         elif tool_id == "convert":
@@ -209,6 +281,8 @@ class ExportImportToolProvider(ToolProvider):
             if not output_path.lower().endswith(extension.lower()):
                 output_path += extension
 
+            mesh_stats = None
+
             # Execute the appropriate export function based on format
             if format_name in ["step", "stp"]:
                 # Export to STEP format
@@ -224,37 +298,21 @@ class ExportImportToolProvider(ToolProvider):
 
             elif format_name == "stl":
                 # Export to STL format
-                import Mesh
-
-                shapes = [obj.Shape for obj in objects if hasattr(obj, "Shape")]
-                if not shapes:
+                shaped = [obj for obj in objects if hasattr(obj, "Shape")]
+                if not shaped:
                     return {"status": "error", "message": "No shapes to export to STL"}
 
-                mesh = Mesh.Mesh()
-                for shape in shapes:
-                    mesh_data = Mesh.Mesh(
-                        shape.tessellate(params.get("tessellation", 1.0))
-                    )
-                    mesh.addMesh(mesh_data)
-
-                mesh.write(output_path)
+                mesh_stats = write_binary_stl(
+                    output_path, self._tessellations(shaped, params)
+                )
 
             elif format_name == "obj":
                 # Export to OBJ format
-                import Mesh
-
-                shapes = [obj.Shape for obj in objects if hasattr(obj, "Shape")]
-                if not shapes:
+                shaped = [obj for obj in objects if hasattr(obj, "Shape")]
+                if not shaped:
                     return {"status": "error", "message": "No shapes to export to OBJ"}
 
-                mesh = Mesh.Mesh()
-                for shape in shapes:
-                    mesh_data = Mesh.Mesh(
-                        shape.tessellate(params.get("tessellation", 1.0))
-                    )
-                    mesh.addMesh(mesh_data)
-
-                mesh.write(output_path)
+                mesh_stats = write_obj(output_path, self._tessellations(shaped, params))
 
             elif format_name == "brep":
                 # Export to BREP format
@@ -288,18 +346,106 @@ class ExportImportToolProvider(ToolProvider):
                         "message": f"Export module not found: {exporter_name}",
                     }
 
-            return {
+            result = {
                 "status": "success",
                 "message": f"Objects exported to {format_name.upper()} file: {output_path}",
                 "format": format_name,
                 "output_path": output_path,
                 "object_count": len(objects),
             }
+            if mesh_stats is not None:
+                result["triangle_count"] = mesh_stats["triangles"]
+                result["file_size"] = mesh_stats["bytes"]
+            return result
 
         except Exception as e:
             logger.error(f"Error exporting file: {e}")
             return {"status": "error", "message": f"Error exporting file: {str(e)}"}
 
+    def _tessellate(self, shape, params: Dict[str, Any]):
+        """Tessellate a shape for export through the shared tessellation cache."""
+        return get_tessellation_cache().tessellate(
+            shape,
+            params.get("tessellation", 1.0),
+            params.get("angular_deflection"),
+        )
+
+    def _tessellations(self, objects: List[Any], params: Dict[str, Any]):
+        """Yield (name, tessellation) of objects one at a time for streaming."""
+        for obj in objects:
+            yield obj.Name, self._tessellate(obj.Shape, params)
+
+    async def _bulk_export(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Export each object to its own file, in parallel worker processes."""
+        try:
+            format_name = (params.get("format") or "").lower()
+            if format_name not in BULK_FORMATS:
+                return {
+                    "status": "error",
+                    "message": f"Unsupported bulk export format: {format_name}",
+                    "supported_formats": BULK_FORMATS,
+                }
+
+            output_dir = params.get("output_dir")
+            if not output_dir:
+                return {"status": "error", "message": "No output directory specified"}
+
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"status": "error", "message": "No active document to export"}
+
+            object_names = params.get("objects", [])
+            if object_names:
+                objects = []
+                for name in object_names:
+                    obj = doc.getObject(name)
+                    if not obj:
+                        return {
+                            "status": "error",
+                            "message": f"Object not found: {name}",
+                        }
+                    objects.append(obj)
+            else:
+                objects = doc.Objects
+            # Null shapes, such as unrecomputed features, cannot be written,
+            # and sketches or wires are not parts of their own
+            objects = [
+                obj
+                for obj in objects
+                if hasattr(obj, "Shape") and not obj.Shape.isNull() and obj.Shape.Solids
+            ]
+            if not objects:
+                return {"status": "error", "message": "No solids to export"}
+
+            workers = params.get("workers")
+            if workers is not None and workers != self.bulk_exporter.workers:
+                try:
+                    exporter = BulkExporter(workers, self.bulk_exporter.executable)
+                except ValueError as e:
+                    return {"status": "error", "message": str(e)}
+                self.bulk_exporter.close()
+                self.bulk_exporter = exporter
+
+            manifest = await self.bulk_exporter.export(
+                objects,
+                format_name,
+                output_dir,
+                params.get("tessellation", 1.0),
+                params.get("angular_deflection"),
+            )
+            return {
+                "status": "success" if manifest["file_count"] else "error",
+                "message": (
+                    f"Exported {manifest['file_count']} of {len(objects)} objects "
+                    f"to {output_dir}"
+                ),
+                **manifest,
+            }
+
+        except Exception as e:
+            logger.error(f"Error in bulk export: {e}")
+            return {"status": "error", "message": f"Error in bulk export: {str(e)}"}
+
     async def _import_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Import a file in the specified format."""
         try:
@@ -341,54 +487,26 @@ class ExportImportToolProvider(ToolProvider):
                 doc_name = params.get("document_name", "Imported")
                 doc = self.app.newDocument(doc_name)
 
+            if params.get("background") or params.get("isolated"):
+                # Background imports always read the file in a separate
+                # process; FreeCAD importers must not run in a worker thread
+                try:
+                    job = self.import_jobs.start(file_path, format_name, doc)
+                except ValueError as e:
+                    return {
+                        "status": "error",
+                        "message": str(e),
+                        "supported_formats": list(ISOLATED_FORMATS),
+                    }
+                return {
+                    "status": "success",
+                    "message": f"Import job started for {file_path}",
+                    **job.to_dict(),
+                }
+
             # Execute the appropriate import function based on format
             objects_before = len(doc.Objects)
-
-            if format_name in ["step", "stp"]:
-                # Import STEP file
-                import ImportGui
-
-                ImportGui.insert(file_path, doc.Name)
-
-            elif format_name in ["iges", "igs"]:
-                # Import IGES file
-                import ImportGui
-
-                ImportGui.insert(file_path, doc.Name)
-
-            elif format_name == "stl":
-                # Import STL file
-                import Mesh
-
-                Mesh.insert(file_path, doc.Name)
-
-            elif format_name == "obj":
-                # Import OBJ file
-                import Mesh
-
-                Mesh.insert(file_path, doc.Name)
-
-            elif format_name == "brep":
-                # Import BREP file
-                import Part
-
-                shape = Part.Shape()
-                shape.read(file_path)
-                Part.show(shape)
-
-            elif format_name == "fcstd":
-                # Open FreeCAD document
-                self.app.openDocument(file_path)
-                # In this case, we need to get the newly opened document
-                doc = self.app.getDocument(
-                    os.path.splitext(os.path.basename(file_path))[0]
-                )
-
-            elif format_name == "dxf":
-                # Import DXF file
-                import ImportDXF
-
-                ImportDXF.open(file_path, doc.Name)
+            doc = self._insert_file(file_path, format_name, doc)
 
             # Recompute the document
             doc.recompute()
@@ -410,6 +528,76 @@ class ExportImportToolProvider(ToolProvider):
             logger.error(f"Error importing file: {e}")
             return {"status": "error", "message": f"Error importing file: {str(e)}"}
 
+    async def _import_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the progress of one background import job, or of all of them."""
+        job_id = params.get("job_id")
+        if not job_id:
+            return {"status": "success", "jobs": self.import_jobs.list_jobs()}
+
+        job = self.import_jobs.get(job_id)
+        if job is None:
+            return {"status": "error", "message": f"Import job not found: {job_id}"}
+        return {"status": "success", **job.to_dict()}
+
+    async def _cancel_import(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Cancel a background import job."""
+        job_id = params.get("job_id")
+        if not self.import_jobs.cancel(job_id):
+            return {"status": "error", "message": f"No running import job: {job_id}"}
+        return {
+            "status": "success",
+            "message": f"Cancelling import job {job_id}",
+            **self.import_jobs.get(job_id).to_dict(),
+        }
+
+    def _insert_file(self, file_path: str, format_name: str, doc):
+        """Import a file into a document and return the document it went into."""
+        if format_name in ["step", "stp"]:
+            # Import STEP file
+            import ImportGui
+
+            ImportGui.insert(file_path, doc.Name)
+
+        elif format_name in ["iges", "igs"]:
+            # Import IGES file
+            import ImportGui
+
+            ImportGui.insert(file_path, doc.Name)
+
+        elif format_name == "stl":
+            # Import STL file
+            import Mesh
+
+            Mesh.insert(file_path, doc.Name)
+
+        elif format_name == "obj":
+            # Import OBJ file
+            import Mesh
+
+            Mesh.insert(file_path, doc.Name)
+
+        elif format_name == "brep":
+            # Import BREP file
+            import Part
+
+            shape = Part.Shape()
+            shape.read(file_path)
+            Part.show(shape)
+
+        elif format_name == "fcstd":
+            # Open FreeCAD document
+            self.app.openDocument(file_path)
+            # In this case, we need to get the newly opened document
+            doc = self.app.getDocument(os.path.splitext(os.path.basename(file_path))[0])
+
+        elif format_name == "dxf":
+            # Import DXF file
+            import ImportDXF
+
+            ImportDXF.open(file_path, doc.Name)
+
+        return doc
+
     async def _list_formats(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """List supported import and export formats."""
         try:
@@ -0,0 +1,190 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _vector(vector) -> List[float]:
+    return [vector.x, vector.y, vector.z]
+
+
+def _bounding_box(shape) -> Dict[str, Any]:
+    bbox = shape.BoundBox
+    return {
+        "min_corner": [bbox.XMin, bbox.YMin, bbox.ZMin],
+        "max_corner": [bbox.XMax, bbox.YMax, bbox.ZMax],
+        "size": [bbox.XLength, bbox.YLength, bbox.ZLength],
+        "center": _vector(bbox.Center),
+        "diagonal": bbox.DiagonalLength,
+    }
+
+
+def _inertia(shape) -> List[List[float]]:
+    """Get the 3x3 matrix of inertia about the center of mass (unit density)."""
+    matrix = shape.MatrixOfInertia
+    return [[matrix.A[row * 4 + col] for col in range(3)] for row in range(3)]
+
+
+# How each cached property is computed from a shape
+PROPERTY_GETTERS: Dict[str, Callable[[Any], Any]] = {
+    "volume": lambda shape: shape.Volume,
+    "area": lambda shape: shape.Area,
+    "center_of_mass": lambda shape: _vector(shape.CenterOfMass),
+    "inertia": _inertia,
+    "bounding_box": _bounding_box,
+}
+
+
+def shape_fingerprint(shape) -> Tuple[Any, ...]:
+    """
+    Get a fingerprint that changes whenever a shape's geometry changes.
+
+    Combines the topology counts, the OCC hash of the shape (its
+    underlying TShape and location) and its placement. A recompute creates
+    a new TShape, which usually changes the fingerprint; the hash is
+    derived from the TShape's address, though, so a new shape allocated
+    where a freed one was can match it. Caches keep the shape with each
+    entry and confirm a match with same_shape.
+    """
+    placement = getattr(shape, "Placement", None)
+    matrix = tuple(placement.toMatrix().A) if placement is not None else ()
+    return (
+        shape.ShapeType,
+        len(shape.Solids),
+        len(shape.Faces),
+        len(shape.Edges),
+        len(shape.Vertexes),
+        shape.hashCode(),
+        matrix,
+    )
+
+
+def same_shape(cached, shape) -> bool:
+    """Check whether a cached shape is the given one, not one reusing its hash."""
+    return cached is shape or cached.isSame(shape)
+
+
+class GeometryCache:
+    """
+    Geometric properties of shapes, cached by shape fingerprint.
+
+    Volume, area, center of mass, inertia and bounding box are computed
+    from the OCC shape once per fingerprint and kept in an LRU of
+    ``max_entries`` shapes. Each entry holds its shape, which keeps the
+    hash from being reused while cached and is compared with ``isSame``
+    on a hit. Properties are computed lazily, so asking for the volume
+    does not integrate the inertia. Entries of an object are dropped when
+    events report it changed or recomputed.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the geometry cache.
+
+        Args:
+            max_entries: Maximum number of shapes kept
+        """
+        self.max_entries = max_entries
+        self.lock = Lock()
+        # fingerprint -> (shape, properties by name)
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        # (document, object) -> fingerprint of the shape cached for it
+        self._objects: Dict[Tuple[str, str], Tuple[Any, ...]] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def properties(
+        self,
+        shape,
+        names: Iterable[str] = tuple(PROPERTY_GETTERS),
+        owner: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get geometric properties of a shape.
+
+        Args:
+            shape: The shape
+            names: Properties to get, from PROPERTY_GETTERS
+            owner: Optional (document, object) the shape belongs to, so its
+                entry can be dropped when the object changes
+
+        Returns:
+            The requested properties by name
+        """
+        fingerprint = shape_fingerprint(shape)
+        with self.lock:
+            cached = self._entries.get(fingerprint)
+            if cached is not None and same_shape(cached[0], shape):
+                entry = cached[1]
+                self._entries.move_to_end(fingerprint)
+            else:
+                entry = {}
+                self._entries[fingerprint] = (shape, entry)
+                self._entries.move_to_end(fingerprint)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            if owner is not None:
+                self._objects[owner] = fingerprint
+
+        result = {}
+        for name in names:
+            if name in entry:
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                entry[name] = PROPERTY_GETTERS[name](shape)
+            result[name] = entry[name]
+        return result
+
+    def invalidate_object(self, document: str, name: str) -> None:
+        """Drop the cached properties of an object's shape."""
+        with self.lock:
+            fingerprint = self._objects.pop((document, name), None)
+            if fingerprint is not None:
+                self._entries.pop(fingerprint, None)
+                self.stats["invalidations"] += 1
+
+    def invalidate_document(self, document: str) -> None:
+        """Drop the cached properties of every object of a document."""
+        for owner in [owner for owner in self._objects if owner[0] == document]:
+            self.invalidate_object(*owner)
+
+    def attach(self, event_provider) -> None:
+        """
+        Drop entries of objects as document events report them changed.
+
+        Args:
+            event_provider: A DocumentEventProvider for the same FreeCAD instance
+        """
+        event_provider.add_subscriber(self.handle_event)
+
+    async def handle_event(self, event_data: Dict[str, Any]) -> None:
+        """
+        Invalidate entries for a document event.
+
+        Args:
+            event_data: The event data, including its ``type``
+        """
+        event_type = event_data.get("type")
+        document = event_data.get("document")
+        if document is None:
+            return
+
+        if event_type in ("object_changed", "object_deleted"):
+            self.invalidate_object(document, event_data["object"])
+        elif event_type == "document_changed":
+            recomputed = event_data.get("recomputed_objects")
+            if recomputed is None:
+                self.invalidate_document(document)
+            else:
+                for name in recomputed:
+                    self.invalidate_object(document, name)
+        elif event_type == "document_closed":
+            self.invalidate_document(document)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get geometry cache statistics."""
+        return {**self.stats, "entries": len(self._entries)}
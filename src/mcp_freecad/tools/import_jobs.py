@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Formats an isolated worker can read into a single shape with Part
+ISOLATED_FORMATS = ("step", "stp", "iges", "igs", "brep")
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+def read_bytes(pid: int) -> Optional[int]:
+    """Get the bytes a process has read so far, from /proc on Linux."""
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def import_worker(file_path: str, transfer_dir: str, messages) -> None:
+    """
+    Read a CAD file in a separate FreeCAD process and hand back its shapes.
+
+    Each top-level shape is written to its own BREP file in ``transfer_dir``
+    and announced on the ``messages`` queue as soon as it is written, so
+    the parent can add it to its document while the rest are written.
+
+    Args:
+        file_path: File to read
+        transfer_dir: Directory for the BREP files
+        messages: Queue receiving (kind, data) messages
+    """
+    try:
+        import Part
+
+        messages.put(("parsing", {"read_start": read_bytes(os.getpid())}))
+        shape = Part.Shape()
+        shape.read(file_path)
+        shapes = shape.childShapes() if shape.ShapeType == "Compound" else [shape]
+        messages.put(("parsed", {"shapes_total": len(shapes)}))
+        for index, child in enumerate(shapes):
+            path = os.path.join(transfer_dir, f"{index}.brep")
+            child.exportBrep(path)
+            messages.put(("shape", {"index": index, "brep": path}))
+        messages.put(("done", {}))
+    except Exception as e:
+        messages.put(("error", {"message": str(e)}))
+
+
+class ImportJob:
+    """State and progress of one background import."""
+
+    def __init__(self, file_path: str, format_name: str):
+        self.id = str(uuid.uuid4())
+        self.file_path = file_path
+        self.format = format_name
+        self.state = "queued"
+        self.document: Optional[str] = None
+        self.bytes_total = os.path.getsize(file_path)
+        self.bytes_read = 0
+        self.shapes_total: Optional[int] = None
+        self.shapes_created = 0
+        self.objects: List[str] = []
+        self.error: Optional[str] = None
+        self.cancel_requested = False
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the job state as sent to clients."""
+        end = self.finished or time.time()
+        return {
+            "job_id": self.id,
+            "file_path": self.file_path,
+            "format": self.format,
+            "state": self.state,
+            "document": self.document,
+            "progress": {
+                "bytes_read": self.bytes_read,
+                "bytes_total": self.bytes_total,
+                "shapes_created": self.shapes_created,
+                "shapes_total": self.shapes_total,
+            },
+            "objects": list(self.objects),
+            "error": self.error,
+            "elapsed": end - self.started,
+        }
+
+
+class ImportJobManager:
+    """
+    Runs CAD file imports in the background and tracks their progress.
+
+    Each job reads its file in a separate FreeCAD process, which reports
+    the bytes it has read while parsing (from /proc, on Linux) and hands
+    shapes back one by one as BREP files, so the server keeps answering
+    requests and a crash or a runaway parse cannot take it down. FreeCAD
+    importers are not thread-safe, so nothing is imported in a worker
+    thread; the shapes are added to the document from the event loop.
+
+    Cancelling a job terminates its process and removes the objects it
+    already added.
+    """
+
+    def __init__(
+        self,
+        executable: Optional[str] = None,
+        max_jobs: int = 100,
+        poll_interval: float = 0.1,
+    ):
+        """
+        Initialize the import job manager.
+
+        Args:
+            executable: Python interpreter for the import processes, needed
+                when running inside the FreeCAD GUI
+            max_jobs: Number of jobs kept, oldest finished jobs dropped first
+            poll_interval: Seconds between progress updates
+        """
+        self.executable = executable
+        self.max_jobs = max_jobs
+        self.poll_interval = poll_interval
+        self.jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+
+    def start(self, file_path: str, format_name: str, doc) -> ImportJob:
+        """
+        Start importing a file into a document.
+
+        Args:
+            file_path: File to import
+            format_name: Its format, one of ISOLATED_FORMATS
+            doc: Document to import into
+
+        Returns:
+            The started job
+
+        Raises:
+            ValueError: If the format cannot be imported in the background
+        """
+        if format_name not in ISOLATED_FORMATS:
+            raise ValueError(f"Background import does not support {format_name}")
+
+        job = ImportJob(file_path, format_name)
+        job.document = doc.Name
+        self.jobs[job.id] = job
+        self._prune()
+        job.task = asyncio.ensure_future(self._run(job, doc))
+        logger.info(f"Started import job {job.id} for {file_path}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """Get a job by id."""
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a job.
+
+        Returns:
+            False if there is no such unfinished job
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel_requested = True
+        return True
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        while len(self.jobs) > self.max_jobs and finished:
+            del self.jobs[finished.pop(0)]
+
+    async def _run(self, job: ImportJob, doc) -> None:
+        try:
+            await self._isolated(job, doc)
+            if job.cancel_requested:
+                self._roll_back(job, doc)
+                job.state = "cancelled"
+            else:
+                await self._recompute(job, doc)
+                job.bytes_read = job.bytes_total
+                job.state = "completed"
+        except Exception as e:
+            logger.error(f"Import job {job.id} failed: {e}")
+            self._roll_back(job, doc)
+            job.error = str(e)
+            job.state = "failed"
+        job.finished = time.time()
+        logger.info(f"Import job {job.id} {job.state} with {len(job.objects)} objects")
+
+    def _roll_back(self, job: ImportJob, doc) -> None:
+        """Remove the objects a job added."""
+        for name in job.objects:
+            try:
+                doc.removeObject(name)
+            except Exception as e:
+                logger.warning(f"Could not remove {name} after import: {e}")
+        job.objects = []
+
+    async def _recompute(self, job: ImportJob, doc) -> None:
+        """
+        Recompute the objects a job added, one at a time.
+
+        Only the imported objects are recomputed rather than the whole
+        document, and the event loop gets a turn between them.
+        """
+        for name in job.objects:
+            obj = doc.getObject(name)
+            if obj is not None:
+                obj.recompute()
+            await asyncio.sleep(0)
+
+    async def _isolated(self, job: ImportJob, doc) -> None:
+        """Read a job's file in a FreeCAD process and add its shapes to doc."""
+        import Part
+
+        context = multiprocessing.get_context("spawn")
+        if self.executable:
+            context.set_executable(self.executable)
+        messages = context.Queue()
+        transfer_dir = tempfile.mkdtemp(prefix="mcp_import_")
+        process = context.Process(
+            target=import_worker,
+            args=(job.file_path, transfer_dir, messages),
+            daemon=True,
+        )
+        process.start()
+        stem = os.path.splitext(os.path.basename(job.file_path))[0]
+        read_start = None
+        try:
+            while not job.cancel_requested:
+                try:
+                    kind, data = messages.get_nowait()
+                except queue.Empty:
+                    if not process.is_alive() and messages.empty():
+                        raise RuntimeError(
+                            f"Import process exited with code {process.exitcode}"
+                        )
+                    read = read_bytes(process.pid)
+                    if read_start is not None and read is not None:
+                        job.bytes_read = min(read - read_start, job.bytes_total)
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                if kind == "parsing":
+                    job.state = "parsing"
+                    read_start = data["read_start"]
+                elif kind == "parsed":
+                    job.state = "transferring"
+                    job.bytes_read = job.bytes_total
+                    job.shapes_total = data["shapes_total"]
+                elif kind == "shape":
+                    shape = Part.Shape()
+                    shape.read(data["brep"])
+                    os.remove(data["brep"])
+                    obj = doc.addObject("Part::Feature", f"{stem}_{data['index']}")
+                    obj.Shape = shape
+                    job.objects.append(obj.Name)
+                    job.shapes_created += 1
+                    # Let other requests in between the shapes of a large file
+                    await asyncio.sleep(0)
+                elif kind == "error":
+                    raise RuntimeError(data["message"])
+                elif kind == "done":
+                    break
+        finally:
+            if process.is_alive():
+                process.terminate()
+            await asyncio.get_running_loop().run_in_executor(None, process.join, 5)
+            shutil.rmtree(transfer_dir, ignore_errors=True)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get the state of every kept job, oldest first."""
+        return [job.to_dict() for job in self.jobs.values()]
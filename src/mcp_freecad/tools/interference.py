@@ -0,0 +1,146 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from .broadphase import shape_box, sweep_and_prune
+
+logger = logging.getLogger(__name__)
+
+
+def shape_state(shape) -> Tuple[Any, ...]:
+    """Get what identifies a part's position and extent for re-checking."""
+    return (shape_box(shape), str(getattr(shape, "Placement", "")))
+
+
+class InterferenceChecker:
+    """
+    Collision and clearance checks over a set of parts.
+
+    Candidate pairs come from a bounding-box broadphase grown by the
+    clearance. Each candidate is then tested exactly: the volume of the
+    common solid for collisions, and ``distToShape`` for clearance. The
+    results are kept, so a later incremental check re-tests only the pairs
+    involving parts whose bounding box or placement changed.
+    """
+
+    def __init__(self, volume_tolerance: float = 1e-6):
+        """
+        Initialize the interference checker.
+
+        Args:
+            volume_tolerance: Common volume (mm³) above which parts collide
+        """
+        self.volume_tolerance = volume_tolerance
+        self._states: Dict[str, Tuple[Any, ...]] = {}
+        # Narrow-phase result of each pair tested, None if clear
+        self._results: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        self._clearance: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forget the previous run, so the next check tests every pair."""
+        self._states = {}
+        self._results = {}
+        self._clearance = None
+
+    def _test_pair(
+        self, name1: str, shape1, name2: str, shape2, clearance: float
+    ) -> Optional[Dict[str, Any]]:
+        """Test two parts for collision, then for clearance."""
+        volume = shape1.common(shape2).Volume
+        if volume > self.volume_tolerance:
+            return {
+                "type": "collision",
+                "object1": name1,
+                "object2": name2,
+                "volume": volume,
+            }
+        if clearance > 0:
+            distance = shape1.distToShape(shape2)[0]
+            if distance < clearance:
+                return {
+                    "type": "clearance",
+                    "object1": name1,
+                    "object2": name2,
+                    "distance": distance,
+                }
+        return None
+
+    def check(
+        self,
+        shapes: Dict[str, Any],
+        clearance: float = 0.0,
+        incremental: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Find colliding parts and parts closer than the clearance.
+
+        Args:
+            shapes: Part shapes by name
+            clearance: Minimum distance (mm) parts must keep; 0 checks
+                collisions only
+            incremental: Reuse results of pairs whose parts have not moved
+                since the last check with the same clearance
+
+        Returns:
+            Collisions ranked by common volume, clearance violations ranked
+            by distance, and pair statistics
+        """
+        names = sorted(shapes)
+        states = {name: shape_state(shapes[name]) for name in names}
+        if not incremental or clearance != self._clearance:
+            self._results = {}
+            moved = set(names)
+        else:
+            moved = {n for n in names if self._states.get(n) != states[n]}
+
+        boxes = [states[name][0] for name in names]
+        candidates = sweep_and_prune(boxes, clearance)
+
+        results: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        tested = 0
+        for i, j in candidates:
+            pair = (names[i], names[j])
+            if pair in self._results and not moved.intersection(pair):
+                results[pair] = self._results[pair]
+                continue
+            results[pair] = self._test_pair(
+                names[i], shapes[names[i]], names[j], shapes[names[j]], clearance
+            )
+            tested += 1
+
+        self._states = states
+        self._results = results
+        self._clearance = clearance
+
+        found = [result for result in results.values() if result is not None]
+        collisions = sorted(
+            (r for r in found if r["type"] == "collision"),
+            key=lambda r: r["volume"],
+            reverse=True,
+        )
+        violations = sorted(
+            (r for r in found if r["type"] == "clearance"),
+            key=lambda r: r["distance"],
+        )
+        logger.info(
+            f"Interference check: {len(candidates)} candidate pairs, {tested} tested"
+        )
+        return {
+            "clearance": clearance,
+            "part_count": len(names),
+            "moved": sorted(moved) if incremental else None,
+            "candidate_pairs": len(candidates),
+            "tested_pairs": tested,
+            "reused_pairs": len(candidates) - tested,
+            "collision_count": len(collisions),
+            "collisions": collisions,
+            "clearance_violation_count": len(violations),
+            "clearance_violations": violations,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get interference checker statistics."""
+        return {
+            "parts": len(self._states),
+            "pairs": len(self._results),
+            "clearance": self._clearance,
+        }
@@ -2,7 +2,11 @@ import logging
 import math
 from typing import Any, Dict, List, Optional, Tuple
 
-from ..tools.base import ToolProvider
+from ..tools.base import ToolProvider, ToolSchema
+from .broadphase import box_distance, shape_box, sweep_and_prune, top_level_solids
+from .geometry_cache import PROPERTY_GETTERS, GeometryCache
+from .interference import InterferenceChecker
+from .spatial_index import SpatialIndex
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,12 @@ class MeasurementToolProvider(ToolProvider):
             freecad_app: Optional FreeCAD application instance. If None, will try to import FreeCAD.
         """
         self.app = freecad_app
+        # Interference checker of each document, keeping the last run
+        self.interference: Dict[str, InterferenceChecker] = {}
+        self.geometry = GeometryCache()
+        # Spatial index of each document, kept only while events are attached
+        self.spatial: Dict[str, SpatialIndex] = {}
+        self._spatial_live = False
 
         if self.app is None:
             try:
@@ -44,6 +54,70 @@ class MeasurementToolProvider(ToolProvider):
                 )
                 self.Part = None
 
+    @property
+    def tool_schema(self) -> ToolSchema:
+        """Get the schema for measurement tools."""
+        return ToolSchema(
+            name="measurement",
+            description="Tools for measuring distances, areas, volumes, and angles",
+            parameters={
+                "type": "object",
+                "properties": {
+                    "tool_id": {
+                        "type": "string",
+                        "enum": [
+                            "distance",
+                            "distance_matrix",
+                            "interference",
+                            "mass_properties",
+                            "nearest_objects",
+                            "objects_within_radius",
+                            "objects_in_box",
+                            "angle",
+                            "area",
+                            "volume",
+                            "center_of_mass",
+                            "bounding_box",
+                        ],
+                        "description": "The measurement to perform",
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "Parameters for the measurement",
+                    },
+                },
+                "required": ["tool_id"],
+            },
+            returns={
+                "type": "object",
+                "properties": {
+                    "status": {"type": "string"},
+                    "measurement_type": {"type": "string"},
+                    "units": {"type": "string"},
+                },
+            },
+            examples=[
+                {
+                    "tool_id": "distance",
+                    "params": {"object1": "Box", "object2": "Cylinder"},
+                },
+                {
+                    "tool_id": "distance_matrix",
+                    "params": {"objects": ["Part1", "Part2", "Part3"], "cutoff": 5.0},
+                },
+                {"tool_id": "interference", "params": {"clearance": 0.5}},
+                {
+                    "tool_id": "mass_properties",
+                    "params": {"objects": ["Part1", "Part2"], "density": 7850},
+                },
+                {"tool_id": "nearest_objects", "params": {"object": "Part1", "k": 3}},
+                {
+                    "tool_id": "objects_within_radius",
+                    "params": {"point": [0, 0, 0], "radius": 50},
+                },
+            ],
+        )
+
     async def execute_tool(
         self, tool_id: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -70,6 +144,14 @@ class MeasurementToolProvider(ToolProvider):
         # Handle different tools
         if tool_id == "distance":
             return await self._measure_distance(params)
+        elif tool_id == "distance_matrix":
+            return await self._measure_distance_matrix(params)
+        elif tool_id == "interference":
+            return await self._check_interference(params)
+        elif tool_id == "mass_properties":
+            return await self._measure_mass_properties(params)
+        elif tool_id in ("nearest_objects", "objects_within_radius", "objects_in_box"):
+            return await self._query_spatial_index(tool_id, params)
         elif tool_id == "angle":
             return await self._measure_angle(params)
         elif tool_id == "area":
@@ -84,6 +166,68 @@ class MeasurementToolProvider(ToolProvider):
             logger.error(f"Unknown tool ID: {tool_id}")
             return {"status": "error", "message": f"Unknown tool ID: {tool_id}"}
 
+    def attach_events(self, event_provider) -> None:
+        """
+        Keep caches and spatial indexes up to date from document events.
+
+        Cached properties are keyed by shape fingerprint and checked with
+        ``isSame`` on a hit, which catches most changes without events. A
+        shape edited in place keeps its fingerprint, though, and is only
+        measured again once an event drops its entry. MCPServer calls this
+        for every registered tool when a document event provider is
+        registered. Spatial indexes are kept between queries and updated only for the
+        objects events report changed. Until this is called, every spatial
+        query compares the indexed boxes with the document instead.
+
+        Args:
+            event_provider: A DocumentEventProvider for the same FreeCAD instance
+        """
+        self.geometry.attach(event_provider)
+        event_provider.add_subscriber(self._handle_spatial_event)
+        self._spatial_live = True
+
+    async def _handle_spatial_event(self, event_data: Dict[str, Any]) -> None:
+        """Mark objects of a spatial index stale as events report them changed."""
+        event_type = event_data.get("type")
+        index = self.spatial.get(event_data.get("document"))
+        if index is None:
+            return
+
+        if event_type in ("object_created", "object_changed"):
+            index.mark_stale(event_data["object"])
+        elif event_type == "object_deleted":
+            # Objects used by a deleted boolean become top-level solids again
+            index.mark_stale(event_data["object"])
+            if "out_list" in event_data:
+                for name in event_data["out_list"]:
+                    index.mark_stale(name)
+            else:
+                index.mark_all_stale()
+        elif event_type == "document_changed":
+            recomputed = event_data.get("recomputed_objects")
+            if recomputed is None:
+                del self.spatial[event_data["document"]]
+            else:
+                for name in recomputed:
+                    index.mark_stale(name)
+        elif event_type == "document_closed":
+            del self.spatial[event_data["document"]]
+
+    def _spatial_index(self, doc) -> SpatialIndex:
+        """Get the up to date spatial index of a document."""
+        index = self.spatial.get(doc.Name)
+        if index is None:
+            index = self.spatial[doc.Name] = SpatialIndex.from_document(doc)
+        elif self._spatial_live:
+            index.sync(doc)
+        else:
+            index.refresh(doc)
+        return index
+
+    def _shape_properties(self, doc, obj, names: List[str]) -> Dict[str, Any]:
+        """Get cached geometric properties of an object's shape."""
+        return self.geometry.properties(obj.Shape, names, (doc.Name, obj.Name))
+
     async def _measure_distance(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Measure the distance between two points, edges, or faces."""
         try:
@@ -236,6 +380,301 @@ class MeasurementToolProvider(ToolProvider):
             logger.error(f"Error measuring distance: {e}")
             return {"status": "error", "message": f"Error measuring distance: {str(e)}"}
 
+    def _resolve_shapes(
+        self, doc, names: Optional[List[str]]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Get the shapes of objects by name.
+
+        Args:
+            doc: The FreeCAD document
+            names: Object names, or None for the visible, top-level solids
+
+        Returns:
+            Shapes by object name, and the names that have no shape
+        """
+        shapes: Dict[str, Any] = {}
+        missing: List[str] = []
+        if names is None:
+            for obj in top_level_solids(doc):
+                shapes[obj.Name] = obj.Shape
+            return shapes, missing
+
+        for name in names:
+            obj = doc.getObject(name)
+            if obj is None or not hasattr(obj, "Shape") or obj.Shape.isNull():
+                missing.append(name)
+            else:
+                shapes[name] = obj.Shape
+        return shapes, missing
+
+    async def _measure_distance_matrix(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Measure distances between many objects, skipping pairs beyond a cutoff."""
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"status": "error", "message": "No active document"}
+
+            objects1 = params.get("objects")
+            objects2 = params.get("objects2")
+            cutoff = params.get("cutoff")
+            if cutoff is not None and (
+                not isinstance(cutoff, (int, float)) or cutoff < 0
+            ):
+                return {
+                    "status": "error",
+                    "message": "cutoff must be a non-negative number",
+                }
+
+            shapes1, missing = self._resolve_shapes(doc, objects1)
+            shapes2: Dict[str, Any] = {}
+            if objects2 is not None:
+                shapes2, missing2 = self._resolve_shapes(doc, objects2)
+                missing += missing2
+            if missing:
+                return {
+                    "status": "error",
+                    "message": f"Objects not found or without shape: {missing}",
+                }
+
+            # Each shape is resolved once, whatever the number of pairs
+            names = list(shapes1) + list(shapes2)
+            shapes = [shapes1[n] for n in shapes1] + [shapes2[n] for n in shapes2]
+            groups = None
+            if objects2 is not None:
+                groups = [0] * len(shapes1) + [1] * len(shapes2)
+
+            boxes = [shape_box(shape) for shape in shapes]
+            margin = float("inf") if cutoff is None else cutoff
+            candidates = sweep_and_prune(boxes, margin, groups)
+
+            pairs = []
+            seen = set()
+            measured = 0
+            for i, j in candidates:
+                key = tuple(sorted((names[i], names[j])))
+                if names[i] == names[j] or key in seen:
+                    continue
+                seen.add(key)
+                if cutoff is not None and box_distance(boxes[i], boxes[j]) > cutoff:
+                    continue
+                measured += 1
+                distance = shapes[i].distToShape(shapes[j])[0]
+                if cutoff is None or distance <= cutoff:
+                    pairs.append(
+                        {"object1": names[i], "object2": names[j], "distance": distance}
+                    )
+            pairs.sort(key=lambda pair: pair["distance"])
+
+            if groups is None:
+                total_pairs = len(names) * (len(names) - 1) // 2
+            else:
+                total_pairs = len(shapes1) * len(shapes2)
+
+            return {
+                "status": "success",
+                "measurement_type": "distance_matrix",
+                "cutoff": cutoff,
+                "units": "mm",
+                "object_count": len(set(names)),
+                "total_pairs": total_pairs,
+                "measured_pairs": measured,
+                "count": len(pairs),
+                "pairs": pairs,
+            }
+
+        except Exception as e:
+            logger.error(f"Error measuring distance matrix: {e}")
+            return {
+                "status": "error",
+                "message": f"Error measuring distance matrix: {str(e)}",
+            }
+
+    async def _check_interference(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Find colliding solids and solids closer than a clearance."""
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"status": "error", "message": "No active document"}
+
+            clearance = params.get("clearance", 0.0)
+            if not isinstance(clearance, (int, float)) or clearance < 0:
+                return {
+                    "status": "error",
+                    "message": "clearance must be a non-negative number",
+                }
+
+            shapes, missing = self._resolve_shapes(doc, params.get("objects"))
+            if missing:
+                return {
+                    "status": "error",
+                    "message": f"Objects not found or without shape: {missing}",
+                }
+            solids = {name: shape for name, shape in shapes.items() if shape.Solids}
+
+            checker = self.interference.get(doc.Name)
+            if checker is None:
+                checker = self.interference[doc.Name] = InterferenceChecker()
+            result = checker.check(
+                solids, clearance, incremental=params.get("incremental", True)
+            )
+
+            return {
+                "status": "success",
+                "measurement_type": "interference",
+                "units": "mm",
+                **result,
+            }
+
+        except Exception as e:
+            logger.error(f"Error checking interference: {e}")
+            return {
+                "status": "error",
+                "message": f"Error checking interference: {str(e)}",
+            }
+
+    async def _measure_mass_properties(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Measure volume, area, center of mass and inertia of many solids."""
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"status": "error", "message": "No active document"}
+
+            names = params.get("properties") or [
+                "volume",
+                "area",
+                "center_of_mass",
+                "inertia",
+            ]
+            unknown = [name for name in names if name not in PROPERTY_GETTERS]
+            if unknown:
+                return {
+                    "status": "error",
+                    "message": f"Unknown properties: {unknown}. "
+                    f"Use {list(PROPERTY_GETTERS)}",
+                }
+            density = params.get("density")
+            if density is not None and "volume" not in names:
+                names = list(names) + ["volume"]
+
+            shapes, missing = self._resolve_shapes(doc, params.get("objects"))
+            if missing:
+                return {
+                    "status": "error",
+                    "message": f"Objects not found or without shape: {missing}",
+                }
+
+            objects = {}
+            for name, shape in shapes.items():
+                if not shape.Solids:
+                    continue
+                properties = self.geometry.properties(shape, names, (doc.Name, name))
+                if density is not None:
+                    # Volume in mm³ and density in kg/m³
+                    properties["mass"] = properties["volume"] * 1e-9 * density
+                objects[name] = properties
+
+            return {
+                "status": "success",
+                "measurement_type": "mass_properties",
+                "units": {
+                    "volume": "mm³",
+                    "area": "mm²",
+                    "center_of_mass": "mm",
+                    "inertia": "mm⁵ (unit density)",
+                    "mass": "kg",
+                },
+                "count": len(objects),
+                "objects": objects,
+            }
+
+        except Exception as e:
+            logger.error(f"Error measuring mass properties: {e}")
+            return {
+                "status": "error",
+                "message": f"Error measuring mass properties: {str(e)}",
+            }
+
+    async def _query_spatial_index(
+        self, tool_id: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Find objects near an object, a point or inside a box."""
+        try:
+            doc = self.app.ActiveDocument
+            if not doc:
+                return {"status": "error", "message": "No active document"}
+
+            index = self._spatial_index(doc)
+            object_name = params.get("object")
+            point = params.get("point")
+
+            if tool_id == "objects_in_box":
+                low, high = params.get("min_corner"), params.get("max_corner")
+                if not (
+                    isinstance(low, list)
+                    and isinstance(high, list)
+                    and len(low) == 3
+                    and len(high) == 3
+                ):
+                    return {
+                        "status": "error",
+                        "message": "Invalid box. Expected min_corner and "
+                        "max_corner as [x, y, z]",
+                    }
+                target = tuple(low) + tuple(high)
+            elif object_name:
+                target = index.box_of(object_name)
+                if target is None:
+                    return {
+                        "status": "error",
+                        "message": f"Object not found or without shape: {object_name}",
+                    }
+            elif isinstance(point, list) and len(point) == 3:
+                target = tuple(point) + tuple(point)
+            else:
+                return {
+                    "status": "error",
+                    "message": "Specify an object or a point as [x, y, z]",
+                }
+
+            if tool_id == "nearest_objects":
+                k = params.get("k", 5)
+                if not isinstance(k, int) or k < 1:
+                    return {
+                        "status": "error",
+                        "message": "k must be a positive integer",
+                    }
+                found = index.nearest(target, k, exclude=object_name)
+            else:
+                radius = params.get("radius", 0.0)
+                if tool_id == "objects_in_box":
+                    radius = 0.0
+                elif not isinstance(radius, (int, float)) or radius < 0:
+                    return {
+                        "status": "error",
+                        "message": "radius must be a non-negative number",
+                    }
+                found = [
+                    (name, distance)
+                    for name, distance in index.within(target, radius)
+                    if name != object_name
+                ]
+
+            return {
+                "status": "success",
+                "measurement_type": tool_id,
+                "units": "mm",
+                "distance_type": "bounding_box",
+                "count": len(found),
+                "objects": [
+                    {"object": name, "distance": distance} for name, distance in found
+                ],
+            }
+
+        except Exception as e:
+            logger.error(f"Error querying objects: {e}")
+            return {"status": "error", "message": f"Error querying objects: {str(e)}"}
+
     async def _measure_angle(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Measure the angle between two edges, faces, or vectors."""
         try:
@@ -454,7 +893,7 @@ class MeasurementToolProvider(ToolProvider):
                     }
             else:
                 # Measure total area of the object
-                area = obj.Shape.Area
+                area = self._shape_properties(doc, obj, ["area"])["area"]
 
                 return {
                     "status": "success",
@@ -508,7 +947,7 @@ class MeasurementToolProvider(ToolProvider):
                 }
 
             # Measure volume
-            volume = obj.Shape.Volume
+            volume = self._shape_properties(doc, obj, ["volume"])["volume"]
 
             return {
                 "status": "success",
@@ -555,16 +994,12 @@ class MeasurementToolProvider(ToolProvider):
                 }
 
             # Measure center of mass
-            center_of_mass = obj.Shape.CenterOfMass
+            properties = self._shape_properties(doc, obj, ["center_of_mass"])
 
             return {
                 "status": "success",
                 "measurement_type": "center_of_mass",
-                "center_of_mass": [
-                    center_of_mass.x,
-                    center_of_mass.y,
-                    center_of_mass.z,
-                ],
+                "center_of_mass": properties["center_of_mass"],
                 "units": "mm",
                 "object": object_name,
             }
@@ -609,16 +1044,12 @@ class MeasurementToolProvider(ToolProvider):
                 }
 
             # Measure bounding box
-            bbox = obj.Shape.BoundBox
+            bbox = self._shape_properties(doc, obj, ["bounding_box"])["bounding_box"]
 
             return {
                 "status": "success",
                 "measurement_type": "bounding_box",
-                "min_corner": [bbox.XMin, bbox.YMin, bbox.ZMin],
-                "max_corner": [bbox.XMax, bbox.YMax, bbox.ZMax],
-                "size": [bbox.XLength, bbox.YLength, bbox.ZLength],
-                "center": [bbox.Center.x, bbox.Center.y, bbox.Center.z],
-                "diagonal": bbox.DiagonalLength,
+                **bbox,
                 "units": "mm",
                 "object": object_name,
             }
@@ -0,0 +1,149 @@
+import logging
+import os
+import struct
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STL_HEADER = b"MCP-FreeCAD binary STL".ljust(80, b" ")
+# Binary STL triangle: normal, three vertices, attribute byte count
+STL_RECORD = struct.Struct("<12fH")
+
+if NUMPY_AVAILABLE:
+    STL_DTYPE = np.dtype(
+        [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+    )
+
+# (name, (points, facets)) as returned by Shape.tessellate
+NamedTessellation = Tuple[str, Tuple[Sequence[Any], Sequence[Tuple[int, int, int]]]]
+
+
+def _coordinates(points: Sequence[Any]) -> List[Tuple[float, float, float]]:
+    """Get point coordinates from FreeCAD Vectors or plain sequences."""
+    return [(p[0], p[1], p[2]) for p in points]
+
+
+def _stl_records_numpy(points, facets) -> bytes:
+    vertices = np.asarray(_coordinates(points), dtype=np.float64).reshape(-1, 3)
+    triangles = vertices[np.asarray(facets, dtype=np.int64).reshape(-1, 3)]
+    normals = np.cross(
+        triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    )
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    records = np.zeros(len(triangles), dtype=STL_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = triangles
+    return records.tobytes()
+
+
+def _stl_records_python(points, facets) -> bytes:
+    coordinates = _coordinates(points)
+    chunks = []
+    for a, b, c in facets:
+        p, q, r = coordinates[a], coordinates[b], coordinates[c]
+        u = (q[0] - p[0], q[1] - p[1], q[2] - p[2])
+        v = (r[0] - p[0], r[1] - p[1], r[2] - p[2])
+        normal = (
+            u[1] * v[2] - u[2] * v[1],
+            u[2] * v[0] - u[0] * v[2],
+            u[0] * v[1] - u[1] * v[0],
+        )
+        length = (normal[0] ** 2 + normal[1] ** 2 + normal[2] ** 2) ** 0.5
+        if length > 0:
+            normal = (normal[0] / length, normal[1] / length, normal[2] / length)
+        chunks.append(STL_RECORD.pack(*normal, *p, *q, *r, 0))
+    return b"".join(chunks)
+
+
+def stl_records(points: Sequence[Any], facets: Sequence[Tuple[int, int, int]]) -> bytes:
+    """
+    Pack a tessellation into binary STL triangle records.
+
+    Facet normals are computed from the vertex winding, all at once with
+    numpy when it is installed.
+
+    Args:
+        points: Tessellation points
+        facets: Point index triples
+
+    Returns:
+        50 bytes per facet
+    """
+    if NUMPY_AVAILABLE and len(facets):
+        return _stl_records_numpy(points, facets)
+    return _stl_records_python(points, facets)
+
+
+def write_binary_stl(path: str, meshes: Iterable[NamedTessellation]) -> Dict[str, Any]:
+    """
+    Stream tessellations into one binary STL file.
+
+    Each tessellation is packed and written before the next is read, so
+    with a generator of tessellations the memory used stays proportional to
+    the largest one. The triangle count is patched into the header at the
+    end.
+
+    Args:
+        path: Output file path
+        meshes: (name, tessellation) pairs
+
+    Returns:
+        Shape, triangle and byte counts
+    """
+    shapes = triangles = 0
+    with open(path, "wb") as f:
+        f.write(STL_HEADER)
+        f.write(struct.pack("<I", 0))
+        for _, (points, facets) in meshes:
+            f.write(stl_records(points, facets))
+            shapes += 1
+            triangles += len(facets)
+        size = f.tell()
+        f.seek(len(STL_HEADER))
+        f.write(struct.pack("<I", triangles))
+    logger.debug(f"Wrote {triangles} triangles of {shapes} shapes to {path}")
+    return {"shapes": shapes, "triangles": triangles, "bytes": size}
+
+
+def write_obj(path: str, meshes: Iterable[NamedTessellation]) -> Dict[str, Any]:
+    """
+    Stream tessellations into one Wavefront OBJ file, one object per shape.
+
+    Args:
+        path: Output file path
+        meshes: (name, tessellation) pairs
+
+    Returns:
+        Shape, triangle and byte counts
+    """
+    shapes = triangles = 0
+    offset = 1
+    with open(path, "w") as f:
+        f.write("# Exported by MCP-FreeCAD\n")
+        for name, (points, facets) in meshes:
+            coordinates = _coordinates(points)
+            f.write(f"o {name}\n")
+            if NUMPY_AVAILABLE:
+                vertices = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+                faces = np.asarray(facets, dtype=np.int64).reshape(-1, 3) + offset
+                np.savetxt(f, vertices, fmt="v %.6f %.6f %.6f")
+                np.savetxt(f, faces, fmt="f %d %d %d")
+            else:
+                f.writelines(f"v {x:.6f} {y:.6f} {z:.6f}\n" for x, y, z in coordinates)
+                f.writelines(
+                    f"f {a + offset} {b + offset} {c + offset}\n" for a, b, c in facets
+                )
+            offset += len(coordinates)
+            shapes += 1
+            triangles += len(facets)
+    logger.debug(f"Wrote {triangles} triangles of {shapes} shapes to {path}")
+    return {"shapes": shapes, "triangles": triangles, "bytes": os.path.getsize(path)}
@@ -3,6 +3,7 @@ import os
 from typing import Any, Dict, List, Optional
 
 from .base import ToolProvider, ToolResult, ToolSchema
+from .tessellation_cache import get_tessellation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -362,10 +363,11 @@ class RenderingToolProvider(ToolProvider):
                     import Mesh
 
                     # Create mesh from objects
+                    cache = get_tessellation_cache()
                     meshes = []
                     for obj in objects:
                         if hasattr(obj, "Shape"):
-                            mesh = Mesh.Mesh(obj.Shape.tessellate(0.1))
+                            mesh = Mesh.Mesh(cache.tessellate(obj.Shape, 0.1))
                             meshes.append(mesh)
 
                     if meshes:
@@ -0,0 +1,261 @@
+import heapq
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .broadphase import (
+    Box,
+    box_distance,
+    is_top_level_solid,
+    shape_box,
+    top_level_solids,
+)
+
+logger = logging.getLogger(__name__)
+
+LEAF_SIZE = 8
+
+
+def _merge(boxes: List[Box]) -> Box:
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        min(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+        max(box[4] for box in boxes),
+        max(box[5] for box in boxes),
+    )
+
+
+class _Node:
+    __slots__ = ("box", "children", "items")
+
+    def __init__(self, items: List[Tuple[str, Box]]):
+        self.box = _merge([box for _, box in items])
+        self.children: List["_Node"] = []
+        self.items: List[Tuple[str, Box]] = []
+        if len(items) <= LEAF_SIZE:
+            self.items = items
+            return
+
+        # Split at the median centroid along the axis of largest spread
+        centers = [[(box[a] + box[a + 3]) / 2 for a in range(3)] for _, box in items]
+        spreads = [
+            max(c[a] for c in centers) - min(c[a] for c in centers) for a in range(3)
+        ]
+        axis = spreads.index(max(spreads))
+        order = sorted(range(len(items)), key=lambda i: centers[i][axis])
+        middle = len(order) // 2
+        self.children = [
+            _Node([items[i] for i in order[:middle]]),
+            _Node([items[i] for i in order[middle:]]),
+        ]
+
+
+class SpatialIndex:
+    """
+    Bounding volume hierarchy over the bounding boxes of named objects.
+
+    Answers nearest-neighbour, radius and box queries by descending only
+    into nodes that can hold a match, in logarithmic time for typical
+    layouts. Distances are between bounding boxes, so they are lower bounds
+    of the true distances between shapes.
+
+    Updates are incremental: a moved, added or removed object is taken out
+    of the tree and kept in a small side list that every query scans. The
+    tree is rebuilt once that list grows past an eighth of the objects.
+    """
+
+    def __init__(self, boxes: Optional[Dict[str, Box]] = None):
+        """
+        Build the index.
+
+        Args:
+            boxes: Bounding boxes by object name
+        """
+        self._root: Optional[_Node] = None
+        self._boxes: Dict[str, Box] = {}
+        # Objects updated since the last build; tree entries for them are stale
+        self._moved: Set[str] = set()
+        self._stale: Set[str] = set()
+        # Stale objects are unknown, so the next sync compares every box
+        self._refresh = False
+        self.stats = {"builds": 0, "queries": 0, "updates": 0}
+        self.rebuild(boxes or {})
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def rebuild(self, boxes: Dict[str, Box]) -> None:
+        """Replace the contents of the index."""
+        self._boxes = dict(boxes)
+        self._moved = set()
+        self._root = _Node(list(self._boxes.items())) if self._boxes else None
+        self.stats["builds"] += 1
+
+    @classmethod
+    def from_document(cls, doc) -> "SpatialIndex":
+        """Index the visible, top-level solids of a document."""
+        return cls({obj.Name: shape_box(obj.Shape) for obj in top_level_solids(doc)})
+
+    def update(self, name: str, box: Optional[Box]) -> None:
+        """
+        Set or remove the bounding box of an object.
+
+        Args:
+            name: Object name
+            box: Its new bounding box, or None to remove it
+        """
+        self.stats["updates"] += 1
+        if box is None:
+            self._boxes.pop(name, None)
+        else:
+            self._boxes[name] = box
+        self._moved.add(name)
+        if len(self._moved) > max(LEAF_SIZE, len(self._boxes) // 8):
+            self.rebuild(self._boxes)
+
+    def mark_stale(self, name: str) -> None:
+        """Mark an object to be re-read from its document before the next query."""
+        self._stale.add(name)
+
+    def mark_all_stale(self) -> None:
+        """Compare every box with the document before the next query."""
+        self._refresh = True
+
+    def sync(self, doc) -> None:
+        """
+        Re-read the bounding boxes of stale objects from the document.
+
+        The objects a stale object uses are re-read too: creating or
+        changing a boolean such as a Cut consumes its base and tool, which
+        stop being top-level solids without an event of their own.
+        """
+        if self._refresh:
+            self._refresh = False
+            self.refresh(doc)
+            return
+
+        names = set(self._stale)
+        self._stale.clear()
+        for name in list(names):
+            obj = doc.getObject(name)
+            if obj is not None:
+                names.update(child.Name for child in getattr(obj, "OutList", []))
+        for name in names:
+            obj = doc.getObject(name)
+            if obj is None or not is_top_level_solid(obj):
+                if name in self._boxes:
+                    self.update(name, None)
+            else:
+                box = shape_box(obj.Shape)
+                if self._boxes.get(name) != box:
+                    self.update(name, box)
+
+    def refresh(self, doc) -> int:
+        """
+        Compare every indexed box with the document and update the changed.
+
+        Reading the boxes is linear in the number of objects but much
+        cheaper than rebuilding the tree, which only happens when many
+        objects moved. Used when no events report changes.
+
+        Returns:
+            The number of objects added, moved or removed
+        """
+        boxes = {obj.Name: shape_box(obj.Shape) for obj in top_level_solids(doc)}
+        changed = [name for name, box in boxes.items() if self._boxes.get(name) != box]
+        removed = [name for name in self._boxes if name not in boxes]
+        for name in changed:
+            self.update(name, boxes[name])
+        for name in removed:
+            self.update(name, None)
+        self._stale.clear()
+        self._refresh = False
+        return len(changed) + len(removed)
+
+    def _moved_items(self) -> List[Tuple[str, Box]]:
+        return [(n, self._boxes[n]) for n in self._moved if n in self._boxes]
+
+    def within(self, target: Box, radius: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Find objects whose bounding box is within a distance of a box.
+
+        Args:
+            target: The query box; a point is a box with equal corners
+            radius: Maximum distance; 0 finds boxes overlapping the target
+
+        Returns:
+            (name, distance) pairs, nearest first
+        """
+        self.stats["queries"] += 1
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if box_distance(node.box, target) > radius:
+                continue
+            stack.extend(node.children)
+            for name, box in node.items:
+                if name not in self._moved:
+                    distance = box_distance(box, target)
+                    if distance <= radius:
+                        found.append((name, distance))
+        for name, box in self._moved_items():
+            distance = box_distance(box, target)
+            if distance <= radius:
+                found.append((name, distance))
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+    def nearest(
+        self, target: Box, k: int = 1, exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the k objects whose bounding boxes are nearest to a box.
+
+        Nodes and objects are visited best-first by their distance to the
+        target, so the search stops as soon as k objects are found.
+
+        Args:
+            target: The query box; a point is a box with equal corners
+            k: Number of objects to find
+            exclude: Optional object to leave out, e.g. the query object
+
+        Returns:
+            (name, distance) pairs, nearest first
+        """
+        self.stats["queries"] += 1
+        counter = itertools.count()
+        heap: List[Tuple[float, int, Any]] = []
+        if self._root is not None:
+            root_distance = box_distance(self._root.box, target)
+            heap.append((root_distance, next(counter), self._root))
+        for item in self._moved_items():
+            heapq.heappush(heap, (box_distance(item[1], target), next(counter), item))
+
+        found: List[Tuple[str, float]] = []
+        while heap and len(found) < k:
+            distance, _, entry = heapq.heappop(heap)
+            if isinstance(entry, tuple):
+                if entry[0] != exclude:
+                    found.append((entry[0], distance))
+                continue
+            for child in entry.children:
+                heapq.heappush(
+                    heap, (box_distance(child.box, target), next(counter), child)
+                )
+            for item in entry.items:
+                if item[0] not in self._moved:
+                    heapq.heappush(
+                        heap, (box_distance(item[1], target), next(counter), item)
+                    )
+        return found
+
+    def box_of(self, name: str) -> Optional[Box]:
+        """Get the indexed bounding box of an object."""
+        return self._boxes.get(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get spatial index statistics."""
+        return {**self.stats, "objects": len(self._boxes), "moved": len(self._moved)}
@@ -0,0 +1,150 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from .geometry_cache import same_shape, shape_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Rough in-memory size of one tessellation point (a FreeCAD Vector) and one
+# facet (a tuple of three indices), used to bound the cache by memory
+POINT_BYTES = 96
+FACET_BYTES = 88
+
+# (points, facets) as returned by Shape.tessellate
+Tessellation = Tuple[List[Any], List[Tuple[int, int, int]]]
+
+
+def tessellation_size(tessellation: Tessellation) -> int:
+    """Estimate the memory held by a tessellation in bytes."""
+    points, facets = tessellation
+    return len(points) * POINT_BYTES + len(facets) * FACET_BYTES
+
+
+def tessellate_shape(
+    shape, linear_deflection: float, angular_deflection: Optional[float] = None
+) -> Tessellation:
+    """
+    Tessellate a shape without caching.
+
+    An angular deflection needs MeshPart; without it, only the linear
+    deflection is applied.
+    """
+    if angular_deflection is None:
+        return shape.tessellate(linear_deflection)
+    try:
+        import MeshPart
+    except ImportError:
+        logger.debug("MeshPart not available, ignoring angular deflection")
+        return shape.tessellate(linear_deflection)
+
+    mesh = MeshPart.meshFromShape(
+        Shape=shape,
+        LinearDeflection=linear_deflection,
+        AngularDeflection=angular_deflection,
+        Relative=False,
+    )
+    return mesh.Topology
+
+
+class TessellationCache:
+    """
+    Tessellations of shapes, cached by shape fingerprint and tolerance.
+
+    Exporters and renderers that mesh the same shape with the same linear
+    and angular deflection share one tessellation instead of re-meshing.
+    Entries are kept in an LRU bounded by their estimated memory, so a few
+    very fine meshes evict many coarse ones. Each entry holds its shape and
+    a hit is confirmed with ``isSame``, so a recomputed shape that reuses
+    a freed shape's hash is meshed again; other changed shapes have a new
+    fingerprint, and their old entries simply age out.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the tessellation cache.
+
+        Args:
+            max_bytes: Estimated memory the cached tessellations may use
+        """
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        # key -> (shape, tessellation)
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, Tessellation]]" = (
+            OrderedDict()
+        )
+        self._sizes: Dict[Tuple[Any, ...], int] = {}
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def tessellate(
+        self,
+        shape,
+        linear_deflection: float,
+        angular_deflection: Optional[float] = None,
+    ) -> Tessellation:
+        """
+        Get the tessellation of a shape.
+
+        Args:
+            shape: The shape
+            linear_deflection: Maximum distance (mm) between mesh and surface
+            angular_deflection: Optional maximum angle (radians) between
+                adjacent facets; needs MeshPart
+
+        Returns:
+            The (points, facets) tessellation, which must not be modified
+        """
+        key = (shape_fingerprint(shape), linear_deflection, angular_deflection)
+        with self.lock:
+            cached = self._entries.get(key)
+            if cached is not None and same_shape(cached[0], shape):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached[1]
+            self.stats["misses"] += 1
+
+        tessellation = tessellate_shape(shape, linear_deflection, angular_deflection)
+        self._store(key, shape, tessellation)
+        return tessellation
+
+    def _store(self, key: Tuple[Any, ...], shape, tessellation: Tessellation) -> None:
+        size = tessellation_size(tessellation)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            cached = self._entries.pop(key, None)
+            if cached is not None:
+                self.size -= self._sizes.pop(key)
+            self._entries[key] = (shape, tessellation)
+            self._sizes[key] = size
+            self.size += size
+            while self.size > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self.size -= self._sizes.pop(evicted)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached tessellation."""
+        with self.lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tessellation cache statistics."""
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_cache = TessellationCache()
+
+
+def get_tessellation_cache() -> TessellationCache:
+    """Return the process-wide tessellation cache."""
+    return _cache
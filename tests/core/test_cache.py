@@ -0,0 +1,165 @@
+"""
+Tests for the resource cache and its persistent second-level store.
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from src.mcp_freecad.core.cache import ResourceCache
+from src.mcp_freecad.core.disk_cache import DiskCache
+from src.mcp_freecad.resources.measurement import MeasurementResourceProvider
+
+
+class TestDiskCache:
+    """Test the SQLite-backed disk cache."""
+
+    def test_round_trip_survives_reopen(self, tmp_path):
+        """Test that persisted values are readable by a new instance."""
+        path = str(tmp_path / "l2.sqlite")
+        cache = DiskCache(path)
+        cache.set("key", {"materials": ["Steel", "PLA"]})
+        cache.close()
+
+        reopened = DiskCache(path)
+        assert reopened.get("key") == {"materials": ["Steel", "PLA"]}
+        assert reopened.get("missing") is None
+
+    def test_lru_eviction_bounds_size(self, tmp_path):
+        """Test that least recently used entries are evicted first."""
+        cache = DiskCache(str(tmp_path / "l2.sqlite"), max_bytes=250, touch_interval=0)
+        cache.set("a", "x" * 100)
+        cache.set("b", "y" * 100)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", "z" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 100
+        assert cache.get_stats()["bytes"] <= 250
+
+    def test_reads_within_touch_interval_do_not_write(self, tmp_path):
+        """Test that a recently touched entry is read without a commit."""
+        cache = DiskCache(str(tmp_path / "l2.sqlite"))
+        cache.set("key", "value")
+        changes = cache._connect().total_changes
+        for _ in range(10):
+            assert cache.get("key") == "value"
+        assert cache._connect().total_changes == changes
+
+    def test_document_key_tracks_file_contents(self, tmp_path):
+        """Test that document keys change when the saved file changes."""
+        doc = tmp_path / "part.FCStd"
+        doc.write_bytes(b"first")
+        cache = DiskCache(str(tmp_path / "l2.sqlite"))
+
+        key1 = cache.document_key("cad://model/part/objects", str(doc))
+        assert key1 == cache.document_key("cad://model/part/objects", str(doc))
+
+        doc.write_bytes(b"second version")
+        key2 = cache.document_key("cad://model/part/objects", str(doc))
+        assert key1 != key2
+        assert key2.endswith(":cad://model/part/objects")
+
+
+class TestResourceCacheL2:
+    """Test the resource cache fallback to the second-level store."""
+
+    def test_persisted_entries_reload_after_restart(self, tmp_path):
+        """Test that a fresh memory cache is filled from disk on miss."""
+        path = str(tmp_path / "l2.sqlite")
+        cache = ResourceCache(l2=DiskCache(path))
+        cache.set("persisted", {"value": 1}, persist=True)
+        cache.set("transient", {"value": 2})
+
+        restarted = ResourceCache(l2=DiskCache(path))
+        assert restarted.get("persisted", persist=True) == {"value": 1}
+        assert restarted.get("transient", persist=True) is None
+        assert "persisted" in restarted.cache
+
+        stats = restarted.get_stats()
+        assert stats["hits"] == 1
+        assert stats["l2"]["hits"] == 1
+
+    def test_transient_keys_skip_disk(self, tmp_path):
+        """Test that misses for keys not read as persisted skip the disk."""
+        path = str(tmp_path / "l2.sqlite")
+        ResourceCache(l2=DiskCache(path)).set("persisted", 1, persist=True)
+
+        restarted = ResourceCache(l2=DiskCache(path))
+        assert restarted.get("persisted") is None
+        stats = restarted.get_stats()["l2"]
+        assert stats["hits"] == stats["misses"] == 0
+        assert not stats["opened"]
+
+    def test_clear_removes_persisted_entries(self, tmp_path):
+        """Test that clearing the cache also clears the disk store."""
+        cache = ResourceCache(l2=DiskCache(str(tmp_path / "l2.sqlite")))
+        cache.set("persisted", [1, 2, 3], persist=True)
+        cache.clear()
+        assert cache.get("persisted", persist=True) is None
+
+    def test_invalidate_pattern_removes_persisted_entries(self, tmp_path):
+        """Test that pattern invalidation also reaches the disk store."""
+        path = str(tmp_path / "l2.sqlite")
+        cache = ResourceCache(l2=DiskCache(path))
+        cache.set("abc:cad://measurements/volume/Box", 1000.0, persist=True)
+        cache.set("abc:cad://materials/library", ["Steel"], persist=True)
+        cache.invalidate_pattern("measurements")
+
+        restarted = ResourceCache(l2=DiskCache(path))
+        assert restarted.get("abc:cad://measurements/volume/Box", persist=True) is None
+        assert restarted.get("abc:cad://materials/library", persist=True) == ["Steel"]
+
+
+class CountingShape:
+    def __init__(self, volume):
+        self.volume = volume
+        self.reads = 0
+
+    @property
+    def Volume(self):
+        self.reads += 1
+        return self.volume
+
+
+def measurement_provider(doc, l2_path):
+    provider = MeasurementResourceProvider(SimpleNamespace(ActiveDocument=doc))
+    provider.set_cache(ResourceCache(l2=DiskCache(l2_path)))
+    return provider
+
+
+class TestPersistedResources:
+    """Test that providers persist resources of saved documents."""
+
+    def test_measurement_survives_restart(self, tmp_path, monkeypatch):
+        """Test that a saved, unmodified document is not measured again."""
+        gui_doc = SimpleNamespace(Modified=False)
+        gui = SimpleNamespace(getDocument=lambda name: gui_doc)
+        monkeypatch.setitem(sys.modules, "FreeCADGui", gui)
+        saved = tmp_path / "part.FCStd"
+        saved.write_bytes(b"saved document")
+        shape = CountingShape(1000.0)
+        box = SimpleNamespace(Name="Box", Shape=shape)
+        doc = SimpleNamespace(
+            Name="part", FileName=str(saved), getObject=lambda name: box
+        )
+        uri = "cad://measurements/volume/Box"
+        l2_path = str(tmp_path / "l2.sqlite")
+
+        first = asyncio.run(measurement_provider(doc, l2_path).get_resource(uri))
+        reads = shape.reads
+        restarted = measurement_provider(doc, l2_path)
+        assert asyncio.run(restarted.get_resource(uri)) == first
+        assert shape.reads == reads
+
+        # Unsaved changes are measured and not persisted
+        gui_doc.Modified = True
+        shape.volume = 2000.0
+        modified = measurement_provider(doc, l2_path)
+        assert asyncio.run(modified.get_resource(uri))["value"] == 2000.0
+
+    def test_unsaved_document_is_not_persisted(self, tmp_path):
+        """Test that documents without a file get no persistent key."""
+        doc = SimpleNamespace(Name="Unnamed", FileName="")
+        provider = measurement_provider(doc, str(tmp_path / "l2.sqlite"))
+        assert provider.document_cache_key("cad://measurements", doc) is None
@@ -0,0 +1,104 @@
+from src.mcp_freecad.extractor.cad_context import CADContextExtractor
+
+
+class Vector:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class Rotation:
+    Q = (0.0, 0.0, 0.0, 1.0)
+
+
+class Placement:
+    def __init__(self):
+        self.Base = Vector(1.0, 2.0, 3.0)
+        self.Rotation = Rotation()
+
+
+class Quantity:
+    def __init__(self, value):
+        self.Value = value
+        self.Unit = "mm"
+
+
+PROPERTY_TYPES = {
+    "Length": "App::PropertyLength",
+    "Placement": "App::PropertyPlacement",
+    "Direction": "App::PropertyVector",
+    "Base": "App::PropertyLink",
+    "Tools": "App::PropertyLinkList",
+    "Support": "App::PropertyLinkSub",
+    "Comment": "App::PropertyString",
+}
+
+
+class FakeObject:
+    type_lookups = 0
+
+    def __init__(self, name, base=None):
+        self.Name = name
+        self.Label = name
+        self.TypeId = "Part::Feature"
+        self.Visibility = True
+        self.PropertiesList = list(PROPERTY_TYPES)
+        self.reads = []
+        self.values = {
+            "Length": Quantity(10.0),
+            "Placement": Placement(),
+            "Direction": Vector(0.0, 0.0, 1.0),
+            "Base": base,
+            "Tools": [base] if base else [],
+            "Support": (base, ("Face1",)) if base else None,
+            "Comment": "note",
+        }
+
+    def getTypeIdOfProperty(self, prop):
+        FakeObject.type_lookups += 1
+        return PROPERTY_TYPES[prop]
+
+    def __getattr__(self, name):
+        values = self.__dict__.get("values", {})
+        if name not in values:
+            raise AttributeError(name)
+        self.reads.append(name)
+        return values[name]
+
+
+class TestPropertyExtraction:
+    def test_typed_serializers(self):
+        """Vectors, placements, quantities and links get JSON-ready values."""
+        base = FakeObject("Base")
+        obj = FakeObject("Pad", base=base)
+        properties = CADContextExtractor(object())._extract_object_properties(obj)
+        assert properties["Length"] == {"type": "App::PropertyLength", "value": 10.0}
+        assert properties["Direction"]["value"] == {"x": 0.0, "y": 0.0, "z": 1.0}
+        assert properties["Placement"]["value"] == {
+            "base": {"x": 1.0, "y": 2.0, "z": 3.0},
+            "rotation": [0.0, 0.0, 0.0, 1.0],
+        }
+        assert properties["Base"]["value"] == "Base"
+        assert properties["Tools"]["value"] == ["Base"]
+        assert properties["Support"]["value"] == {
+            "object": "Base",
+            "subelements": ["Face1"],
+        }
+        assert properties["Comment"]["value"] == "note"
+
+    def test_schema_is_cached_per_type(self):
+        """Property types are looked up once per type, not once per object."""
+        extractor = CADContextExtractor(object())
+        FakeObject.type_lookups = 0
+        for i in range(10):
+            extractor._extract_object_properties(FakeObject(f"Obj{i}"))
+        assert FakeObject.type_lookups == len(PROPERTY_TYPES)
+
+    def test_projection_skips_other_properties(self):
+        """Only the requested properties are read from the object."""
+        obj = FakeObject("Pad")
+        extractor = CADContextExtractor(object())
+        properties = extractor._extract_object_properties(obj, ["Length"])
+        assert list(properties) == ["Length"]
+        assert obj.reads == ["Length"]
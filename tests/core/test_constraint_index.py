@@ -0,0 +1,84 @@
+import asyncio
+
+from src.mcp_freecad.resources.constraint import ConstraintResourceProvider
+from src.mcp_freecad.resources.constraint_index import ConstraintIndex
+
+from .test_snapshot import FakeApp, FakeDocument, FakeObject, StubEventProvider
+
+
+class FakeConstraint(FakeObject):
+    def __init__(self, name, object1, object2):
+        super().__init__(name)
+        self.TypeId = "App::FeaturePython"
+        self.Type = "A2pConstraint"
+        self.Object1 = object1
+        self.Object2 = object2
+        self.reads = 0
+        self.PropertiesList = ["Label", "Object1", "Object2", "Offset"]
+
+    @property
+    def Offset(self):
+        self.reads += 1
+        return 0.0
+
+
+def create_document():
+    parts = [FakeObject(f"Part{i}") for i in range(3)]
+    constraints = [
+        FakeConstraint("Constraint0", "Part0", "Part1"),
+        FakeConstraint("Constraint1", "Part1", "Part2"),
+    ]
+    return FakeDocument("Assembly", parts + constraints)
+
+
+class TestConstraintIndex:
+    def test_adjacency(self):
+        """The index maps objects to constraints and constraints to objects."""
+        index = ConstraintIndex(create_document())
+        assert index.graph() == {
+            "objects": {
+                "Part0": ["Constraint0"],
+                "Part1": ["Constraint0", "Constraint1"],
+                "Part2": ["Constraint1"],
+            },
+            "constraints": {
+                "Constraint0": ["Part0", "Part1"],
+                "Constraint1": ["Part1", "Part2"],
+            },
+        }
+
+    def test_parameters_read_for_answer_only(self):
+        """A per-object lookup reads parameters of its own constraints only."""
+        doc = create_document()
+        index = ConstraintIndex(doc)
+        constraints = index.constraints_of("Part0")
+        assert [c["name"] for c in constraints] == ["Constraint0"]
+        assert constraints[0]["parameters"] == {"Offset": 0.0}
+        assert doc.getObject("Constraint1").reads == 0
+
+
+class TestConstraintProvider:
+    def test_index_rebuilt_per_revision(self):
+        """With events attached the index is reused until the document changes."""
+        doc = create_document()
+        provider = ConstraintResourceProvider(FakeApp([doc]))
+        events = StubEventProvider()
+        provider.attach_events(events)
+
+        graph = asyncio.run(provider.get_resource("cad://constraints/graph"))
+        assert graph["constraint_count"] == 2
+        index = provider._indexes["Assembly"]
+        result = asyncio.run(provider.get_resource("cad://constraints/assembly/Part1"))
+        assert result["count"] == 2
+        assert provider._indexes["Assembly"] is index
+        version = provider.get_version("cad://constraints/graph")
+
+        doc.Objects.append(FakeConstraint("Constraint2", "Part2", "Part0"))
+        event = {"type": "object_created", "document": "Assembly", "object": "C2"}
+        asyncio.run(events.emit_event("object_created", event))
+        result = asyncio.run(provider.get_resource("cad://constraints/assembly/Part0"))
+        assert [c["name"] for c in result["constraints"]] == [
+            "Constraint0",
+            "Constraint2",
+        ]
+        assert provider.get_version("cad://constraints/graph") != version
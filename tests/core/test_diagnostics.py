@@ -0,0 +1,76 @@
+"""
+Tests for performance monitoring metrics.
+"""
+
+import pytest
+
+from src.mcp_freecad.core.diagnostics import (
+    LogHistogram,
+    Metric,
+    PerformanceMonitor,
+    RateWindow,
+)
+
+
+class TestLogHistogram:
+    """Test the log-bucketed histogram."""
+
+    def test_percentiles_within_precision(self):
+        """Test that percentiles stay within the configured relative error."""
+        histogram = LogHistogram(precision=0.01)
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)
+
+        assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.01)
+        assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.01)
+        assert histogram.percentile(1.0) == pytest.approx(1.0, rel=0.01)
+
+    def test_cumulative_counts(self):
+        """Test cumulative counts against bucket boundaries."""
+        histogram = LogHistogram()
+        for value in (0.001, 0.01, 0.1, 1.0):
+            histogram.record(value)
+
+        assert histogram.cumulative_counts([0.005, 0.05, 0.5, 5.0]) == [1, 2, 3, 4]
+
+
+class TestRateWindow:
+    """Test the sliding-window rate counter."""
+
+    def test_rates_over_windows(self):
+        """Test that old events fall out of shorter windows."""
+        window = RateWindow(span=900)
+        for second in range(0, 600):
+            window.mark(now=1000.0 + second)
+
+        now = 1000.0 + 599
+        assert window.rate(60, now=now) == pytest.approx(1.0)
+        assert window.rate(900, now=now) == pytest.approx(600 / 900)
+        assert window.rate(60, now=now + 120) == 0.0
+
+
+class TestMetric:
+    """Test bounded metric storage."""
+
+    def test_sample_buffer_is_bounded(self):
+        """Test that only the most recent samples are retained."""
+        metric = Metric(name="tool.export", buffer_size=10)
+        for i in range(1000):
+            metric.record_sample(i / 1000.0, success=True)
+
+        assert len(metric.samples) == 10
+        assert metric.total_samples == 1000
+        assert metric.recent_samples(3)[-1].duration == pytest.approx(0.999)
+        assert set(metric.percentiles()) == {"p50", "p90", "p99", "p99_9"}
+
+    def test_report_includes_percentiles_and_rates(self):
+        """Test that the diagnostics report exposes the new aggregates."""
+        monitor = PerformanceMonitor(sample_buffer_size=5)
+        for _ in range(20):
+            monitor.track("endpoint./health", 0.01)
+
+        report = monitor.get_diagnostics_report()
+        metric = report["metrics"]["endpoint./health"]
+        assert metric["percentiles"]["p99"] == pytest.approx(0.01, rel=0.01)
+        assert metric["rates"]["1m"] == pytest.approx(20 / 60)
+        assert len(report["recent_samples"]["endpoint./health"]) == 5
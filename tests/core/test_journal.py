@@ -0,0 +1,85 @@
+import asyncio
+
+from src.mcp_freecad.extractor.journal import ChangeJournal
+from src.mcp_freecad.resources.cad_model import CADModelResourceProvider
+
+from .test_snapshot import FakeApp, FakeDocument, FakeObject, StubEventProvider
+
+
+def record(journal, event_type, **event_data):
+    asyncio.run(journal.handle_event({"type": event_type, **event_data}))
+
+
+class TestChangeJournal:
+    def test_net_changes(self):
+        """Changes collapse to the net effect since the requested revision."""
+        journal = ChangeJournal()
+        record(journal, "object_created", document="Part", object="Box")
+        since = journal.revision
+        record(journal, "object_changed", document="Part", object="Box")
+        record(journal, "object_created", document="Part", object="Cyl")
+        record(journal, "object_changed", document="Part", object="Cyl")
+        record(journal, "object_created", document="Part", object="Tmp")
+        record(journal, "object_deleted", document="Part", object="Tmp")
+        record(journal, "command_executed", document="Part", command="Std_Undo")
+
+        changes = journal.changes("Part", since)
+        assert changes == {
+            "created": ["Cyl"],
+            "modified": ["Box"],
+            "deleted": [],
+            "commands": ["Std_Undo"],
+        }
+        assert journal.changes("Part", journal.revision)["modified"] == []
+
+    def test_revisions_are_monotonic(self):
+        """Revisions increase across documents and survive a close."""
+        journal = ChangeJournal()
+        record(journal, "object_created", document="A", object="Box")
+        record(journal, "object_created", document="B", object="Box")
+        assert journal.document_revision("A") == 1
+        assert journal.document_revision("B") == 2
+        record(journal, "document_closed", document="A")
+        assert journal.document_revision("A") == 3
+        assert journal.changes("A", 1) is None
+
+    def test_compaction(self):
+        """Past max_entries old history is dropped and old revisions need resync."""
+        journal = ChangeJournal(max_entries=10)
+        for i in range(11):
+            record(journal, "object_changed", document="Part", object=f"Obj{i}")
+        assert len(journal.documents["Part"].entries) == 5
+        assert journal.changes("Part", 0) is None
+        modified = journal.changes("Part", 6)["modified"]
+        assert modified == [f"Obj{i}" for i in range(6, 11)]
+
+
+class TestChangesResource:
+    def test_changes_resource(self):
+        """The changes resource returns records of changed objects only."""
+        doc = FakeDocument("Part", [FakeObject("Box0"), FakeObject("Box1")])
+        provider = CADModelResourceProvider(FakeApp([doc]))
+        events = StubEventProvider()
+        provider.attach_events(events)
+
+        doc.Objects[1].Length = 3.0
+        doc.Objects.append(FakeObject("Box2"))
+        for event_type, name in [
+            ("object_changed", "Box1"),
+            ("object_created", "Box2"),
+        ]:
+            event = {"type": event_type, "document": "Part", "object": name}
+            asyncio.run(events.emit_event(event_type, event))
+
+        uri = "cad://model/Part/changes?since=0&properties=Length"
+        changes = asyncio.run(provider.get_resource(uri))
+        assert changes["revision"] == 2
+        assert [obj["id"] for obj in changes["created"]] == ["Box2"]
+        assert changes["modified"][0]["properties"]["Length"]["value"] == 3.0
+        assert changes["deleted"] == []
+
+    def test_requires_events(self):
+        """Without an event source the journal cannot answer."""
+        provider = CADModelResourceProvider(FakeApp([FakeDocument("Part", [])]))
+        result = asyncio.run(provider.get_resource("cad://model/Part/changes"))
+        assert "error" in result
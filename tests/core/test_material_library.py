@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+from src.mcp_freecad.resources.material import MaterialResourceProvider
+from src.mcp_freecad.resources.material_library import MaterialLibrary
+
+STEEL = """; Steel card
+[FCMat]
+Name = Steel
+Description = Generic steel
+[Mechanical]
+Density = 7850 kg/m^3
+YoungsModulus = 200 GPa
+"""
+
+
+def write_material(directory, name, density="1000 kg/m^3", mtime_ns=None):
+    path = directory / f"{name}.FCMat"
+    path.write_text(f"[FCMat]\nName = {name}\n[Mechanical]\nDensity = {density}\n")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+class FakeApp:
+    def __init__(self, root):
+        self.root = root
+
+    def getResourceDir(self):
+        return str(self.root / "resources")
+
+    def getUserAppDataDir(self):
+        return str(self.root / "user")
+
+
+def create_library(tmp_path, parsed, index_path=None):
+    directory = tmp_path / "materials"
+    directory.mkdir(exist_ok=True)
+
+    def parse(path):
+        parsed.append(os.path.basename(path))
+        return MaterialResourceProvider._parse_material_file(None, path)
+
+    library = MaterialLibrary(
+        lambda: [str(directory)], parse, index_path=index_path, check_interval=0
+    )
+    return library, directory
+
+
+class TestMaterialLibrary:
+    def test_incremental_reload(self, tmp_path):
+        """Only new and modified files are parsed on reload."""
+        parsed = []
+        library, directory = create_library(tmp_path, parsed)
+        for i in range(5):
+            write_material(directory, f"Mat{i}")
+        assert len(library.load()) == 5
+        assert len(parsed) == 5
+
+        parsed.clear()
+        library.load()
+        assert parsed == []
+
+        write_material(directory, "User")
+        write_material(directory, "Mat0", density="2000 kg/m^3", mtime_ns=10**18)
+        materials = library.load()
+        assert sorted(parsed) == ["Mat0.FCMat", "User.FCMat"]
+        assert materials["Mat0"]["properties"]["Density"] == "2000 kg/m^3"
+
+    def test_removed_files(self, tmp_path):
+        """Deleted files disappear and bump the generation."""
+        library, directory = create_library(tmp_path, [])
+        path = write_material(directory, "Gone")
+        write_material(directory, "Kept")
+        library.load()
+        generation = library.generation
+        path.unlink()
+        assert list(library.load()) == ["Kept"]
+        assert library.generation == generation + 1
+
+    def test_persisted_index(self, tmp_path):
+        """A new library reuses the index written by a previous one."""
+        index_path = str(tmp_path / "index.json")
+        parsed = []
+        library, directory = create_library(tmp_path, parsed, index_path)
+        write_material(directory, "Steel")
+        library.load()
+
+        parsed.clear()
+        library, _ = create_library(tmp_path, parsed, index_path)
+        assert library.load()["Steel"]["name"] == "Steel"
+        assert parsed == []
+        assert library.get_stats()["index_loaded"]
+
+    def test_signature_tracks_files(self, tmp_path):
+        """The signature is the same across instances until a file changes."""
+        library, directory = create_library(tmp_path, [])
+        write_material(directory, "Steel", mtime_ns=1_000_000_000)
+        library.load()
+        other, _ = create_library(tmp_path, [])
+        other.load()
+        assert library.signature() == other.signature()
+
+        write_material(directory, "Steel", density="7900 kg/m^3")
+        other.load()
+        assert library.signature() != other.signature()
+
+
+class TestMaterialProvider:
+    def test_library_resources(self, tmp_path):
+        """The provider lists and describes materials from the library."""
+        user_dir = tmp_path / "user" / "Material"
+        user_dir.mkdir(parents=True)
+        (user_dir / "Steel.FCMat").write_text(STEEL)
+        provider = MaterialResourceProvider(FakeApp(tmp_path))
+
+        listing = asyncio.run(provider.get_resource("cad://materials"))
+        assert listing["count"] == 1
+        info = asyncio.run(provider.get_resource("cad://materials/info/Steel"))
+        assert info["properties"]["Density"] == "7850 kg/m^3"
+        version = provider.get_version("cad://materials")
+        assert version == f"materials:{provider.library.signature()}"
+        restarted = MaterialResourceProvider(FakeApp(tmp_path))
+        assert restarted.get_version("cad://materials") == version
+        assert (tmp_path / "user" / "mcp_material_index.json").exists()
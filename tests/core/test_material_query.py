@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.mcp_freecad.resources.material import MaterialResourceProvider
+from src.mcp_freecad.resources.material_query import MaterialTable, parse_quantity
+
+from .test_material_library import FakeApp
+
+CARDS = {
+    "CarbonSteel": ("Metal", "7850 kg/m^3", "210 GPa"),
+    "StainlessSteel": ("Metal", "8000 kg/m^3", "193 GPa"),
+    "ToolSteel": ("Metal", "7700 kg/m^3", "190000 MPa"),
+    "Aluminum": ("Metal", "2700 kg/m^3", "70 GPa"),
+    "PLA": ("Plastic", "1.24 g/cm^3", "3.5 GPa"),
+}
+
+
+def create_table():
+    materials = {}
+    for name, (parent, density, modulus) in CARDS.items():
+        materials[name] = {
+            "parent": parent,
+            "category": "Mechanical",
+            "quantities": {
+                "Density": parse_quantity(density),
+                "YoungsModulus": parse_quantity(modulus),
+            },
+        }
+    return MaterialTable(materials)
+
+
+class TestParseQuantity:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("7850 kg/m^3", 7850.0),
+            ("1.24 g/cm^3", 1240.0),
+            ("200 GPa", 2e11),
+            ("210000 MPa", 2.1e11),
+            ("50 W/m/K", 50.0),
+            ("12 µm/m/K", 1.2e-5),
+            ("0.3", 0.3),
+            ("20 °C", 293.15),
+        ],
+    )
+    def test_units(self, text, expected):
+        """Quantities are normalized to SI base units."""
+        assert parse_quantity(text) == pytest.approx(expected)
+
+    def test_not_a_quantity(self):
+        """Colors, names and unknown units are not quantities."""
+        assert parse_quantity("0.4, 0.4, 0.4") is None
+        assert parse_quantity("Steel") is None
+        assert parse_quantity("5 furlongs") is None
+
+
+class TestMaterialTable:
+    def test_range_filters(self):
+        """Ranges on several properties are intersected."""
+        table = create_table()
+        rows, _ = table.query(
+            {"Density": (None, 8000.0), "YoungsModulus": (190e9, None)}
+        )
+        names = [table.names[row] for row in rows]
+        assert names == ["CarbonSteel", "StainlessSteel", "ToolSteel"]
+
+    def test_sort_and_limit(self):
+        """Sorting walks the index and stops after the limit."""
+        table = create_table()
+        rows, truncated = table.query(
+            {}, parent="metal", sort="Density", descending=True, limit=2
+        )
+        assert [table.names[row] for row in rows] == ["StainlessSteel", "CarbonSteel"]
+        assert truncated
+        with pytest.raises(ValueError):
+            table.query({"Hardness": (1.0, None)})
+
+
+class TestMaterialQueryResource:
+    def test_query_resource(self, tmp_path):
+        """cad://materials/query filters with units and returns SI values."""
+        user_dir = tmp_path / "user" / "Material"
+        user_dir.mkdir(parents=True)
+        for name, (parent, density, modulus) in CARDS.items():
+            (user_dir / f"{name}.FCMat").write_text(
+                f"[General]\nName = {name}\nFather = {parent}\n"
+                f"[Mechanical]\nDensity = {density}\nYoungsModulus = {modulus}\n"
+            )
+        provider = MaterialResourceProvider(FakeApp(tmp_path))
+
+        uri = "cad://materials/query?Density.max=8000&YoungsModulus.min=195 GPa"
+        result = asyncio.run(provider.get_resource(uri, {"sort": "-YoungsModulus"}))
+        assert [m["name"] for m in result["materials"]] == ["CarbonSteel"]
+        assert result["materials"][0]["values"] == {
+            "Density": 7850.0,
+            "YoungsModulus": 210e9,
+        }
@@ -0,0 +1,57 @@
+"""
+Tests for the OpenMetrics exporter.
+"""
+
+from src.mcp_freecad.core.cache import ResourceCache
+from src.mcp_freecad.core.diagnostics import PerformanceMonitor
+from src.mcp_freecad.core.metrics_exporter import OpenMetricsExporter
+
+
+def _exporter():
+    monitor = PerformanceMonitor()
+    cache = ResourceCache()
+    return monitor, cache, OpenMetricsExporter(monitor, cache)
+
+
+class TestOpenMetricsExporter:
+    """Test rendering of the exposition format."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that latency histograms render cumulative buckets."""
+        monitor, _, exporter = _exporter()
+        exporter.buckets = [0.01, 0.1, 1.0]
+        monitor.track("tool.export", 0.005)
+        monitor.track("tool.export", 0.05)
+        monitor.track("tool.export", 2.0, success=False, error="timeout")
+
+        text = exporter.render()
+        bucket = 'mcp_operation_duration_seconds_bucket{metric="tool.export",'
+        assert bucket + 'le="0.01"} 1' in text
+        assert bucket + 'le="1.0"} 2' in text
+        assert bucket + 'le="+Inf"} 3' in text
+        assert 'mcp_operation_errors_total{metric="tool.export"} 1' in text
+        assert text.endswith("# EOF\n")
+
+    def test_cache_and_registered_sources(self):
+        """Test cache statistics and extra sources are exported."""
+        _, cache, exporter = _exporter()
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("missing")
+        exporter.register_source(
+            "ai_provider:claude",
+            lambda: {"total_requests": 4, "model": "ignored"},
+            labels={"provider": "claude"},
+        )
+
+        text = exporter.render()
+        assert "mcp_cache_hits_total 1" in text
+        assert "mcp_cache_hit_ratio 0.5" in text
+        assert 'mcp_ai_provider_total_requests{provider="claude"} 4' in text
+        assert "model" not in text
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes in metric names do not break the output."""
+        monitor, _, exporter = _exporter()
+        monitor.track('endpoint./weird"path', 0.01)
+        assert 'metric="endpoint./weird\\"path"' in exporter.render()
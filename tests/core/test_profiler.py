@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from src.mcp_freecad.core.profiler import Profiler
+from src.mcp_freecad.core.server import MCPServer
+
+AUTH = {"Authorization": "Bearer development"}
+
+
+def busy(seconds: float) -> None:
+    end = time.time() + seconds
+    while time.time() < end:
+        sum(range(100))
+
+
+class TestProfiler:
+    def test_cprofile_stops_after_tool_calls(self):
+        """A cProfile session ends after the requested number of tool calls."""
+        profiler = Profiler()
+        profiler.start(mode="cprofile", tool_calls=2)
+        busy(0.01)
+        profiler.tool_call_finished()
+        assert profiler.status()["status"] == "running"
+        profiler.tool_call_finished()
+
+        result = profiler.result()
+        assert result["status"] == "finished"
+        assert result["tool_calls"] == 2
+        assert "busy" in result["data"]
+
+    def test_sampling_collapsed_stacks(self):
+        """Sampling collects collapsed stacks of other threads until the deadline."""
+        profiler = Profiler()
+        profiler.start(mode="sampling", duration=0.2, interval=0.001)
+        busy(0.3)
+
+        result = profiler.result(fmt="collapsed")
+        assert result["samples"] > 0
+        assert "busy (test_profiler.py" in result["data"]
+        stack, count = result["data"].splitlines()[0].rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) > 0
+
+    def test_counted_decorator(self):
+        """Decorated tools count toward the session limit even when they fail."""
+        profiler = Profiler()
+
+        @profiler.counted
+        async def tool():
+            raise ValueError("boom")
+
+        profiler.start(mode="sampling", tool_calls=1)
+        try:
+            asyncio.run(tool())
+        except ValueError:
+            pass
+        assert profiler.status()["status"] == "finished"
+
+    def test_invalid_requests(self):
+        """Unknown modes, missing limits and concurrent sessions are rejected."""
+        profiler = Profiler()
+        assert profiler.start(mode="perf", duration=1)["status"] == "error"
+        assert profiler.start(mode="cprofile")["status"] == "error"
+        profiler.start(mode="cprofile", tool_calls=1)
+        assert profiler.start(mode="cprofile", tool_calls=1)["status"] == "error"
+        assert profiler.result(fmt="pstats")["status"] == "error"
+        profiler.stop()
+        assert profiler.result(fmt="collapsed")["status"] == "error"
+
+
+class TestProfileEndpoints:
+    def test_profile_next_tool_call(self):
+        """The diagnostics API profiles the server for the next tool call."""
+
+        class SlowTool:
+            async def execute_tool(self, tool_id, params):
+                busy(0.01)
+                return {"status": "success"}
+
+        server = MCPServer("nonexistent_config.json")
+        server.register_tool("slow", SlowTool())
+        client = TestClient(server.app)
+
+        started = client.post(
+            "/diagnostics/profile/start", json={"tool_calls": 1}, headers=AUTH
+        )
+        assert started.json()["status"] == "running"
+        assert client.get("/diagnostics/profile", headers=AUTH).json()["status"] == (
+            "running"
+        )
+
+        client.post("/tools/slow/execute", json={"params": {}}, headers=AUTH)
+
+        result = client.get("/diagnostics/profile", headers=AUTH).json()
+        assert result["status"] == "finished"
+        assert result["format"] == "pstats"
+
+    def test_invalid_mode_is_rejected(self):
+        """Bad profiling requests return 400."""
+        client = TestClient(MCPServer("nonexistent_config.json").app)
+        response = client.post(
+            "/diagnostics/profile/start",
+            json={"mode": "perf", "duration": 1},
+            headers=AUTH,
+        )
+        assert response.status_code == 400
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from src.mcp_freecad.core.rate_limit import RateLimiter, TokenBucket
+from src.mcp_freecad.core.server import MCPServer
+
+AUTH = {"Authorization": "Bearer development"}
+
+
+class TestTokenBucket:
+    def test_reserve_within_burst(self):
+        """Requests inside the burst are admitted without waiting."""
+        bucket = TokenBucket(rate=1.0, capacity=3.0)
+        assert [bucket.reserve(1.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve(1.0) is None
+
+    def test_reserve_reports_wait(self):
+        """Queued reservations return the time until tokens are available."""
+        bucket = TokenBucket(rate=10.0, capacity=1.0)
+        assert bucket.reserve(1.0) == 0.0
+        wait = bucket.reserve(1.0, max_wait=1.0)
+        assert 0.05 < wait <= 0.1
+        assert bucket.retry_after(1.0) > 0.1
+
+
+class TestRateLimiter:
+    def test_costs_use_longest_match(self):
+        """The most specific cost key that occurs in the path applies."""
+        limiter = RateLimiter({"costs": {"export": 5, "export_stl": 8, "ping": 0.1}})
+        assert limiter.cost_for("/tools/export_stl/execute") == 8
+        assert limiter.cost_for("/tools/export_step/execute") == 5
+        assert limiter.cost_for("/tools/ping/execute") == 0.1
+        assert limiter.cost_for("/resources/cad_model") == 1.0
+
+    def test_reject_policy(self):
+        """With the reject policy an exhausted key is refused with a retry hint."""
+        limiter = RateLimiter({"rate": 1.0, "burst": 1.0, "policy": "reject"})
+        first = asyncio.run(limiter.admit("key", "/tools/box/execute"))
+        second = asyncio.run(limiter.admit("key", "/tools/box/execute"))
+        assert first.admitted
+        assert not second.admitted
+        assert 0 < second.retry_after <= 1.0
+        assert limiter.get_stats()["rejected"] == 1
+
+    def test_queue_policy_waits(self):
+        """With the queue policy requests wait for tokens instead of failing."""
+        limiter = RateLimiter(
+            {"rate": 50.0, "burst": 1.0, "policy": "queue", "max_queue_wait": 1.0}
+        )
+        asyncio.run(limiter.admit("key", "/x"))
+        decision = asyncio.run(limiter.admit("key", "/x"))
+        assert decision.admitted
+        assert decision.waited > 0
+        assert limiter.get_stats()["queued"] == 1
+
+    def test_keys_are_isolated(self):
+        """One key running out of tokens does not affect another."""
+        limiter = RateLimiter({"rate": 1.0, "burst": 1.0, "policy": "reject"})
+        asyncio.run(limiter.admit("a", "/x"))
+        assert not asyncio.run(limiter.admit("a", "/x")).admitted
+        assert asyncio.run(limiter.admit("b", "/x")).admitted
+
+
+class TestServerRateLimit:
+    def test_rejected_requests_get_429(self, tmp_path):
+        """The server answers 429 with Retry-After; health checks are exempt."""
+        config = {
+            "auth": {
+                "api_key": "development",
+                "rate_limit": {
+                    "enabled": True,
+                    "rate": 0.5,
+                    "burst": 2,
+                    "policy": "reject",
+                    "costs": {"diagnostics": 2},
+                },
+            }
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config))
+        client = TestClient(MCPServer(str(config_path)).app)
+
+        assert client.get("/diagnostics", headers=AUTH).status_code == 200
+        response = client.get("/diagnostics", headers=AUTH)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert client.get("/health").status_code == 200
+        assert client.get("/metrics").status_code == 200
+
+    def test_public_paths_are_configurable(self, tmp_path):
+        """Metrics need a key once they are removed from the public paths."""
+        config = {"auth": {"api_key": "development", "public_paths": ["/health"]}}
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config))
+        server = MCPServer(str(config_path))
+
+        assert server.auth_manager.is_public("/health/detailed")
+        assert not server.auth_manager.is_public("/metrics")
+        assert TestClient(server.app).get("/metrics", headers=AUTH).status_code == 200
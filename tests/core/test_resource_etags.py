@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.mcp_freecad.api.resources import create_resource_router
+from src.mcp_freecad.core.server import MCPServer
+from src.mcp_freecad.resources.cad_model import CADModelResourceProvider
+
+from .test_snapshot import FakeApp, FakeDocument, FakeObject, StubEventProvider
+
+PARAMS = {"uri": "cad://model/current/objects"}
+
+
+def create_client(provider):
+    server = MCPServer("nonexistent_config.json")
+    server.register_resource("cad_model", provider)
+    app = FastAPI()
+    app.include_router(create_resource_router(server))
+    return TestClient(app)
+
+
+class TestResourceETags:
+    def test_content_hash_etag(self):
+        """Without a version the ETag hashes the body and changes with it."""
+        doc = FakeDocument("Part", [FakeObject("Box")])
+        client = create_client(CADModelResourceProvider(FakeApp([doc])))
+
+        response = client.get("/resources/cad_model", params=PARAMS)
+        etag = response.headers["ETag"]
+        headers = {"If-None-Match": etag}
+        response = client.get("/resources/cad_model", params=PARAMS, headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+
+        doc.Objects[0].Length = 2.0
+        response = client.get("/resources/cad_model", params=PARAMS, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_revision_etag_skips_read(self):
+        """With events attached a matching request is answered without a read."""
+        doc = FakeDocument("Part", [FakeObject("Box")])
+        provider = CADModelResourceProvider(FakeApp([doc]))
+        events = StubEventProvider()
+        provider.attach_events(events)
+        client = create_client(provider)
+
+        reads = []
+        get_resource = provider.get_resource
+
+        async def counting_get_resource(uri, params=None):
+            reads.append(uri)
+            return await get_resource(uri, params)
+
+        provider.get_resource = counting_get_resource
+
+        etag = client.get("/resources/cad_model", params=PARAMS).headers["ETag"]
+        headers = {"If-None-Match": f'W/{etag}, "other"'}
+        response = client.get("/resources/cad_model", params=PARAMS, headers=headers)
+        assert response.status_code == 304
+        assert len(reads) == 1
+
+        event = {"type": "object_changed", "document": "Part", "object": "Box"}
+        asyncio.run(events.emit_event("object_changed", event))
+        response = client.get("/resources/cad_model", params=PARAMS, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_revision_etag_differs_across_runs(self):
+        """A restarted provider does not reproduce the ETag of an earlier run."""
+        doc = FakeDocument("Part", [FakeObject("Box")])
+        etags = []
+        for _ in range(2):
+            provider = CADModelResourceProvider(FakeApp([doc]))
+            provider.attach_events(StubEventProvider())
+            response = create_client(provider).get(
+                "/resources/cad_model", params=PARAMS
+            )
+            etags.append(response.headers["ETag"])
+        assert etags[0] != etags[1]
+
+        headers = {"If-None-Match": etags[0]}
+        response = create_client(provider).get(
+            "/resources/cad_model", params=PARAMS, headers=headers
+        )
+        assert response.status_code == 200
@@ -0,0 +1,98 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.mcp_freecad.core.serialization import (
+    CompressionMiddleware,
+    FastJSONResponse,
+    dumps,
+    encode_default,
+)
+
+
+class Vector:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class Rotation:
+    Q = (0.0, 0.0, 0.0, 1.0)
+    Axis = Vector(0.0, 0.0, 1.0)
+
+
+class Placement:
+    def __init__(self):
+        self.Base = Vector(1.0, 2.0, 3.0)
+        self.Rotation = Rotation()
+
+
+class TestEncoders:
+    def test_freecad_values(self):
+        """Vectors, rotations and placements are converted by duck typing."""
+        assert encode_default(Vector(1.0, 2.0, 3.0)) == {"x": 1.0, "y": 2.0, "z": 3.0}
+        assert encode_default(Rotation()) == [0.0, 0.0, 0.0, 1.0]
+        assert encode_default(Placement()) == {
+            "base": {"x": 1.0, "y": 2.0, "z": 3.0},
+            "rotation": [0.0, 0.0, 0.0, 1.0],
+        }
+
+    def test_unknown_type_raises(self):
+        """Unsupported values raise TypeError like the standard encoder."""
+        with pytest.raises(TypeError):
+            encode_default(object())
+
+    def test_dumps_round_trip(self):
+        """Encoded output parses back to the same structure."""
+        content = {"objects": [{"id": "Box", "center": Vector(0.0, 1.0, 2.0)}]}
+        assert json.loads(dumps(content)) == {
+            "objects": [{"id": "Box", "center": {"x": 0.0, "y": 1.0, "z": 2.0}}]
+        }
+
+
+def create_client(minimum_size: int = 100) -> TestClient:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    async def large():
+        return FastJSONResponse({"data": ["x" * 10] * 100})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    def test_large_responses_are_gzipped(self):
+        """Bodies above the threshold are compressed when gzip is accepted."""
+        client = create_client()
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == {"data": ["x" * 10] * 100}
+        assert int(response.headers["content-length"]) < len(dumps(response.json()))
+
+    def test_small_responses_are_not_compressed(self):
+        """Bodies below the threshold are sent as is."""
+        client = create_client()
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_no_accept_encoding(self):
+        """Clients that do not accept compression get plain bodies."""
+        client = create_client()
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+    def test_gzip_body_is_valid(self):
+        """The compressed payload decompresses to the original JSON."""
+        middleware = CompressionMiddleware(app=None)
+        body = dumps({"a": list(range(100))})
+        assert gzip.decompress(middleware.compress(body, "gzip")) == body
@@ -0,0 +1,127 @@
+import asyncio
+
+from src.mcp_freecad.resources.constraint import ConstraintResourceProvider
+from src.mcp_freecad.resources.sketch_analysis import GEO_UNDEF, analyze_sketch
+
+from .test_snapshot import FakeApp, FakeDocument, StubEventProvider
+
+
+class FakeGeometry:
+    def __init__(self, type_id="Part::GeomLineSegment"):
+        self.TypeId = type_id
+
+
+class FakeSketchConstraint:
+    def __init__(
+        self,
+        constraint_type,
+        first,
+        first_pos=0,
+        second=GEO_UNDEF,
+        second_pos=0,
+        value=0.0,
+    ):
+        self.Type = constraint_type
+        self.First = first
+        self.FirstPos = first_pos
+        self.Second = second
+        self.SecondPos = second_pos
+        self.Third = GEO_UNDEF
+        self.ThirdPos = 0
+        self.Value = value
+        self.Driving = True
+        self.IsActive = True
+
+
+class FakeSketch:
+    def __init__(self, name, constraints):
+        self.Name = name
+        self.Label = name
+        self.TypeId = "Sketcher::SketchObject"
+        self.Geometry = [FakeGeometry() for _ in range(4)]
+        self.Constraints = constraints
+        self.solves = 0
+
+    def solve(self):
+        self.solves += 1
+        return 0
+
+
+def rectangle(fixed=True):
+    """Four lines joined end to start, optionally fixed to the origin."""
+    constraints = [
+        FakeSketchConstraint("Coincident", i, 2, (i + 1) % 4, 1) for i in range(4)
+    ]
+    constraints += [
+        FakeSketchConstraint("Horizontal", 0),
+        FakeSketchConstraint("Horizontal", 2),
+        FakeSketchConstraint("Vertical", 1),
+        FakeSketchConstraint("Vertical", 3),
+    ]
+    if fixed:
+        constraints += [
+            FakeSketchConstraint("DistanceX", 0, value=10.0),
+            FakeSketchConstraint("DistanceY", 1, value=5.0),
+            FakeSketchConstraint("Coincident", 0, 1, -1, 1),
+        ]
+    return constraints
+
+
+class TestAnalyzeSketch:
+    def test_fully_constrained(self):
+        """A dimensioned rectangle at the origin has no freedoms left."""
+        analysis = analyze_sketch(FakeSketch("Sketch", rectangle()))
+        assert analysis["degrees_of_freedom"] == 0
+        assert analysis["fully_constrained"]
+        assert analysis["components"][0]["grounded"]
+        assert analysis["solver"]["status"] == "solved"
+
+    def test_components_and_freedoms(self):
+        """Unconnected geometry forms separate components."""
+        sketch = FakeSketch("Sketch", [FakeSketchConstraint("Coincident", 0, 2, 1, 1)])
+        analysis = analyze_sketch(sketch, solve=False)
+        assert [c["geometry"] for c in analysis["components"]] == [[0, 1], [2], [3]]
+        assert analysis["degrees_of_freedom"] == 14
+        assert not analysis["fully_constrained"]
+        assert analysis["solver"] is None
+
+    def test_redundant_and_conflicting(self):
+        """Repeated references are redundant, or conflicting with other values."""
+        constraints = rectangle() + [
+            FakeSketchConstraint("Horizontal", 0),
+            FakeSketchConstraint("DistanceX", 0, value=12.0),
+            FakeSketchConstraint("Coincident", 1, 1, 0, 2),
+        ]
+        analysis = analyze_sketch(FakeSketch("Sketch", constraints), solve=False)
+        assert analysis["redundant"] == [[0, 13], [4, 11]]
+        assert analysis["conflicting"] == [[8, 12]]
+        assert analysis["components"][0]["over_constrained"]
+
+
+class TestSketchAnalysisResource:
+    def test_cached_per_sketch(self):
+        """The solver runs again only when the sketch itself changes."""
+        sketch = FakeSketch("Sketch", rectangle(fixed=False))
+        other = FakeSketch("Other", [])
+        doc = FakeDocument("Part", [sketch, other])
+        provider = ConstraintResourceProvider(FakeApp([doc]))
+        events = StubEventProvider()
+        provider.attach_events(events)
+
+        uri = "cad://constraints/sketch/Sketch/analysis"
+        first = asyncio.run(provider.get_resource(uri))
+        assert first["degrees_of_freedom"] == 4
+        assert not first["cached"]
+        assert asyncio.run(provider.get_resource(uri))["cached"]
+
+        # A change to another object keeps the analysis
+        event = {"type": "object_changed", "document": "Part", "object": "Other"}
+        asyncio.run(events.emit_event("object_changed", event))
+        assert asyncio.run(provider.get_resource(uri))["cached"]
+        assert sketch.solves == 1
+
+        sketch.Constraints = rectangle()
+        asyncio.run(events.emit_event("object_changed", {**event, "object": "Sketch"}))
+        result = asyncio.run(provider.get_resource(uri))
+        assert result["fully_constrained"]
+        assert sketch.solves == 2
@@ -0,0 +1,298 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.mcp_freecad.api.resources import create_resource_router
+from src.mcp_freecad.core.server import MCPServer
+from src.mcp_freecad.events.document_events import DocumentEventProvider
+from src.mcp_freecad.extractor.snapshot import DocumentSnapshot
+from src.mcp_freecad.resources.cad_model import CADModelResourceProvider
+from tests.mocks.events import StubEventProvider
+
+
+class FakeObject:
+    def __init__(self, name, group=None):
+        self.Name = name
+        self.Label = name
+        self.TypeId = "Part::Feature"
+        self.Visibility = True
+        self.Length = 1.0
+        self.Group = group or []
+        self.PropertiesList = ["Length"]
+
+    def getTypeIdOfProperty(self, prop):
+        return "App::PropertyLength"
+
+
+class FakeDocument:
+    def __init__(self, name, objects):
+        self.Name = name
+        self.Label = name
+        self.FileName = f"/tmp/{name}.FCStd"
+        self.Modified = False
+        self.Objects = objects
+
+    def getObject(self, name):
+        for obj in self.Objects:
+            if obj.Name == name:
+                return obj
+        return None
+
+
+class FakeApp:
+    def __init__(self, docs):
+        self.docs = {doc.Name: doc for doc in docs}
+        self.ActiveDocument = docs[0] if docs else None
+
+    def getDocument(self, name):
+        return self.docs[name]
+
+
+def create_snapshot(object_count=3):
+    doc = FakeDocument("Part", [FakeObject(f"Box{i}") for i in range(object_count)])
+    app = FakeApp([doc])
+    provider = CADModelResourceProvider(app)
+    events = StubEventProvider()
+    provider.attach_events(events)
+    return provider, events, doc
+
+
+def emit(events, event_data):
+    asyncio.run(events.emit_event(event_data["type"], event_data))
+
+
+class TestDocumentSnapshot:
+    def test_extracts_once(self):
+        """Repeated reads of a live snapshot do not re-extract objects."""
+        provider, _, _ = create_snapshot()
+        first = asyncio.run(provider.get_resource("cad://model/current/objects"))
+        second = asyncio.run(provider.get_resource("cad://model/Part/objects"))
+        assert first == second
+        assert [obj["id"] for obj in first["objects"]] == ["Box0", "Box1", "Box2"]
+        stats = provider.snapshot.get_stats()
+        assert stats["full_extractions"] == 1
+        assert stats["object_extractions"] == 3
+
+    def test_changed_object_is_re_extracted(self):
+        """An object_changed event re-extracts only that object."""
+        provider, events, doc = create_snapshot()
+        asyncio.run(provider.get_resource("cad://model/current/objects"))
+        doc.Objects[1].Length = 5.0
+        emit(events, {"type": "object_changed", "document": "Part", "object": "Box1"})
+        objects = asyncio.run(provider.get_resource("cad://model/current/objects"))
+        assert objects["objects"][1]["properties"]["Length"]["value"] == 5.0
+        assert provider.snapshot.get_stats()["object_extractions"] == 4
+
+    def test_created_and_deleted_objects(self):
+        """Structure events add and remove objects and refresh the tree."""
+        provider, events, doc = create_snapshot()
+        asyncio.run(provider.get_resource("cad://model/current/tree"))
+        del doc.Objects[0]
+        doc.Objects.append(FakeObject("Group", group=[doc.Objects[0]]))
+        emit(events, {"type": "object_deleted", "document": "Part", "object": "Box0"})
+        emit(events, {"type": "object_created", "document": "Part", "object": "Group"})
+        tree = asyncio.run(provider.get_resource("cad://model/current/tree"))
+        assert tree["hierarchy"]["root"] == ["Box2", "Group"]
+        assert provider.snapshot.get_stats()["object_extractions"] == 4
+
+    def test_not_live_re_extracts(self):
+        """Without an event source every read extracts the document again."""
+        doc = FakeDocument("Part", [FakeObject("Box")])
+        snapshot = DocumentSnapshot(CADModelResourceProvider(FakeApp([doc])).extractor)
+        snapshot.objects("Part")
+        doc.Objects[0].Length = 2.0
+        objects = snapshot.objects("Part")
+        assert objects[0]["properties"]["Length"]["value"] == 2.0
+        assert snapshot.get_stats()["full_extractions"] == 2
+
+    def test_property_projection(self):
+        """The properties parameter limits the returned properties."""
+        provider, _, _ = create_snapshot()
+        uri = "cad://model/current/objects?properties=Label"
+        objects = asyncio.run(provider.get_resource(uri))["objects"]
+        assert all(obj["properties"] == {} for obj in objects)
+        result = asyncio.run(provider.get_resource("cad://model/current/objects"))
+        assert "Length" in result["objects"][0]["properties"]
+
+    def test_named_document_info(self):
+        """Named documents return header info, unknown ones an error."""
+        provider, _, _ = create_snapshot()
+        result = asyncio.run(provider.get_resource("cad://model/Part"))
+        assert result["document"]["objects_count"] == 3
+        missing = asyncio.run(provider.get_resource("cad://model/Missing"))
+        assert missing == {"error": "Document not found: Missing"}
+
+    def test_header_and_selection_skip_extraction(self):
+        """Without events, header and selection reads extract no objects."""
+        doc = FakeDocument("Part", [FakeObject(f"Box{i}") for i in range(3)])
+        provider = CADModelResourceProvider(FakeApp([doc]))
+        provider.extractor._extract_selection_context = lambda: []
+
+        header = asyncio.run(provider.get_resource("cad://model/Part"))
+        assert header["document"]["file"] == "/tmp/Part.FCStd"
+        selection = asyncio.run(provider.get_resource("cad://model/Part/selection"))
+        assert selection == {"selection": []}
+        assert provider.snapshot.stats["full_extractions"] == 0
+
+    def test_server_attaches_document_events(self):
+        """Providers registered before and after the events are attached."""
+        server = MCPServer("nonexistent_config.json")
+        before = CADModelResourceProvider(FakeApp([FakeDocument("Part", [])]))
+        server.register_resource("cad_model", before)
+        server.register_event_handler("document", StubEventProvider())
+        after = CADModelResourceProvider(FakeApp([FakeDocument("Part", [])]))
+        server.register_resource("cad_model_2", after)
+        assert before.snapshot.live and after.snapshot.live
+
+
+class RecordingRouter:
+    def __init__(self):
+        self.events = []
+
+    async def broadcast_event(self, event_type, event_data):
+        self.events.append(event_type)
+
+
+class TestDocumentEvents:
+    def test_property_changes_stay_in_process(self):
+        """object_changed reaches subscribers but is not broadcast to clients."""
+        router = RecordingRouter()
+        events = DocumentEventProvider(FakeApp([]), event_router=router)
+        received = []
+
+        async def subscriber(event_data):
+            received.append(event_data["type"])
+
+        events.add_subscriber(subscriber)
+        emit(events, {"type": "object_changed", "document": "Part", "object": "Box"})
+        emit(events, {"type": "document_changed", "document": "Part"})
+        assert received == ["object_changed", "document_changed"]
+        assert router.events == ["document_changed"]
+
+    def test_callback_without_running_loop(self):
+        """A FreeCAD callback from another thread is posted to the server loop."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        received = threading.Event()
+
+        async def create():
+            return DocumentEventProvider(FakeApp([]), event_router=RecordingRouter())
+
+        async def subscriber(event_data):
+            assert event_data["object"] == "Box"
+            received.set()
+
+        try:
+            events = asyncio.run_coroutine_threadsafe(create(), loop).result(5)
+            events.add_subscriber(subscriber)
+            box = FakeObject("Box")
+            box.Document = FakeDocument("Part", [])
+            # Called from this thread, where no event loop is running
+            events._on_object_event("object_deleted", box)
+            assert received.wait(5)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+
+def create_tree_provider():
+    """Body -> (Sketch, Pad -> (Fillet,)), plus a loose Box."""
+    fillet = FakeObject("Fillet")
+    pad = FakeObject("Pad", group=[fillet])
+    sketch = FakeObject("Sketch")
+    body = FakeObject("Body", group=[sketch, pad])
+    doc = FakeDocument("Part", [body, sketch, pad, fillet, FakeObject("Box")])
+    return CADModelResourceProvider(FakeApp([doc]))
+
+
+class TestObjectHierarchy:
+    def test_roots_and_children(self):
+        """Only objects without a parent are roots; children keep group order."""
+        provider = create_tree_provider()
+        tree = asyncio.run(provider.get_resource("cad://model/current/tree"))
+        hierarchy = tree["hierarchy"]
+        assert hierarchy["root"] == ["Body", "Box"]
+        assert hierarchy["objects"]["Body"]["children"] == ["Sketch", "Pad"]
+        assert len(hierarchy["objects"]) == 5
+
+    def test_subtree_depth(self):
+        """root and depth limit the tree; boundary objects keep child names."""
+        provider = create_tree_provider()
+        uri = "cad://model/Part/tree?root=Body&depth=1"
+        hierarchy = asyncio.run(provider.get_resource(uri))["hierarchy"]
+        assert hierarchy["root"] == ["Body"]
+        assert list(hierarchy["objects"]) == ["Body", "Sketch", "Pad"]
+        assert hierarchy["objects"]["Pad"]["children"] == ["Fillet"]
+
+        uri = "cad://model/Part/tree?depth=0"
+        hierarchy = asyncio.run(provider.get_resource(uri))["hierarchy"]
+        assert list(hierarchy["objects"]) == ["Body", "Box"]
+
+    def test_subtree_errors(self):
+        """Unknown roots return an error and invalid depths raise."""
+        provider = create_tree_provider()
+        uri = "cad://model/Part/tree?root=Missing"
+        result = asyncio.run(provider.get_resource(uri))
+        assert result["hierarchy"] == {"error": "Object not found: Missing"}
+        with pytest.raises(ValueError):
+            asyncio.run(provider.get_resource("cad://model/Part/tree?depth=-1"))
+
+
+def create_paging_client():
+    objects = [FakeObject(f"Box{i}") for i in range(5)]
+    objects[1].TypeId = objects[3].TypeId = "Sketcher::SketchObject"
+    provider = CADModelResourceProvider(FakeApp([FakeDocument("Part", objects)]))
+    server = MCPServer("nonexistent_config.json")
+    server.register_resource("cad_model", provider)
+    app = FastAPI()
+    app.include_router(create_resource_router(server))
+    return TestClient(app)
+
+
+OBJECTS_URI = "cad://model/current/objects"
+OBJECTS_URL = f"/resources/cad_model?uri={OBJECTS_URI}"
+
+
+class TestObjectPaging:
+    def test_pages_follow_cursor(self):
+        """Following next_cursor visits every object exactly once."""
+        client = create_paging_client()
+        ids, cursor = [], None
+        while True:
+            params = {"uri": OBJECTS_URI, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/resources/cad_model", params=params).json()
+            ids.extend(obj["id"] for obj in page["objects"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert ids == [f"Box{i}" for i in range(5)]
+
+    def test_fields_and_type_filter(self):
+        """Fields project object records and type filters them."""
+        client = create_paging_client()
+        params = {
+            "uri": OBJECTS_URI,
+            "type": "Sketcher::SketchObject",
+            "fields": "label",
+        }
+        page = client.get("/resources/cad_model", params=params).json()
+        assert page == {
+            "objects": [
+                {"id": "Box1", "label": "Box1"},
+                {"id": "Box3", "label": "Box3"},
+            ]
+        }
+
+    def test_invalid_parameters(self):
+        """Bad limits and cursors are rejected as client errors."""
+        client = create_paging_client()
+        assert client.get(OBJECTS_URL + "&limit=0").status_code == 422
+        response = client.get(OBJECTS_URL + "&cursor=bogus")
+        assert response.status_code == 400
@@ -0,0 +1,169 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from src.mcp_freecad.client.freecad_connection_manager import FreeCADConnection
+from src.mcp_freecad.core import tracing
+from src.mcp_freecad.core.tracing import (
+    JsonlSpanExporter,
+    OTLPJsonSpanExporter,
+    Tracer,
+    traced,
+)
+
+
+class ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Install an in-memory exporter on the process-wide tracer."""
+    collected = ListExporter()
+    monkeypatch.setattr(tracing, "_tracer", Tracer(collected, sample_rate=1.0))
+    return collected
+
+
+class TestTracer:
+    def test_nested_spans_share_trace(self):
+        """Child spans are linked to their parent and exported with the root."""
+        collected = ListExporter()
+        tracer = Tracer(collected)
+
+        with tracer.span("tool") as root:
+            with tracer.span("round_trip") as child:
+                pass
+
+        assert len(collected.traces) == 1
+        spans = collected.traces[0]
+        assert [s.name for s in spans] == ["tool", "round_trip"]
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+
+    def test_unsampled_traces_are_not_exported(self):
+        """A sample rate of zero records nothing and propagates no context."""
+        collected = ListExporter()
+        tracer = Tracer(collected, sample_rate=0.0)
+
+        with tracer.span("tool"):
+            assert tracer.inject() is None
+
+        assert collected.traces == []
+
+    def test_errors_mark_span(self):
+        """Exceptions are recorded on the span and re-raised."""
+        collected = ListExporter()
+        tracer = Tracer(collected)
+
+        with pytest.raises(ValueError):
+            with tracer.span("tool"):
+                raise ValueError("boom")
+
+        span = collected.traces[0][0]
+        assert span.status == "error"
+        assert span.attributes["error"] == "boom"
+
+    def test_remote_timings_become_child_spans(self):
+        """Timings from FreeCAD are placed under the current span."""
+        collected = ListExporter()
+        tracer = Tracer(collected)
+
+        with tracer.span("round_trip") as parent:
+            tracer.record_remote_timings(
+                [{"name": "exec", "offset": 0.01, "duration": 0.02}],
+                origin=parent.start_time,
+            )
+
+        remote = [s for s in collected.traces[0] if s.name == "freecad.exec"][0]
+        assert remote.parent_id == parent.span_id
+        assert remote.duration == pytest.approx(0.02)
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator(self, exporter):
+        """The decorator wraps async tools in a span named after them."""
+
+        @traced()
+        async def freecad_create_box():
+            return "ok"
+
+        assert await freecad_create_box() == "ok"
+        assert exporter.traces[0][0].name == "freecad_create_box"
+
+
+class TestExporters:
+    def test_jsonl_exporter(self, tmp_path):
+        """Spans are appended one JSON object per line."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer(JsonlSpanExporter(str(path)))
+
+        with tracer.span("tool", tool="box"):
+            with tracer.span("round_trip"):
+                pass
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["tool", "round_trip"]
+        assert lines[0]["attributes"] == {"tool": "box"}
+
+    def test_otlp_encoding(self):
+        """Spans are encoded in the OTLP/JSON layout with hex IDs."""
+        collected = ListExporter()
+        tracer = Tracer(collected)
+        with tracer.span("tool"):
+            with tracer.span("round_trip"):
+                pass
+
+        payload = OTLPJsonSpanExporter().encode(collected.traces[0])
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len(spans[0]["traceId"]) == 32
+        assert len(spans[0]["spanId"]) == 16
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+
+
+class TestPropagation:
+    def test_connection_sends_context_and_records_timings(self, exporter):
+        """The socket client propagates the trace and records FreeCAD timings."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        received = {}
+
+        def serve():
+            conn, _ = listener.accept()
+            data = b""
+            while not data.endswith(b"\n"):
+                data += conn.recv(4096)
+            received.update(json.loads(data))
+            response = {
+                "success": True,
+                "timings": [{"name": "exec", "offset": 0.0, "duration": 0.001}],
+            }
+            conn.sendall(json.dumps(response).encode() + b"\n")
+            conn.close()
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+
+        connection = FreeCADConnection(
+            host="127.0.0.1", port=listener.getsockname()[1], auto_connect=False
+        )
+        connection.connection_type = FreeCADConnection.CONNECTION_SERVER
+        connection.is_connected = lambda: True
+
+        with tracing.get_tracer().span("freecad_create_box") as root:
+            response = connection.execute_command("execute_script", {"script": ""})
+
+        thread.join(timeout=5)
+        listener.close()
+
+        assert response == {"success": True}
+        assert received["trace"]["trace_id"] == root.trace_id
+        names = [s.name for s in exporter.traces[0]]
+        assert "connection.round_trip" in names
+        assert "connection.parse_response" in names
+        assert "freecad.exec" in names
@@ -4,6 +4,7 @@ Pytest fixtures for MCP-FreeCAD testing.
 This module provides common fixtures and utilities for testing the MCP-FreeCAD addon.
 """
 
+import os
 import sys
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
@@ -35,6 +36,14 @@ def mock_freecad_modules(mock_freecad, mock_part):
         yield mock_freecad, mock_part
 
 
+@pytest.fixture
+def part_module(monkeypatch):
+    """Make the Part stand-in in mocks/modules importable by spawned processes."""
+    modules_dir = os.path.join(os.path.dirname(__file__), "mocks", "modules")
+    monkeypatch.syspath_prepend(os.path.abspath(modules_dir))
+    monkeypatch.delitem(sys.modules, "Part", raising=False)
+
+
 @pytest.fixture
 def primitive_tool_provider(mock_freecad):
     """Provide a PrimitiveToolProvider with mocked FreeCAD."""
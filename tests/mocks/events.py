@@ -0,0 +1,12 @@
+"""
+Event provider for feeding document events to subscribers in tests.
+"""
+
+from src.mcp_freecad.events.base import EventProvider
+
+
+class StubEventProvider(EventProvider):
+    """Event provider that hands emitted events straight to its subscribers."""
+
+    async def emit_event(self, event_type, event_data):
+        await self.notify_subscribers(event_data)
@@ -0,0 +1,34 @@
+"""
+Stand-in for FreeCAD's Part module, importable by spawned import processes.
+
+A shape file holds the names of its solids, one per line. A file naming an
+``error`` solid cannot be read, and a ``slow`` solid takes a while to read.
+"""
+
+import time
+
+
+class Shape:
+    def __init__(self, names=None):
+        self.names = list(names or [])
+
+    @property
+    def ShapeType(self):
+        return "Solid" if len(self.names) == 1 else "Compound"
+
+    def read(self, path):
+        with open(path) as f:
+            self.names = f.read().split()
+        if "error" in self.names:
+            raise RuntimeError("Unexpected end of file")
+        if "slow" in self.names:
+            time.sleep(5)
+
+    def childShapes(self):
+        return [Shape([name]) for name in self.names]
+
+    def exportBrep(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.names))
+
+    exportStep = exportIges = exportBrep
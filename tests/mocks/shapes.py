@@ -0,0 +1,139 @@
+"""
+Fake shapes, objects and documents for testing geometry tools without FreeCAD.
+"""
+
+import itertools
+
+_hash_codes = itertools.count(1)
+
+
+class FakeBoundBox:
+    def __init__(self, low, high):
+        self.XMin, self.YMin, self.ZMin = low
+        self.XMax, self.YMax, self.ZMax = high
+
+
+class FakeVector:
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class FakeMatrix:
+    def __init__(self, base):
+        x, y, z = base
+        self.A = (1, 0, 0, x, 0, 1, 0, y, 0, 0, 1, z, 0, 0, 0, 1)
+
+
+class FakePlacement:
+    def __init__(self, base):
+        self.base = tuple(base)
+
+    def toMatrix(self):
+        return FakeMatrix(self.base)
+
+    def __str__(self):
+        return f"Placement({self.base})"
+
+
+class FakeCommon:
+    def __init__(self, volume):
+        self.Volume = volume
+
+
+class FakeShape:
+    """Axis-aligned box shape whose exact distance is the box distance."""
+
+    def __init__(self, low, high):
+        self.low = list(low)
+        self.high = list(high)
+        self.distance_calls = 0
+        self.common_calls = 0
+        self.volume_calls = 0
+        self.ShapeType = "Solid"
+        self.Solids = [self]
+        self.Faces = [None] * 6
+        self.Edges = [None] * 12
+        self.Vertexes = [None] * 8
+        # OCC hashes the TShape pointer, which a new shape may reuse
+        self.hash_code = next(_hash_codes)
+
+    @property
+    def Placement(self):
+        return FakePlacement(self.low)
+
+    def hashCode(self):
+        return self.hash_code
+
+    def isSame(self, other):
+        return other is self
+
+    @property
+    def Volume(self):
+        self.volume_calls += 1
+        sizes = [self.high[i] - self.low[i] for i in range(3)]
+        return sizes[0] * sizes[1] * sizes[2]
+
+    @property
+    def CenterOfMass(self):
+        return FakeVector(*[(self.low[i] + self.high[i]) / 2 for i in range(3)])
+
+    def move(self, dx):
+        self.low[0] += dx
+        self.high[0] += dx
+
+    def common(self, other):
+        self.common_calls += 1
+        volume = 1.0
+        for i in range(3):
+            overlap = min(self.high[i], other.high[i]) - max(self.low[i], other.low[i])
+            volume *= max(overlap, 0.0)
+        return FakeCommon(volume)
+
+    @property
+    def BoundBox(self):
+        return FakeBoundBox(self.low, self.high)
+
+    def isNull(self):
+        return False
+
+    def distToShape(self, other):
+        self.distance_calls += 1
+        gaps = [
+            max(self.low[i] - other.high[i], other.low[i] - self.high[i], 0.0)
+            for i in range(3)
+        ]
+        return (sum(g * g for g in gaps) ** 0.5, [], [])
+
+
+class FakePart:
+    def __init__(self, name, shape):
+        self.Name = name
+        self.Label = name
+        self.Shape = shape
+
+
+class FakeDocument:
+    def __init__(self, objects):
+        self.Name = "Assembly"
+        self.Objects = objects
+
+    def getObject(self, name):
+        return next((obj for obj in self.Objects if obj.Name == name), None)
+
+
+class FakeApp:
+    def __init__(self, doc):
+        self.ActiveDocument = doc
+
+
+class MeshedShape(FakeShape):
+    """Box shape whose tessellation has more facets the finer the tolerance."""
+
+    def __init__(self, low, high):
+        super().__init__(low, high)
+        self.tessellate_calls = 0
+
+    def tessellate(self, tolerance):
+        self.tessellate_calls += 1
+        facets = int(12 / tolerance)
+        return [tuple(self.low)] * 8, [(0, 1, 2)] * facets
@@ -0,0 +1,147 @@
+"""
+Unit tests for parallel bulk export.
+"""
+
+import asyncio
+import os
+
+from src.mcp_freecad.tools.bulk_export import BulkExporter
+from src.mcp_freecad.tools.export_import import ExportImportToolProvider
+from tests.mocks.shapes import FakeApp, FakeDocument, FakePart, MeshedShape
+
+
+class ExactShape(MeshedShape):
+    """Shape that writes its exact formats as plain text."""
+
+    def exportStep(self, path):
+        with open(path, "w") as f:
+            f.write(f"STEP {self.low} {self.high}\n")
+
+    exportBrep = exportStep
+
+
+class NullShape(ExactShape):
+    """Shape of a feature that has not been recomputed."""
+
+    def isNull(self):
+        return True
+
+
+def parts(count):
+    return [
+        FakePart(f"Part{i}", ExactShape((i * 20, 0, 0), (i * 20 + 10, 10, 10)))
+        for i in range(count)
+    ]
+
+
+class TestBulkExport:
+    def test_manifest_in_process(self, tmp_path):
+        """With one worker each object is written to its own file, with timings."""
+        provider = ExportImportToolProvider(FakeApp(FakeDocument(parts(3))))
+        params = {"format": "stl", "output_dir": str(tmp_path), "workers": 1}
+        result = asyncio.run(provider.execute_tool("bulk_export", params))
+        assert result["status"] == "success"
+        assert result["workers"] == 1
+        assert result["file_count"] == 3
+        assert [entry["object"] for entry in result["files"]] == [
+            "Part0",
+            "Part1",
+            "Part2",
+        ]
+        entry = result["files"][1]
+        assert entry["path"] == str(tmp_path / "Part1.stl")
+        assert entry["triangles"] == 12
+        assert entry["bytes"] == os.path.getsize(entry["path"]) == 84 + 12 * 50
+        assert set(entry["timings"]) == {"tessellate", "write"}
+
+    def test_failures_reported_per_file(self, tmp_path):
+        """A failing object is listed with its error; the others are written."""
+        objects = parts(2)
+        objects[0].Shape = MeshedShape((0, 0, 0), (1, 1, 1))
+        manifest = asyncio.run(
+            BulkExporter(workers=1).export(objects, "step", str(tmp_path))
+        )
+        assert manifest["failed_count"] == 1
+        assert manifest["files"][0]["status"] == "error"
+        assert "exportStep" in manifest["files"][0]["message"]
+        assert (tmp_path / "Part1.step").read_text().startswith("STEP")
+
+    def test_worker_processes(self, tmp_path, part_module):
+        """Shapes are serialized to BREP once and exported by worker processes."""
+        exporter = BulkExporter(workers=2)
+        try:
+            manifest = asyncio.run(
+                exporter.export(parts(3), "step", str(tmp_path / "out"))
+            )
+        finally:
+            exporter.close()
+        assert manifest["workers"] == 2
+        assert manifest["file_count"] == 3
+        for entry in manifest["files"]:
+            assert entry["status"] == "success"
+            assert entry["worker"] != os.getpid()
+            assert os.path.getsize(entry["path"]) == entry["bytes"] > 0
+            assert set(entry["timings"]) == {"load", "write"}
+
+    def test_serialization_failure_is_per_file(self, tmp_path, part_module):
+        """A shape that cannot be written as BREP fails alone."""
+        objects = parts(3)
+        objects[1].Shape = MeshedShape((0, 0, 0), (1, 1, 1))
+        exporter = BulkExporter(workers=2)
+        try:
+            manifest = asyncio.run(exporter.export(objects, "step", str(tmp_path)))
+        finally:
+            exporter.close()
+        assert [entry["status"] for entry in manifest["files"]] == [
+            "success",
+            "error",
+            "success",
+        ]
+        assert "exportBrep" in manifest["files"][1]["message"]
+
+    def test_skips_null_shapes(self, tmp_path):
+        """Objects without a solid are left out of the export."""
+        objects = parts(2)
+        objects[0].Shape = NullShape((0, 0, 0), (1, 1, 1))
+        provider = ExportImportToolProvider(FakeApp(FakeDocument(objects)))
+        params = {"format": "step", "output_dir": str(tmp_path), "workers": 1}
+        result = asyncio.run(provider.execute_tool("bulk_export", params))
+        assert [entry["object"] for entry in result["files"]] == ["Part1"]
+
+    def test_broken_pool_is_replaced(self, tmp_path):
+        """Tasks of a pool whose worker died fail, and a new pool is started."""
+        exporter = BulkExporter(workers=2)
+        try:
+            asyncio.run(exporter.export(parts(2), "step", str(tmp_path / "a")))
+            for process in list(exporter._pool._processes.values()):
+                process.kill()
+                process.join()
+            manifest = asyncio.run(
+                exporter.export(parts(2), "step", str(tmp_path / "b"))
+            )
+            assert manifest["failed_count"] == 2
+            assert exporter._pool is None
+
+            manifest = asyncio.run(
+                exporter.export(parts(2), "step", str(tmp_path / "c"))
+            )
+            assert all("worker" in entry for entry in manifest["files"])
+        finally:
+            exporter.close()
+
+    def test_invalid_workers(self, tmp_path):
+        """A workers value that is not a positive integer is rejected."""
+        provider = ExportImportToolProvider(FakeApp(FakeDocument(parts(2))))
+        for workers in ("2", 0, 1.5):
+            params = {"format": "step", "output_dir": str(tmp_path), "workers": workers}
+            result = asyncio.run(provider.execute_tool("bulk_export", params))
+            assert result["status"] == "error"
+            assert "positive integer" in result["message"]
+
+    def test_unsupported_format(self, tmp_path):
+        """Formats that cannot be written per shape are rejected."""
+        provider = ExportImportToolProvider(FakeApp(FakeDocument(parts(1))))
+        params = {"format": "fcstd", "output_dir": str(tmp_path)}
+        result = asyncio.run(provider.execute_tool("bulk_export", params))
+        assert result["status"] == "error"
+        assert "step" in result["supported_formats"]
@@ -0,0 +1,133 @@
+"""
+Unit tests for background import jobs.
+"""
+
+import asyncio
+
+import pytest
+
+from src.mcp_freecad.tools.export_import import ExportImportToolProvider
+from src.mcp_freecad.tools.import_jobs import ImportJobManager
+from tests.mocks.shapes import FakeApp, FakeDocument, FakePart
+
+
+class ImportedObject(FakePart):
+    def __init__(self, name):
+        super().__init__(name, None)
+        self.recomputed = False
+
+    def recompute(self):
+        self.recomputed = True
+
+
+class ImportDocument(FakeDocument):
+    def __init__(self):
+        super().__init__([])
+        self.recomputed = False
+
+    def recompute(self):
+        self.recomputed = True
+
+    def addObject(self, type_name, name):
+        obj = ImportedObject(name)
+        self.Objects = self.Objects + [obj]
+        return obj
+
+    def removeObject(self, name):
+        self.Objects = [obj for obj in self.Objects if obj.Name != name]
+
+
+def step_file(tmp_path, *solids):
+    path = tmp_path / "large.step"
+    path.write_text("\n".join(solids))
+    return str(path)
+
+
+def run_job(manager, file_path, doc, cancel_after=None):
+    async def run():
+        job = manager.start(file_path, "step", doc)
+        assert job.state == "queued"
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            assert manager.cancel(job.id)
+        await job.task
+        assert not manager.cancel(job.id)
+        return job
+
+    return asyncio.run(run())
+
+
+class TestImportJobs:
+    def test_completes_with_progress(self, tmp_path, part_module):
+        """A job adds the shapes of the file and recomputes only them."""
+        doc = ImportDocument()
+        path = step_file(tmp_path, "Bracket", "Bolt", "Nut")
+        job = run_job(ImportJobManager(poll_interval=0.01), path, doc).to_dict()
+        assert job["state"] == "completed"
+        assert job["objects"] == ["large_0", "large_1", "large_2"]
+        assert job["progress"]["shapes_created"] == job["progress"]["shapes_total"]
+        assert job["progress"]["bytes_read"] == job["progress"]["bytes_total"]
+        assert [obj.Shape.names for obj in doc.Objects] == [
+            ["Bracket"],
+            ["Bolt"],
+            ["Nut"],
+        ]
+        assert all(obj.recomputed for obj in doc.Objects)
+        assert not doc.recomputed
+
+    def test_cancel_stops_the_process(self, tmp_path, part_module):
+        """A cancelled job ends without waiting for the reader to finish."""
+        doc = ImportDocument()
+        doc.Objects = [FakePart("Existing", None)]
+        path = step_file(tmp_path, "slow", "Bolt")
+        manager = ImportJobManager(poll_interval=0.01)
+        job = run_job(manager, path, doc, cancel_after=0.5)
+        assert job.state == "cancelled"
+        assert job.finished - job.started < 5
+        assert [obj.Name for obj in doc.Objects] == ["Existing"]
+
+    def test_failure_is_reported(self, tmp_path, part_module):
+        """A reader error ends the job as failed with its message."""
+        path = step_file(tmp_path, "error")
+        job = run_job(ImportJobManager(poll_interval=0.01), path, ImportDocument())
+        assert job.state == "failed"
+        assert job.error == "Unexpected end of file"
+
+    def test_needs_a_part_format(self, tmp_path):
+        """Formats the import process cannot read are rejected up front."""
+        with pytest.raises(ValueError, match="does not support stl"):
+            ImportJobManager().start(str(tmp_path), "stl", ImportDocument())
+
+
+class TestImportTools:
+    def test_background_import_and_status(self, tmp_path, part_module):
+        """import with background returns a job that import_status follows."""
+        provider = ExportImportToolProvider(FakeApp(ImportDocument()))
+        provider.import_jobs.poll_interval = 0.01
+        params = {"file_path": step_file(tmp_path, "Bracket"), "background": True}
+
+        async def run():
+            started = await provider.execute_tool("import", params)
+            status = {"job_id": started["job_id"]}
+            running = await provider.execute_tool("import_status", status)
+            await provider.import_jobs.get(started["job_id"]).task
+            finished = await provider.execute_tool("import_status", status)
+            return started, running, finished
+
+        started, running, finished = asyncio.run(run())
+        assert started["status"] == "success"
+        assert started["format"] == "step"
+        assert running["state"] in ("queued", "parsing", "transferring")
+        assert finished["state"] == "completed"
+        assert finished["progress"]["shapes_created"] == 1
+
+    def test_background_needs_a_part_format(self, tmp_path):
+        """Mesh files cannot be imported in the background."""
+        provider = ExportImportToolProvider(FakeApp(ImportDocument()))
+        path = tmp_path / "mesh.stl"
+        path.write_bytes(b"solid")
+        params = {"file_path": str(path), "background": True}
+        result = asyncio.run(provider.execute_tool("import", params))
+        assert result["status"] == "error"
+        assert "does not support stl" in result["message"]
+        assert "step" in result["supported_formats"]
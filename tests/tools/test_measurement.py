@@ -0,0 +1,304 @@
+"""
+Unit tests for MeasurementToolProvider batch measurements.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.mcp_freecad.tools.broadphase import box_distance, sweep_and_prune
+from src.mcp_freecad.tools.geometry_cache import GeometryCache
+from src.mcp_freecad.tools.interference import InterferenceChecker
+from src.mcp_freecad.tools.measurement import MeasurementToolProvider
+from src.mcp_freecad.tools.spatial_index import SpatialIndex
+from tests.mocks.events import StubEventProvider
+from tests.mocks.shapes import FakeApp, FakeDocument, FakePart, FakeShape
+
+
+def cube_row(count, spacing=20.0, size=10.0):
+    """Cubes along x, `spacing` apart, so neighbours are `spacing - size` apart."""
+    return [
+        FakePart(
+            f"Part{i}",
+            FakeShape((i * spacing, 0, 0), (i * spacing + size, size, size)),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(doc, tool_id, params):
+    provider = MeasurementToolProvider(FakeApp(doc))
+    return asyncio.run(provider.execute_tool(tool_id, params))
+
+
+class TestSweepAndPrune:
+    def test_margin_and_groups(self):
+        """Boxes pair when within the margin, and only across groups."""
+        boxes = [(0, 0, 0, 1, 1, 1), (2, 0, 0, 3, 1, 1), (10, 0, 0, 11, 1, 1)]
+        assert sweep_and_prune(boxes) == []
+        assert sweep_and_prune(boxes, margin=1.0) == [(0, 1)]
+        assert sweep_and_prune(boxes, margin=1.0, groups=[0, 0, 1]) == []
+
+
+class TestDistanceMatrix:
+    def test_cutoff_prunes_pairs(self):
+        """Only neighbouring pairs are measured exactly with a cutoff."""
+        parts = cube_row(50)
+        result = measure(FakeDocument(parts), "distance_matrix", {"cutoff": 15.0})
+        assert result["status"] == "success"
+        assert result["total_pairs"] == 50 * 49 // 2
+        assert result["count"] == result["measured_pairs"] == 49
+        assert {pair["distance"] for pair in result["pairs"]} == {10.0}
+        assert sum(p.Shape.distance_calls for p in parts) == 49
+
+    def test_measured_pairs_counts_exact_distances(self):
+        """Pairs dropped by their box distance are not counted as measured."""
+        # Within the cutoff on each axis, but 12.7 apart diagonally
+        parts = [
+            FakePart("Part0", FakeShape((0, 0, 0), (10, 10, 10))),
+            FakePart("Part1", FakeShape((19, 19, 0), (29, 29, 10))),
+        ]
+        result = measure(FakeDocument(parts), "distance_matrix", {"cutoff": 10.0})
+        assert result["measured_pairs"] == result["count"] == 0
+        assert parts[0].Shape.distance_calls + parts[1].Shape.distance_calls == 0
+
+    def test_two_sets_without_cutoff(self):
+        """Two object sets give every cross pair, nearest first."""
+        doc = FakeDocument(cube_row(4))
+        result = measure(
+            doc,
+            "distance_matrix",
+            {"objects": ["Part0"], "objects2": ["Part3", "Part1"]},
+        )
+        assert [(p["object2"], p["distance"]) for p in result["pairs"]] == [
+            ("Part1", 10.0),
+            ("Part3", 50.0),
+        ]
+
+    def test_missing_object(self):
+        """Unknown objects are reported instead of measured."""
+        result = measure(FakeDocument([]), "distance_matrix", {"objects": ["Nope"]})
+        assert result["status"] == "error"
+        assert "Nope" in result["message"]
+
+
+class TestInterference:
+    def test_collisions_ranked_by_volume(self):
+        """Collisions come first by volume, clearance violations by distance."""
+        parts = cube_row(4, spacing=10.2)
+        parts[3].Shape.move(-5.0)
+        result = measure(FakeDocument(parts), "interference", {"clearance": 0.5})
+        assert [(c["object1"], c["object2"]) for c in result["collisions"]] == [
+            ("Part2", "Part3")
+        ]
+        assert result["collisions"][0]["volume"] == pytest.approx(480.0)
+        violations = result["clearance_violations"]
+        assert [(v["object1"], v["object2"]) for v in violations] == [
+            ("Part0", "Part1"),
+            ("Part1", "Part2"),
+        ]
+        assert result["candidate_pairs"] == 3
+
+    def test_defaults_to_top_level_visible_solids(self):
+        """Hidden objects and objects consumed by another shape are skipped."""
+        parts = cube_row(3, spacing=5.0)
+        cut = FakePart("Cut", FakeShape((0, 0, 0), (10, 10, 10)))
+        parts[0].InList = [cut]
+        parts[2].Visibility = False
+        doc = FakeDocument(parts + [cut])
+        result = measure(doc, "interference", {})
+        assert [(c["object1"], c["object2"]) for c in result["collisions"]] == [
+            ("Cut", "Part1")
+        ]
+        result = measure(doc, "interference", {"objects": ["Part0", "Part1"]})
+        assert len(result["collisions"]) == 1
+
+    def test_incremental_recheck(self):
+        """Only pairs involving moved parts are tested again."""
+        parts = cube_row(20, spacing=10.2)
+        shapes = {part.Name: part.Shape for part in parts}
+        checker = InterferenceChecker()
+        first = checker.check(shapes, clearance=0.5)
+        assert first["tested_pairs"] == 19
+
+        # Part5 leaves Part4 behind and runs into Part6
+        shapes["Part5"].move(3.0)
+        second = checker.check(shapes, clearance=0.5)
+        assert second["moved"] == ["Part5"]
+        assert second["tested_pairs"] == 1
+        assert second["reused_pairs"] == 17
+        assert [(c["object1"], c["object2"]) for c in second["collisions"]] == [
+            ("Part5", "Part6")
+        ]
+        assert len(second["clearance_violations"]) == 17
+
+
+class TestGeometryCache:
+    def test_cached_until_shape_changes(self):
+        """Properties are computed once per shape fingerprint."""
+        shape = FakeShape((0, 0, 0), (10, 10, 10))
+        cache = GeometryCache()
+        assert cache.properties(shape, ["volume"])["volume"] == 1000.0
+        assert cache.properties(shape, ["volume"])["volume"] == 1000.0
+        assert shape.volume_calls == 1
+
+        shape.move(5.0)
+        assert cache.properties(shape, ["center_of_mass"]) == {
+            "center_of_mass": [10.0, 5.0, 5.0]
+        }
+        cache.properties(shape, ["volume"])
+        assert shape.volume_calls == 2
+
+    def test_recomputed_shape_reusing_hash(self):
+        """A new shape that reuses a cached shape's hash is measured again."""
+        shape = FakeShape((0, 0, 0), (10, 10, 10))
+        cache = GeometryCache()
+        assert cache.properties(shape, ["volume"])["volume"] == 1000.0
+
+        recomputed = FakeShape((0, 0, 0), (10, 10, 20))
+        recomputed.hash_code = shape.hash_code
+        assert cache.properties(recomputed, ["volume"])["volume"] == 2000.0
+        assert cache.get_stats()["entries"] == 1
+
+    def test_invalidated_by_recompute(self):
+        """A recompute event drops the entries of recomputed objects."""
+        shape = FakeShape((0, 0, 0), (10, 10, 10))
+        cache = GeometryCache()
+        cache.properties(shape, ["volume"], owner=("Doc", "Box"))
+        event = {
+            "type": "document_changed",
+            "document": "Doc",
+            "recomputed_objects": ["Box"],
+        }
+        asyncio.run(cache.handle_event(event))
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestMassProperties:
+    def test_bulk_mass_properties(self):
+        """mass_properties measures many solids in one call, with mass."""
+        parts = cube_row(3)
+        doc = FakeDocument(parts)
+        params = {"properties": ["volume", "center_of_mass"], "density": 1000.0}
+        provider = MeasurementToolProvider(FakeApp(doc))
+        result = asyncio.run(provider.execute_tool("mass_properties", params))
+        assert result["count"] == 3
+        assert result["objects"]["Part1"] == {
+            "volume": 1000.0,
+            "center_of_mass": [25.0, 5.0, 5.0],
+            "mass": pytest.approx(1e-3),
+        }
+
+        asyncio.run(provider.execute_tool("volume", {"object": "Part1"}))
+        assert parts[1].Shape.volume_calls == 1
+
+
+class TestSpatialIndex:
+    def test_matches_brute_force(self):
+        """Queries agree with scanning every box, also after updates."""
+        rng = random.Random(7)
+
+        def random_box():
+            x, y, z = (rng.uniform(0, 1000) for _ in range(3))
+            return (x, y, z, x + rng.uniform(1, 20), y + 5, z + 5)
+
+        boxes = {f"Part{i}": random_box() for i in range(500)}
+        index = SpatialIndex(boxes)
+        for i in range(20):
+            boxes[f"Part{i}"] = random_box()
+            index.update(f"Part{i}", boxes[f"Part{i}"])
+        del boxes["Part30"]
+        index.update("Part30", None)
+
+        target = (500, 500, 500, 500, 500, 500)
+        expected = sorted(
+            (box_distance(box, target), name) for name, box in boxes.items()
+        )
+        nearest = index.nearest(target, 10)
+        assert [d for _, d in nearest] == [d for d, _ in expected[:10]]
+        within = {name for name, _ in index.within(target, 150.0)}
+        assert within == {name for d, name in expected if d <= 150.0}
+
+    def test_updated_from_events(self):
+        """Moved objects are re-read from events without re-indexing."""
+        parts = cube_row(10)
+        provider = MeasurementToolProvider(FakeApp(FakeDocument(parts)))
+        events = StubEventProvider()
+        provider.attach_events(events)
+
+        params = {"object": "Part0", "k": 2}
+        result = asyncio.run(provider.execute_tool("nearest_objects", params))
+        assert [o["object"] for o in result["objects"]] == ["Part1", "Part2"]
+
+        parts[9].Shape.move(-170.0)
+        event = {"type": "object_changed", "document": "Assembly", "object": "Part9"}
+        asyncio.run(events.emit_event("object_changed", event))
+        result = asyncio.run(provider.execute_tool("nearest_objects", params))
+        assert [o["object"] for o in result["objects"]] == ["Part9", "Part1"]
+        assert provider.spatial["Assembly"].get_stats()["builds"] == 1
+
+        params = {"min_corner": [15, 0, 0], "max_corner": [45, 1, 1]}
+        result = asyncio.run(provider.execute_tool("objects_in_box", params))
+        found = sorted(o["object"] for o in result["objects"])
+        assert found == ["Part1", "Part2", "Part9"]
+
+    def test_deleting_a_boolean_restores_its_inputs(self):
+        """Inputs of a created or deleted Cut are re-read with it."""
+        parts = cube_row(3)
+        doc = FakeDocument(parts)
+        provider = MeasurementToolProvider(FakeApp(doc))
+        events = StubEventProvider()
+        provider.attach_events(events)
+        params = {"min_corner": [0, 0, 0], "max_corner": [50, 10, 10]}
+
+        def in_box():
+            result = asyncio.run(provider.execute_tool("objects_in_box", params))
+            return sorted(o["object"] for o in result["objects"])
+
+        def emit(event_type, **extra):
+            event = {"type": event_type, "document": "Assembly", "object": "Cut"}
+            asyncio.run(events.emit_event(event_type, {**event, **extra}))
+
+        assert in_box() == ["Part0", "Part1", "Part2"]
+        cut = FakePart("Cut", FakeShape((0, 0, 0), (10, 10, 10)))
+        cut.OutList = [parts[0], parts[1]]
+        parts[0].InList = parts[1].InList = [cut]
+        doc.Objects = parts + [cut]
+        emit("object_created")
+        assert in_box() == ["Cut", "Part2"]
+
+        doc.Objects = parts
+        parts[0].InList = parts[1].InList = []
+        emit("object_deleted", out_list=["Part0", "Part1"])
+        assert in_box() == ["Part0", "Part1", "Part2"]
+
+        # Without the inputs in the event, every box is compared
+        parts[1].InList = [cut]
+        doc.Objects = parts + [cut]
+        emit("object_created")
+        doc.Objects = parts
+        parts[1].InList = []
+        emit("object_deleted")
+        assert in_box() == ["Part0", "Part1", "Part2"]
+        assert provider.spatial["Assembly"].get_stats()["builds"] == 1
+
+    def test_refreshed_without_events(self):
+        """Without events the index is kept and refreshed from the boxes."""
+        parts = cube_row(10)
+        doc = FakeDocument(parts)
+        provider = MeasurementToolProvider(FakeApp(doc))
+        params = {"object": "Part0", "k": 1}
+        asyncio.run(provider.execute_tool("nearest_objects", params))
+
+        parts[9].Shape.move(-170.0)
+        doc.Objects = parts[1:]
+        result = asyncio.run(provider.execute_tool("nearest_objects", params))
+        assert result["status"] == "error"
+
+        params = {"object": "Part1", "k": 1}
+        result = asyncio.run(provider.execute_tool("nearest_objects", params))
+        assert [o["object"] for o in result["objects"]] == ["Part9"]
+        stats = provider.spatial["Assembly"].get_stats()
+        assert stats["builds"] == 1
+        assert stats["updates"] == 2
@@ -0,0 +1,84 @@
+"""
+Unit tests for the streaming STL and OBJ mesh writers.
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from src.mcp_freecad.tools import mesh_writer
+from src.mcp_freecad.tools.export_import import ExportImportToolProvider
+from tests.mocks.shapes import FakeApp, FakeDocument, FakePart, MeshedShape
+
+# Unit right-angle triangle in the xy plane, and the same raised by one
+TRIANGLE = ([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [(0, 1, 2)])
+RAISED = ([(0, 0, 1), (1, 0, 1), (0, 1, 1)], [(0, 2, 1)])
+
+
+def read_stl(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    (count,) = struct.unpack_from("<I", data, 80)
+    records = [
+        mesh_writer.STL_RECORD.unpack_from(data, 84 + i * 50) for i in range(count)
+    ]
+    return data, records
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def numpy_mode(request, monkeypatch):
+    if request.param and not mesh_writer.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(mesh_writer, "NUMPY_AVAILABLE", request.param)
+
+
+class TestBinaryStl:
+    def test_records_and_normals(self, tmp_path, numpy_mode):
+        """Triangles of every shape are written with unit normals by winding."""
+        path = str(tmp_path / "out.stl")
+        stats = mesh_writer.write_binary_stl(path, [("A", TRIANGLE), ("B", RAISED)])
+        data, records = read_stl(path)
+        assert stats == {"shapes": 2, "triangles": 2, "bytes": 84 + 2 * 50}
+        assert len(data) == stats["bytes"]
+        assert records[0][:3] == (0.0, 0.0, 1.0)
+        assert records[1][:3] == (0.0, 0.0, -1.0)
+        assert records[1][3:12] == (0, 0, 1, 0, 1, 1, 1, 0, 1)
+
+    def test_degenerate_facet(self, tmp_path, numpy_mode):
+        """A zero-area facet gets a zero normal instead of NaN."""
+        path = str(tmp_path / "out.stl")
+        flat = ([(0, 0, 0), (1, 0, 0), (2, 0, 0)], [(0, 1, 2)])
+        mesh_writer.write_binary_stl(path, [("Flat", flat)])
+        assert read_stl(path)[1][0][:3] == (0.0, 0.0, 0.0)
+
+
+class TestObj:
+    def test_indices_offset_per_shape(self, tmp_path, numpy_mode):
+        """Each shape is its own object, with face indices into the shared list."""
+        path = str(tmp_path / "out.obj")
+        stats = mesh_writer.write_obj(path, [("A", TRIANGLE), ("B", RAISED)])
+        lines = open(path).read().splitlines()
+        assert stats["triangles"] == 2
+        assert lines[1] == "o A"
+        assert lines[2] == "v 0.000000 0.000000 0.000000"
+        assert [line for line in lines if line.startswith("f")] == [
+            "f 1 2 3",
+            "f 4 6 5",
+        ]
+
+
+class TestMeshExport:
+    def test_export_streams_every_shape(self, tmp_path):
+        """STL export writes the tessellation of each exported object."""
+        parts = [
+            FakePart(f"Part{i}", MeshedShape((i * 20, 0, 0), (i * 20 + 10, 10, 10)))
+            for i in range(3)
+        ]
+        provider = ExportImportToolProvider(FakeApp(FakeDocument(parts)))
+        params = {"format": "stl", "output_path": str(tmp_path / "parts")}
+        result = asyncio.run(provider.execute_tool("export", params))
+        assert result["status"] == "success"
+        assert result["output_path"].endswith("parts.stl")
+        assert result["triangle_count"] == 3 * 12
+        assert result["file_size"] == 84 + 3 * 12 * 50
@@ -0,0 +1,65 @@
+"""
+Unit tests for the shared tessellation cache.
+"""
+
+from src.mcp_freecad.tools.tessellation_cache import (
+    FACET_BYTES,
+    POINT_BYTES,
+    TessellationCache,
+)
+from tests.mocks.shapes import MeshedShape
+
+
+class TestTessellationCache:
+    def test_reused_per_shape_and_tolerance(self):
+        """A shape is meshed once per tolerance until it moves."""
+        shape = MeshedShape((0, 0, 0), (10, 10, 10))
+        cache = TessellationCache()
+        first = cache.tessellate(shape, 1.0)
+        assert cache.tessellate(shape, 1.0) is first
+        assert shape.tessellate_calls == 1
+
+        cache.tessellate(shape, 0.5)
+        assert shape.tessellate_calls == 2
+
+        shape.move(5.0)
+        assert cache.tessellate(shape, 1.0)[0][0] == (5.0, 0, 0)
+        assert cache.get_stats()["hits"] == 1
+
+    def test_recomputed_shape_reusing_hash(self):
+        """A new shape that reuses a cached shape's hash is meshed again."""
+        shape = MeshedShape((0, 0, 0), (10, 10, 10))
+        cache = TessellationCache()
+        cache.tessellate(shape, 1.0)
+
+        recomputed = MeshedShape((0, 0, 0), (10, 10, 20))
+        recomputed.hash_code = shape.hash_code
+        cache.tessellate(recomputed, 1.0)
+        assert recomputed.tessellate_calls == 1
+        assert cache.tessellate(recomputed, 1.0) is cache.tessellate(recomputed, 1.0)
+        assert recomputed.tessellate_calls == 1
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] == 8 * POINT_BYTES + 12 * FACET_BYTES
+
+    def test_evicts_by_memory(self):
+        """Least recently used entries go once the memory bound is exceeded."""
+        coarse_size = 8 * POINT_BYTES + 12 * FACET_BYTES
+        cache = TessellationCache(max_bytes=2 * coarse_size)
+        shapes = [MeshedShape((i * 20, 0, 0), (i * 20 + 10, 10, 10)) for i in range(3)]
+        cache.tessellate(shapes[0], 1.0)
+        cache.tessellate(shapes[1], 1.0)
+        cache.tessellate(shapes[0], 1.0)
+        cache.tessellate(shapes[2], 1.0)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["size_bytes"] == 2 * coarse_size
+        cache.tessellate(shapes[0], 1.0)
+        assert shapes[0].tessellate_calls == 1
+        cache.tessellate(shapes[1], 1.0)
+        assert shapes[1].tessellate_calls == 2
+
+        # A mesh larger than the whole cache is returned but not kept
+        cache.tessellate(shapes[2], 0.01)
+        assert cache.get_stats()["size_bytes"] <= cache.max_bytes